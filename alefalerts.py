@@ -1,9 +1,11 @@
 import asyncio
 from env import DISCORD_AUTH_TOKEN, ALEF_ALERT_CHANNEL_ID
 import aiohttp
+from httpclient import http as shared_http
 
 class MessageSender:
-    def __init__(self):
+    def __init__(self, http=None):
+        self.http = http or shared_http
         self.token = DISCORD_AUTH_TOKEN
         self.channel_id = ALEF_ALERT_CHANNEL_ID
         self.base_url = 'https://discord.com/api/v9'
@@ -17,7 +19,7 @@ class MessageSender:
         payload = {'content': content}
 
         try:
-            async with aiohttp.ClientSession() as session:
+            async with self.http.session() as session:
                 async with session.post(url, json=payload, headers=self.headers) as response:
                     response_text = await response.text()
                     print(f"Response status: {response.status}")
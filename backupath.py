@@ -4,11 +4,13 @@ import aiohttp
 from env import MORALIS_API_KEY, BIRDEYE_API_KEY
 from datetime import datetime, timedelta
 from marketcapfinal import Supply
+from httpclient import http as shared_http
 
 class BATH:
-    def __init__(self):
+    def __init__(self, http=None):
+        self.http = http or shared_http
         self.time_frame = "5min"
-        self.s = Supply()
+        self.s = Supply(http=self.http)
 
     async def calculate_all_time_high(self, ca, pair_address):
         try:
@@ -25,7 +27,7 @@ class BATH:
                 "X-API-Key": MORALIS_API_KEY
             }
             
-            async with aiohttp.ClientSession() as session:
+            async with self.http.session() as session:
                 async with session.get(url, headers=headers, params=params) as response:
                     response.raise_for_status()
                     data = await response.json()
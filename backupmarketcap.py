@@ -2,9 +2,11 @@ import asyncio
 import aiohttp
 from env import BIRDEYE_API_KEY
 from backupsupply import Supply
+from httpclient import http as shared_http
 
 class MarketcapFetcher:
-    def __init__(self, rpc_endpoint: str = "https://api.mainnet-beta.solana.com"):
+    def __init__(self, rpc_endpoint: str = "https://api.mainnet-beta.solana.com", http=None):
+        self.http = http or shared_http
         self.rpc_endpoint = rpc_endpoint
         self.gecko_base_url = "https://api.geckoterminal.com/api/v2/simple/networks"
         self.supply_backup = Supply()
@@ -18,7 +20,7 @@ class MarketcapFetcher:
         }
         headers = {"Content-Type": "application/json"}
         try:
-            async with aiohttp.ClientSession() as session:
+            async with self.http.session() as session:
                 async with session.post(
                     self.rpc_endpoint,
                     json=payload,
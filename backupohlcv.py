@@ -1,56 +1,42 @@
 import asyncio
 import aiohttp
 from env import SOLANA_TRACKER_API_KEY
+from httpclient import http as shared_http
 
 class OHLCV:
-    def __init__(self):
-        pass
+    def __init__(self, http=None):
+        self.http = http or shared_http
 
     async def get(self, ca):
-        max_retries = 3
-        retry_delay = 2  # seconds
-
-        for attempt in range(max_retries):
-            try:
-                if attempt > 0:
-                    await asyncio.sleep(retry_delay * (attempt + 1))
-
-                url = f"https://data.solanatracker.io/chart/{ca}"
-                headers = {
-                    'X-API-KEY': SOLANA_TRACKER_API_KEY
-                }
-                params = {
-                    'type': '1m'
-                }
-                
-                async with aiohttp.ClientSession() as session:
-                    async with session.get(url, headers=headers, params=params) as response:
-                        if response.status == 429:  # Too Many Requests
-                            if attempt < max_retries - 1:
-                                print(f"Rate limited, retrying in {retry_delay * (attempt + 1)} seconds...")
-                                continue
-                            
-                        response.raise_for_status()
-                        data = await response.json()
+        # 429s are queued and retried by the shared http client
+        url = f"https://data.solanatracker.io/chart/{ca}"
+        headers = {
+            'X-API-KEY': SOLANA_TRACKER_API_KEY
+        }
+        params = {
+            'type': '1m'
+        }
+        try:
+            async with self.http.session() as session:
+                async with session.get(url, headers=headers, params=params) as response:
+                    response.raise_for_status()
+                    data = await response.json()
+                    
+                    if not data:
+                        print(f"Failed to get data")
+                        return None
+                    #print(data)
                         
-                        if not data:
-                            print(f"Failed to get data")
-                            return None
-                        #print(data)
-                            
-                        return data
-
-            except aiohttp.ClientResponseError as e:
-                if e.status == 429 and attempt < max_retries - 1:
-                    continue
-                print(f"Error fetching ATH for {ca}: {str(e)}")
-            except Exception as e:
-                print(str(e))
-                import traceback
-                traceback.print_exc()
-                return None
+                    return data
 
-        return None
+        except aiohttp.ClientResponseError as e:
+            print(f"Error fetching OHLCV for {ca}: {str(e)}")
+            return None
+        except Exception as e:
+            print(str(e))
+            import traceback
+            traceback.print_exc()
+            return None
     
 class Main:
     def __init__(self):
@@ -2,10 +2,11 @@ import requests
 import asyncio
 import aiohttp
 from env import BIRDEYE_API_KEY
+from httpclient import http as shared_http
 
 class Supply:
-    def __init__(self):
-        pass
+    def __init__(self, http=None):
+        self.http = http or shared_http
 
     async def supply(self, ca):
         url = f"https://public-api.birdeye.so/defi/token_overview?address={ca}"
@@ -19,7 +20,7 @@ class Supply:
         print(f"Fetching supply for: {ca}")
         
         try:
-            async with aiohttp.ClientSession() as session:
+            async with self.http.session() as session:
                 async with session.get(url=url, headers=headers) as response:
                     if response.status == 200:
                         try:
@@ -2,11 +2,14 @@ import requests
 import asyncio
 import aiohttp
 from env import BIRDEYE_API_KEY
+from httpclient import http as shared_http
+from cache import cached
 
 class BuySellTradeUniqueData:
-    def __init__(self):
-        pass
+    def __init__(self, http=None):
+        self.http = http or shared_http
 
+    @cached("birdeye", "trade-data/single")
     async def fetch(self, ca):
         url = f"https://public-api.birdeye.so/defi/v3/token/trade-data/single?address={ca}"
         headers = {
@@ -15,7 +18,7 @@ class BuySellTradeUniqueData:
             "X-API-KEY": BIRDEYE_API_KEY
         }
         try:
-            async with aiohttp.ClientSession() as session:
+            async with self.http.session() as session:
                 async with session.get(url, headers=headers) as response:
                     response.raise_for_status()
                     response_data = await response.json()
@@ -112,9 +115,10 @@ class BuySellTradeUniqueData:
            return None
        
 class Tokenomics:
-    def __init__(self):
-        pass
+    def __init__(self, http=None):
+        self.http = http or shared_http
 
+    @cached("birdeye", "token_overview")
     async def fetch(self, ca: str):
         url = f"https://public-api.birdeye.so/defi/token_overview?address={ca}"
         headers = {
@@ -123,7 +127,7 @@ class Tokenomics:
             "X-API-KEY": BIRDEYE_API_KEY
         }
         try:
-            async with aiohttp.ClientSession() as session:
+            async with self.http.session() as session:
                 async with session.get(url, headers=headers) as response:
                     response.raise_for_status()
                     response_data = await response.json()
@@ -8,6 +8,7 @@ import asyncio
 import aiohttp
 import re
 import time
+import functools
 from datetime import datetime
 from env import DISCORD_BOT_TOKEN
 #.py imports
@@ -15,12 +16,14 @@ from process_descriptions import TX_ANALYZER
 from hr24maxprice import Max
 from trueage import TrueAge
 from serverdata import ServerData
+from caindex import CAEventIndex
 from dexapi import DexScreenerAPI
-from tg import SoulScannerBot, BundleBot, WAlletPNL
+from tg import SoulScannerBot, BundleBot, WAlletPNL, scanner
+from verdictcache import VerdictCache
+from walletservice import wallet_service
 from tokenage import TokenAge
 from alefalerts import MessageSender
 from topholders import HolderAmount
-from walletpnl import WalletPNL
 from scoring import HolderScore, TokenomicScore, TrustScore, PenalizeScore, TokenAgeConvert
 from marketcapfinal import Supply, Price, Marketcap
 from bdmetadata import BuySellTradeUniqueData
@@ -34,6 +37,21 @@ from scanforentry import MarketcapMonitor
 from ath import ATH
 from backupath import BATH
 from webhooks import AlefAlertWebhook, MultiAlert 
+from ingest import ChannelIngest, SeenCache
+from pipeline import StageGraph, WorkerPool
+from httpclient import http
+from singleflight import single_flight
+from cache import response_cache
+from multialert import MultiAlertDetector
+from quotes import quote_engine
+from jobstore import SnapshotJobStore
+from dbwriter import db_writer
+from hedge import hedge_stats
+from sourcerank import source_ranker, waterfall
+from breaker import breakers
+from deadline import Deadline
+from solanarpc import rpc
+from solprice import sol_price
 
 intents = discord.Intents.all()
 intents.message_content = True
@@ -47,24 +65,28 @@ class ScrapeAD:
     def __init__(self, bot):
         #configs & imports
         self.bot = bot
-        self.limit = 1
+        # one pooled HTTP client shared by every provider
+        self.http = http
+        self.quotes = quote_engine
         self.description_processor = TX_ANALYZER()
-        self.dev_history = DevHist()
+        self.dev_history = DevHist(http=self.http)
         self.serv_data = None
-        self.dex = DexScreenerAPI()
-        self.soul_scanner_bot = SoulScannerBot()
-        self.bundle_bot = BundleBot()
-        self.wallet_pnl = WalletPNL()
-        self.wallet_pnl_tg = WAlletPNL()
-        self.token_age = TokenAge()
-        self.slime_alert = MessageSender()
-        self.rickbot_webhook = AlefAlertWebhook()  
-        self.ma_webhooks = MultiAlert()
+        self.dex = DexScreenerAPI(http=self.http)
+        # scanner verdicts are reused per CA for a few minutes, across restarts too
+        self.verdicts = VerdictCache()
+        self.soul_scanner_bot = SoulScannerBot(verdicts=self.verdicts)
+        self.bundle_bot = BundleBot(verdicts=self.verdicts)
+        self.wallets = wallet_service
+        self.wallet_pnl_tg = WAlletPNL(verdicts=self.verdicts)
+        self.token_age = TokenAge(http=self.http)
+        self.slime_alert = MessageSender(http=self.http)
+        self.rickbot_webhook = AlefAlertWebhook(http=self.http)  
+        self.ma_webhooks = MultiAlert(http=self.http)
         self.mc_monitor = MarketcapMonitor()
-        self.true_age = TrueAge()
-        self.ath = ATH()
-        self.bath = BATH()
-        self.o = OH()
+        self.true_age = TrueAge(http=self.http)
+        self.ath = ATH(http=self.http)
+        self.bath = BATH(http=self.http)
+        self.o = OH(http=self.http)
         self.sr = SupportResistance()
         #self.price = Price()
         #self.x = Twitter()
@@ -77,40 +99,29 @@ class ScrapeAD:
         self.penalizescore = PenalizeScore()
 
         
-        self.bd_trade_data = BuySellTradeUniqueData()
+        self.bd_trade_data = BuySellTradeUniqueData(http=self.http)
         self.twox = TwoXChecker()
+        self.snapshot_jobs = SnapshotJobStore(self.quotes, self.ath, self.bath, self.dex)
         self.age_converter = TokenAgeConvert()
         
         #webhooks
         self.multi_alert_webhook = ""
         
         #message handling.tracking
-        self.processed_messages = set()
-        self.multi_alerted_cas = set()
-        self.ten_five_sol_alerts = set()
-        self.ca_to_tx_descriptions = {}
-        self.ca_appearences = {}
-        self.ca_trading_links = {}
-
-        self.swt_message_data = {} 
-        self.fresh_message_data = {}
-        self.degen_message_data = {}
-        self.ca_server_counts = {}
-
-
-        #ca sets & channel ids
-        self.high_freq_cas = set()
-        self.legend_cas = set()
-        self.kol_alpha_cas = set()
-        self.kol_regular_cas = set()
-        self.whale_cas = set()
-        self.smart_cas = set()
-        self.challenge_cas = set()
-        self.degen_cas = set()
-        self.insider_wallet_cas = set()
-        self.fresh_cas = set()
-        self.fresh_5sol_1m_mc_cas = set()
-        self.fresh_1h_cas = set()
+        self.multi_alerted_cas = SeenCache(maxsize=20000, ttl_seconds=7 * 24 * 3600)
+        self.ten_five_sol_alerts = SeenCache(maxsize=10000)
+        # per-CA channel bitmasks, replaces the per-channel CA sets
+        self.multialerts = MultiAlertDetector()
+        # per-CA channel events, read by ServerData instead of rescanning history
+        self.ca_index = CAEventIndex()
+        # multialert candidates wait here for an enrichment worker
+        self.enrichment_workers = 4
+        self.enrichment_pool = WorkerPool("enrichment", self.enrich_multialert, workers=self.enrichment_workers, maxsize=50)
+        # seconds from detection to alert, queue wait included; stages and HTTP timeouts share it
+        self.enrichment_budget = 120
+
+
+        #channel ids
         self.swt_channel_ids = {
             1273250694257705070: "Whale",
             1280465862163304468: "Smart",
@@ -128,289 +139,213 @@ class ScrapeAD:
         }
         self.degen_channel_id = 1278278627997384704
 
+        # "gateway" consumes on_message events, "poll" reads channel.history after a cursor
+        self.ingest_mode = "gateway"
+        self.ingest = ChannelIngest(self.bot, self.swt_channel_ids, self.fresh_channel_ids, self.degen_channel_id)
+        if self.ingest_mode == "gateway":
+            self.ingest.register()
+
         self.short_timeframes = ["1min", "30s", "10s", "1s"]
         self.longer_timeframes = ["5min", "10min", "30min", "1h"]
 
-        self.sup = Supply()
-        self.pri = Price()
-        self.markca = Marketcap()
+        self.sup = Supply(http=self.http)
+        self.pri = Price(http=self.http)
+        self.markca = Marketcap(http=self.http)
 
 
     async def initialize(self):
         await self.bot.wait_until_ready()
-        self.serv_data = ServerData(self.bot)
+        self.serv_data = ServerData(self.bot, index=self.ca_index)
         
 
-    async def swt_fetch_messages(self):
-        await self.bot.wait_until_ready()
+    async def handle_swt_message(self, session, message_data):
+        tx_type = None
+        sol_amount = 0
+        # Description extraction
+        if message_data["description"]:
+            tx_data = await self.description_processor.extract_buys_sells(message_data['description'])
+            if tx_data:
+                tx_type = tx_data['type']
+                sol_amount = tx_data['sol_amount']
+
+        fields = message_data.get('fields', {})
+        excluded_fields = ['sol:', 'useful links:', 'buy with bonkbot:']
+        for field_name, field_value in fields.items():
+            # Token name & CA
+            if field_name.lower() not in excluded_fields:
+                token_name = field_name
+                ca = field_value
+                channel_name = message_data['channel_name']
+                if ca:
+                    self.ca_index.add(ca, "SWT", channel_name, message_data.get('channel_id'), tx_type, sol_amount,
+                                      message_data['description'], message_data.get('trading_links'))
+                    await self.check_multialert(session, token_name, ca, channel_name)
+                if ca and sol_amount > 10:
+                    if self.ten_five_sol_alerts.add(ca):
+                        print(f"10+ SOL BUY DETECTED")
+                        webhook_task = asyncio.create_task(
+                            self.ma_webhooks.tensolbuywebhook(sol_amount, token_name, ca, channel_name),
+                            name=f"tensolbuywebhook {ca[:8]}"
+                        )
+                        webhook_task.add_done_callback(self.log_task_failure)
+                        if not hasattr(self, 'background_tasks'):
+                            self.background_tasks = []
+                        self.background_tasks = [task for task in self.background_tasks if not task.done()]
+                        self.background_tasks.append(webhook_task)
+
+    def log_task_failure(self, task):
+        if not task.cancelled() and task.exception() is not None:
+            print(f"Error in background task {task.get_name()}: {str(task.exception())}")
+
+    async def handle_fresh_message(self, session, message_data):
+        token_name = ""
+        tx_type = None
+        sol_amount = 0
+        if message_data['description']:
+            tx_data = await self.description_processor.extract_buys_sells(message_data['description'])
+            if tx_data:
+                tx_type = tx_data['type']
+                sol_amount = tx_data['sol_amount']
         
-        while True:
-            try:
-                message_found = False
-                for channel_id in self.swt_channel_ids:
-                    channel = self.bot.get_channel(channel_id)
-                    channel_name = self.swt_channel_ids.get(channel_id, "Unknown Channel")
-                    if channel:
-                        async for message in channel.history(limit=self.limit):
-                            message_id = str(message.id)
-                            if message_id not in self.processed_messages:
-                                message_found = True
-                                self.processed_messages.add(message_id)
-                                if message.embeds:
-                                    for embed in message.embeds:
-                                        message_data = {
-                                            'timestamp': message.created_at.isoformat(),
-                                            'description': embed.description or '',
-                                            'fields': {},
-                                            'channel_name': channel_name
-                                        }
-                                        if embed.fields:
-                                            for field in embed.fields:
-                                                field_name = field.name.strip()
-                                                field_value = field.value.strip()
-                                                message_data['fields'][field_name] = field_value
-
-                                        self.swt_message_data[message_id] = message_data
-                
-                if message_found:
-                    return self.swt_message_data
-                
-                await asyncio.sleep(4)
-
-            except Exception as e:
-                print(f"Error in SWT fetch: {str(e)}")
-                await asyncio.sleep(4)
-
-    async def swt_process_messages(self, session):
-        while True:
-            try:
-                data = await self.swt_fetch_messages()
-                if not data:
-                    await asyncio.sleep(4)
-                    continue
-
-                print(f"[{datetime.now().strftime('%H:%M:%S')}] Processing {len(data)} new SWT message(s)")
-                
-                for message_id, message_data in data.items():
-                    # Description extraction
-                    if message_data["description"]:
-                        tx_data = await self.description_processor.extract_buys_sells(message_data['description'])
-                        if tx_data:
-                            raw_tx = tx_data['raw_description']
-                            tx_type = tx_data['type']
-                            sol_amount = tx_data['sol_amount']
-                                    
-                            raw_tx = tx_data['raw_description']
-
-                    fields = message_data.get('fields', {})
-                    excluded_fields = ['sol:', 'useful links:', 'buy with bonkbot:']
-                    for field_name, field_value in fields.items():
-                        # Token name & CA
-                        if field_name.lower() not in excluded_fields:
-                            token_name = field_name
-                            ca = field_value
-                            channel_name = message_data['channel_name']
-                            if ca:
-                                if channel_name == "Whale":
-                                    self.whale_cas.add(ca)
-                                    await self.check_multialert(session, token_name, ca, channel_name)
-                                elif channel_name == "Smart":
-                                    self.smart_cas.add(ca)
-                                    await self.check_multialert(session, token_name, ca, channel_name)
-                                elif channel_name == "Challenge":
-                                    self.challenge_cas.add(ca)
-                                    await self.check_multialert(session, token_name, ca, channel_name)
-                                elif channel_name == "Legend":
-                                    self.legend_cas.add(ca)
-                                    await self.check_multialert(session, token_name, ca, channel_name)
-                                elif channel_name == "Kol Alpha":
-                                    await self.check_multialert(session, token_name, ca, channel_name)
-                                elif channel_name == "Kol Regular":
-                                    await self.check_multialert(session, token_name, ca, channel_name)
-                                elif channel_name == "High Freq":
-                                    await self.check_multialert(session, token_name, ca, channel_name)
-                                elif channel_name == "Insider":
-                                    await self.check_multialert(session, token_name, ca, channel_name)
-                            if ca and sol_amount > 10:
-                                if ca not in self.ten_five_sol_alerts:
-                                    self.ten_five_sol_alerts.add(ca)
-                                    print(f"10+ SOL BUY DETECTED")
-                                    await self.ma_webhooks.tensolbuywebhook(sol_amount, token_name, ca, channel_name)
+        if message_data['title']:
+            token_name = message_data['title']
+
+        fields = message_data.get('fields', {})
+        for field_name, field_value in fields.items():
+            if field_name.strip(':').lower() == 'token address':
+                ca = field_value.strip()
+                channel_name = message_data['channel_name'] 
+                if ca:
+                    self.ca_index.add(ca, "Fresh", channel_name, message_data.get('channel_id'), tx_type, sol_amount,
+                                      message_data['description'])
+                    await self.check_multialert(session, token_name, ca, channel_name)
+
+    async def handle_degen_message(self, session, message_data):
+        ca = message_data.get('ca')
+
+        # Process Swap Details
+        tx_type = None
+        sol_amount = 0
+        swap_details = message_data.get('swap_details')
+        if swap_details:
+            tx_data = await self.description_processor.extract_degen_buys_sells(swap_details)
+            if tx_data:
+                tx_type = tx_data['type']
+                sol_amount = tx_data['sol_amount']
+                message_data['transaction'] = {
+                    'type': tx_type,
+                    'sol_amount': sol_amount
+                }
 
-            except Exception as e:
-                print(f"Error in SWT process: {str(e)}")
-                await asyncio.sleep(4)        
+        if ca:
+            self.ca_index.add(ca, "Degen", message_data.get('channel_name', "Degen"), message_data.get('channel_id'),
+                              tx_type, sol_amount, swap_details)
+            await self.check_multialert(session, "", ca, "Degen")
 
-    async def fresh_fetch_messages(self):
+    async def consume_messages(self, session, queue, handler):
+        """Hand each queued message to its family handler once, then drop it"""
         await self.bot.wait_until_ready()
-        
-        while True:
-            try:
-                message_found = False
-                for channel_id in self.fresh_channel_ids:
-                    channel = self.bot.get_channel(channel_id)
-                    channel_name = self.fresh_channel_ids.get(channel_id, "Unknown Fresh Channel")
-                    if channel:
-                        async for message in channel.history(limit=1):
-                            message_id = str(message.id)
-                            if message_id not in self.processed_messages:
-                                message_found = True
-                                self.processed_messages.add(message_id)
-                                if message.embeds:
-                                    for embed in message.embeds:
-                                        message_data = {
-                                            'timestamp': message.created_at.isoformat(),
-                                            'title': embed.title if embed.title else '',
-                                            'description': embed.description if embed.description else '',
-                                            'fields': {},
-                                            'channel_name': channel_name
-                                        }
-                                        if embed.fields:
-                                            for field in embed.fields:
-                                                field_name = field.name.strip()
-                                                field_value = field.value.strip()
-                                                message_data['fields'][field_name] = field_value
-                                        
-                                        self.fresh_message_data[message_id] = message_data
-                
-                if message_found:
-                    return self.fresh_message_data
-                    
-                await asyncio.sleep(2)
-            
-            except Exception as e:
-                print(f"Error fetching fresh messages: {str(e)}")
-                await asyncio.sleep(2)
 
-    async def fresh_process_messages(self, session):
         while True:
+            message_id, message_data, latency = await queue.get()
             try:
-                data = await self.fresh_fetch_messages()
-                if not data:
-                    await asyncio.sleep(4)
-                    continue
-
-                print(f"[{datetime.now().strftime('%H:%M:%S')}] Processing {len(data)} new Fresh message(s)")
-                
-                for message_id, message_data in data.items():
-                    if message_data['description']:
-                        tx_data = await self.description_processor.extract_buys_sells(message_data['description'])
-                        if tx_data:
-                            tx_type = tx_data['type']
-                            sol_amount = tx_data['sol_amount']
-                            raw_tx = tx_data['raw_description']
-                    
-                    if message_data['title']:
-                        token_name = message_data['title']
-
-                    fields = message_data.get('fields', {})
-                    for field_name, field_value in fields.items():
-                        if field_name.strip(':').lower() == 'token address':
-                            ca = field_value.strip()
-                            channel_name = message_data['channel_name'] 
-                            if ca:
-                                if channel_name == "Fresh":
-                                    self.fresh_cas.add(ca)
-                                    await self.check_multialert(session, token_name, ca, "Fresh")
-                                elif channel_name == "Fresh 5sol 1m MC":
-                                    self.fresh_5sol_1m_mc_cas.add(ca)
-                                    await self.check_multialert(session, token_name, ca, "Fresh 5sol 1m mc")
-                                elif channel_name == "Fresh 1h":
-                                    self.fresh_1h_cas.add(ca)
-                                    await self.check_multialert(session, token_name, ca, "Fresh 1h")
-
+                print(f"[{datetime.now().strftime('%H:%M:%S')}] Processing {queue.family} message {message_id} (ingest latency: {latency * 1000:.1f}ms)")
+                await handler(session, message_data)
             except Exception as e:
-                print(f"Error processing fresh messages: {str(e)}")
-                await asyncio.sleep(4)
-
-    async def degen_fetch_and_process_messages(self, session):
-        await self.bot.wait_until_ready()
+                print(f"Error in {queue.family} handler: {str(e)}")
+            finally:
+                queue.task_done()
 
+    async def report_ingest_stats(self, interval=300):
         while True:
-            try:
-                channel = self.bot.get_channel(self.degen_channel_id)
-                if channel:
-                    async for message in channel.history(limit=self.limit):
-                        message_id = str(message.id)
-                        if message_id not in self.processed_messages:
-                            self.processed_messages.add(message_id)
-                            if message.embeds:
-                                for embed in message.embeds:
-                                    if embed.fields:
-                                        message_data = {
-                                            'timestamp': message.created_at.isoformat(),
-                                            'fields': {}
-                                        }
-                                        for field in embed.fields:
-                                            # Get CA
-                                            if "Token:" in field.value:
-                                                try:
-                                                    ca = field.value.split('`')[1].strip()
-                                                    if ca:
-                                                        self.degen_cas.add(ca)
-                                                        message_data['ca'] = ca
-                                                        await self.check_multialert(session, "", ca, "Degen")
-                                                except IndexError:
-                                                    print("Could not extract CA from field")
-                                            
-                                            # Process Swap Details
-                                            if "Swapped" in field.value:
-                                                swap_details = field.value
-                                                tx_data = await self.description_processor.extract_degen_buys_sells(swap_details)
-                                                if tx_data:
-                                                    tx_type = tx_data['type']
-                                                    sol_amount = tx_data['sol_amount']
-                                                    
-                                                    message_data['transaction'] = {
-                                                        'type': tx_type,
-                                                        'sol_amount': sol_amount,
-                                                        'raw_description': tx_data['raw_description']
-        }
-                                                    
-
-                                                    message_data['transaction'] = {
-                                                        'type': tx_type,
-                                                        'sol_amount': sol_amount
-                                                    }
-                                            
-                                            message_data['fields'][field.name] = field.value
-                                        self.degen_message_data[message_id] = message_data
-
-                await asyncio.sleep(2)
-
-            except Exception as e:
-                print(f"Error in degen processing: {str(e)}")
-                await asyncio.sleep(2)
+            await asyncio.sleep(interval)
+            for stats in self.ingest.latency_stats():
+                print(f"Ingest [{stats['family']}] received={stats['received']} handled={stats['handled']} depth={stats['depth']} "
+                      f"avg={stats['avg_ms']:.1f}ms p50={stats['p50_ms']:.1f}ms p95={stats['p95_ms']:.1f}ms max={stats['max_ms']:.1f}ms")
+            print(f"Ingest dedupe: tracked={len(self.ingest.seen)} duplicates_dropped={self.ingest.seen.duplicates}")
+            multialert_stats = self.multialerts.stats()
+            print(f"Multialert detector: cas={multialert_stats['cas']} observed={multialert_stats['observed']} "
+                  f"expired={multialert_stats['expired']} rule_hits={multialert_stats['rule_hits']}")
+            pool_stats = self.enrichment_pool.stats()
+            print(f"Enrichment pool: busy={pool_stats['busy']}/{pool_stats['workers']} depth={pool_stats['depth']} "
+                  f"max_depth={pool_stats['max_depth']} submitted={pool_stats['submitted']} dropped={pool_stats['dropped']} "
+                  f"completed={pool_stats['completed']} failed={pool_stats['failed']} "
+                  f"avg_wait={pool_stats['avg_wait_ms']:.1f}ms p95_wait={pool_stats['p95_wait_ms']:.1f}ms")
+            http_stats = self.http.stats()
+            print(f"HTTP pool: requests={http_stats['requests']} new_conns={http_stats['connections_created']} "
+                  f"reused_conns={http_stats['connections_reused']} reuse={http_stats['reuse_ratio']:.0%} "
+                  f"avg_connect={http_stats['avg_connect_ms']:.1f}ms dns_hits={http_stats['dns_hits']} dns_misses={http_stats['dns_misses']}")
+            cache_stats = response_cache.stats()
+            print(f"Response cache: entries={cache_stats['entries']} evictions={cache_stats['evictions']}")
+            for name, endpoint_stats in cache_stats['endpoints'].items():
+                print(f"Cache [{name}] hits={endpoint_stats['hits']} stale_hits={endpoint_stats['stale_hits']} "
+                      f"misses={endpoint_stats['misses']} hit_rate={endpoint_stats['hit_rate']:.0%}")
+            quote_stats = self.quotes.stats()
+            print(f"Quote engine: tracked={quote_stats['tracked']} ticks={quote_stats['ticks']} quoted={quote_stats['quoted']} "
+                  f"fallbacks={quote_stats['fallbacks']} subscribed={quote_stats['subscribed']} "
+                  f"published={quote_stats['published']} dropped={quote_stats['dropped']} callback_errors={quote_stats['callback_errors']} "
+                  f"requests={quote_stats['requests']}")
+            job_stats = self.snapshot_jobs.stats()
+            print(f"Snapshot jobs: pending={job_stats['pending']} ath_running={job_stats['ath_running']} batches={job_stats['batches']} "
+                  f"completed={job_stats['completed']} failed={job_stats['failed']} dropped_late={job_stats['dropped_late']}")
+            writer_stats = db_writer.stats()
+            print(f"DB writer: depth={writer_stats['depth']} writes={writer_stats['writes']} commits={writer_stats['commits']} "
+                  f"avg_commit={writer_stats['avg_commit_size']:.1f} max_commit={writer_stats['max_commit_size']} errors={writer_stats['errors']} "
+                  f"avg_queue={writer_stats['avg_queue_ms']:.1f}ms p95_queue={writer_stats['p95_queue_ms']:.1f}ms")
+            for name, hedge in hedge_stats.stats().items():
+                print(f"Hedged [{name}] calls={hedge['calls']} hedges={hedge['hedges']} failures={hedge['failures']} wins={hedge['wins']} "
+                      f"p50={hedge['p50_ms']:.1f}ms p95={hedge['p95_ms']:.1f}ms primary_p95>={hedge['primary_p95_ms']:.1f}ms "
+                      f"saved_p95>={hedge['saved_p95_ms']:.1f}ms")
+            for name, ranking in source_ranker.stats().items():
+                print(f"Source ranking [{name}] " + " > ".join(
+                    f"{source['source']}(ok={source['success']:.0%} p50={source['p50_ms']:.0f}ms p95={source['p95_ms']:.0f}ms"
+                    f"{' OPEN' if source['open'] else ''})" for source in ranking))
+            for username, tg_stats in scanner.stats().items():
+                print(f"Telegram [{username}] requests={tg_stats['requests']} replies={tg_stats['replies']} "
+                      f"timeouts={tg_stats['timeouts']} flood_waits={tg_stats['flood_waits']} errors={tg_stats['errors']} "
+                      f"in_flight={tg_stats['in_flight']} avg_reply={tg_stats['avg_reply_ms']:.0f}ms")
+            wallet_stats = self.wallets.stats()
+            print(f"Wallet PnL: wallets={wallet_stats['wallets']} hit_rate={wallet_stats['hit_rate']:.0%} "
+                  f"memory_hits={wallet_stats['memory_hits']} db_hits={wallet_stats['db_hits']} misses={wallet_stats['misses']} "
+                  f"computed={wallet_stats['computed']} failed={wallet_stats['failed']} avg_compute={wallet_stats['avg_compute_ms']:.0f}ms")
+            if self.wallets.calculator.store is not None:
+                store_stats = self.wallets.calculator.store.stats()
+                print(f"Wallet tx store: syncs={store_stats['syncs']} pages={store_stats['pages_fetched']} "
+                      f"new_txs={store_stats['new_txs']} new_swaps={store_stats['new_swaps']}")
+            verdict_stats = self.verdicts.stats()
+            print(f"Scanner verdicts: entries={verdict_stats['entries']} warmed={verdict_stats['warmed']} "
+                  f"scanners={verdict_stats['scanners']}")
+            self.verdicts.prune()
+            price_stats = sol_price.stats()
+            print(f"SOL price: {price_stats['price']} age={price_stats['age_s'] or 0:.0f}s refreshes={price_stats['refreshes']} "
+                  f"failures={price_stats['failures']} stale_reads={price_stats['stale_reads']}")
+            rpc_stats = rpc.stats()
+            print(f"Solana RPC: calls={rpc_stats['calls']} batches={rpc_stats['batches']} "
+                  f"avg_batch={rpc_stats['avg_batch_size']:.1f} coalesced={rpc_stats['coalesced']} "
+                  f"errors={rpc_stats['errors']} avg_batch_ms={rpc_stats['avg_batch_ms']:.1f}")
+            for provider, circuit in breakers.stats().items():
+                print(f"Circuit [{provider}] state={circuit['state']} successes={circuit['successes']} "
+                      f"failures={circuit['failures']} rejected={circuit['rejected']} opened={circuit['opened']}")
+            for name, flight in single_flight.stats().items():
+                print(f"Single-flight [{name}] calls={flight['calls']} saved={flight['saved']}")
+            for provider, limits in self.http.limiter.stats().items():
+                print(f"Rate limit [{provider}] requests={limits['requests']} throttled={limits['throttled']} "
+                      f"waited={limits['wait_total_s']:.1f}s avg_wait={limits['wait_avg_ms']:.1f}ms max_wait={limits['wait_max_ms']:.1f}ms")
 
     async def start_2x_monitoring(self, ca, token_name):
         """Start monitoring a token for 2x price movements"""
         try:
-            async with aiohttp.ClientSession() as session:
-                # Create task for 2x monitoring
-                await self.twox.start_marketcap_monitoring(ca, token_name)
-                print(f"Started 2x monitoring for {token_name} ({ca})")
+            await self.twox.start_marketcap_monitoring(ca, token_name)
+            print(f"Started 2x monitoring for {token_name} ({ca})")
         except Exception as e:
             print(f"Error starting 2x monitoring for {ca}: {str(e)}")
 
     async def check_multialert(self, session, token_name, ca, channel_name):
-        if self.serv_data is None:
-            await self.initialize()
+        """Cheap multialert detection on the ingest path, enrichment is queued"""
         try:
+            rule_hits = self.multialerts.observe(ca, channel_name)
             if ca in self.multi_alerted_cas:
                 return
-            
-            current_time = datetime.now().isoformat()
-
-            if ca not in self.ca_appearences:
-                self.ca_appearences[ca] = {
-                    'channels': set(),
-                    'first_seen': current_time,
-                    'token_name': token_name
-                }
-            self.ca_appearences[ca]['channels'].add(channel_name)
-            
-            all_fresh = self.fresh_cas | self.fresh_5sol_1m_mc_cas | self.fresh_1h_cas
-            all_swt = (self.whale_cas | self.smart_cas | self.legend_cas | self.kol_alpha_cas | self.kol_regular_cas | self.challenge_cas | self.high_freq_cas | self.insider_wallet_cas)
 
             multialert_found = False 
 
@@ -418,7 +353,7 @@ class ScrapeAD:
             #if ca == test_ca:
                 #multialert_found = True
 
-            if ca in all_fresh and (ca in self.degen_cas or ca in all_swt):
+            if rule_hits:
                 multialert_found = True
 
             if multialert_found:
@@ -427,120 +362,256 @@ class ScrapeAD:
                 
                 asyncio.create_task(self.start_2x_monitoring(ca, token_name))
 
-                dex_data = {}
-                backup_bd_data = {}
-                unique_bd_data = {}
-                marketcap = 0
-                m5_vol = 0
-                m30_vol = 0
-                m30_vol_change = 0
-                liquidity = 0
-                telegram = None
-                twitter = None
-                holder_count = 0
-                pool_address = None
+                deadline = Deadline(self.enrichment_budget)
+                if not self.enrichment_pool.submit(session, token_name, ca, deadline):
+                    # let a later sighting retry once the workers catch up
+                    self.multi_alerted_cas.discard(ca)
+                    print(f"Enrichment queue full, dropped multialert for {ca}")
 
-                try:
-                    price = await self.pri.price(ca)
-                except Exception as e:
-                    print(str(e))
-                
-                try:
-                    dex_data = await self.dex.fetch_token_data_from_dex(ca) or {}
-                except Exception as e:
-                    print(f"Error fetching dex data: {str(e)}")
-                
-                try:
-                    unique_bd_data = await self.bd_trade_data.process(ca) or {}
-                    print("DEBUG: Got unique BD data")
-                except Exception as e:
-                    print(f"Error fetching unique BD data: {str(e)}")
+        except Exception as e:
+            print(f"Error in running check for multialert: {str(e)}")
+            import traceback
+            print(traceback.format_exc())
 
-                try:
-                    token_name = dex_data.get('token_name') or backup_bd_data.get('name', 'Unknown Name')
-                    print(f"Token Name: {token_name} CA: {ca}")
-                    marketcap = dex_data.get('token_mc', 0) or self.markca.marketcap(ca)
-                    print(f"Marketcap: ${marketcap:.2f}")
-                    m5_vol = dex_data.get('token_5m_vol', 0)
-                    print(f"5m volume: {m5_vol:.2f}")     
-                    liquidity = dex_data.get('token_liquidity', 0)
-                    if not liquidity:
-                        l_data = await self.pri._bd_price_liquidity(ca)
+    async def enrich_multialert(self, session, token_name, ca, deadline=None):
+        """Runs on the enrichment worker pool, never on the ingest path"""
+        if self.serv_data is None:
+            await self.initialize()
+        try:
+            backup_bd_data = {}
+            m30_vol = 0
+            m30_vol_change = 0
+            telegram = None
+            twitter = None
+            holder_count = 0
+
+            async def get_marketcap(dex):
+                return dex.get('token_mc', 0) or await self.markca.marketcap(ca)
+
+            async def get_liquidity(dex):
+                liquidity = dex.get('token_liquidity', 0)
+                if not liquidity:
+                    l_data = await self.pri._bd_price_liquidity(ca)
+                    if l_data:
                         _, liquidity = l_data
-                    print(f"Liquidity: {liquidity}")
-                    pool_address = dex_data.get('pool_address')
-                    print(f"Pool Address: {pool_address if pool_address else 'Not found'}")
-                except Exception as e:
-                    print(f"Error processing token data: {str(e)}")
+                return liquidity
+
+            async def forward_to_alefdao(soul, bundle):
+                if soul.get('passes', False) and bundle.get('passes', False):
+                    await self.rickbot_webhook.full_send_ca_to_alefdao(ca)
+                    #await self.slime_alert.send_message(ca)
+                elif soul.get('passes', False) or bundle.get('passes', False):
+                    await self.rickbot_webhook.conditional_send_ca_to_alefdao(ca)
+                return True
+
+            async def analyze_holders(holders, soul):
+                analysis = {'total_held': 0, 'holders_over_5': 0, 'holder_criteria': False, 'wallet_analysis': {}}
+                if not (isinstance(holders, tuple) and len(holders) == 2):
+                    return analysis
+                holder_values, holder_evaluation = holders
+                if not (holder_values and isinstance(holder_values, dict) and 'metadata' in holder_values):
+                    return analysis
+                metadata = holder_values.get('metadata', {})
+                if not metadata:
+                    return analysis
+                # Validate the values
+                total_held = metadata.get('total_percentage_held', 0)
+                if total_held > 100:  # Sanity check
+                    print(f"Warning: Invalid total_held value: {total_held}%, capping at 100%")
+                    total_held = 100
+                holders_over_5 = metadata.get('holders_over_5_percent', 0)
+                if holders_over_5 > 10:  # Sanity check for reasonable max
+                    print(f"Warning: Suspicious holders_over_5: {holders_over_5}, capping at 10")
+                    holders_over_5 = 10
+                analysis['total_held'] = total_held
+                analysis['holders_over_5'] = holders_over_5
+
+                #check criteria to run top wallet pnl analysis
+                if soul.get('passes', False) and holders_over_5 < 4 and soul.get('dev_holding', 0) < 5:
+                    analysis['holder_criteria'] = True
+                    wallet_analysis = {}
+                    print("\nTop Wallet Performance Analysis:")
+                    print("-" * 50)
+                    # Top 4 wallets excluding metadata, analysed side by side; wallets
+                    # without a result are replaced by the next holders in line
+                    candidates = [wallet_address for wallet_address in holder_values if wallet_address != 'metadata']
+                    while candidates and len(wallet_analysis) < 4:
+                        batch, candidates = candidates[:4 - len(wallet_analysis)], candidates[4 - len(wallet_analysis):]
+                        for wallet_address, wallet_pnl in (await self.wallets.pnl_many(batch)).items():
+                            if wallet_pnl:
+                                wallet_analysis[wallet_address] = {
+                                    'pnl': wallet_pnl.get('pnl', 0),  # Use .get() to handle missing keys
+                                    'tokens_traded': wallet_pnl.get('tokens_traded', 0),
+                                    'wins': wallet_pnl.get('trades_won', 0),
+                                    'losses': wallet_pnl.get('trades_loss', 0),
+                                    'avg_entry': wallet_pnl.get('average_entry_per_trade', 0) if wallet_pnl.get('average_entry_per_trade', 0) > 0 else None
+                                }
+                            else:
+                                print(f"No PnL for wallet {wallet_address}")
+                    analysis['wallet_analysis'] = wallet_analysis
+                return analysis
+
+            async def get_dev_report(dex):
+                return await self.dev_history.dev_report(ca=ca, token_name=dex.get('token_name') or token_name)
+
+            async def get_ohlcv(dex, true_age):
+                return await self._get_ohlcv_d(age=true_age, pair_address=dex.get('pool_address'))
+
+            async def get_sr(dex, supply, ohlcv):
+                return await self.sr.get_sr_zones(dex.get('token_name') or token_name, ca, supply, ohlcv)
+
+            async def get_order_blocks(dex, supply, ohlcv):
+                pool_address = dex.get('pool_address')
+                if not pool_address:
+                    print("No pool address available for Order Block analysis")
+                    return {}
+                print("\nFetching Order Block data...")
+                return await self.ob.update_order_blocks(
+                    ca, 
+                    pool_address, 
+                    dex.get('token_name') or token_name, 
+                    supply, 
+                    ohlcv,
+                    short_timeframes=self.short_timeframes,
+                    longer_timeframes=self.longer_timeframes
+                )
 
-                print("DEBUG: About to fetch social data")
-                try:
-                    if dex_data and 'socials' in dex_data:
-                        telegram = dex_data['socials'].get('telegram')
-                        twitter = dex_data['socials'].get('twitter')
-                    if not telegram and backup_bd_data:
-                        telegram = backup_bd_data.get('telegram')
-                    if not twitter and backup_bd_data:
-                        twitter = backup_bd_data.get('twitter')
-                    print(f"Twitter: {twitter}")
-                    print(f"Telegram: {telegram}")
-                except Exception as e:
-                    print(f"Error processing social data: {e}")
-
-                websites_data = None
-                try:
-                    if dex_data and 'websites' in dex_data:
-                        websites_data = dex_data['websites']
-                        print(f"Websites: Count={websites_data['count']}, Types={websites_data['types']}")
-                except Exception as e:
-                    print(f"Error processing website data: {e}")
-                    websites_data = {'count': 0, 'types': [], 'urls': {}}
-                
-                print("DEBUG: About to process birdeye data")
-                try:
-                    if unique_bd_data:
-                        m30_vol = unique_bd_data.get('m30_vol', 0)
-                        m30_buys = unique_bd_data.get('m30_buys', 0)
-                        m30_sells = unique_bd_data.get('m30_sells', 0)
-                        m30_price_change = unique_bd_data.get('m30_price_change', 0)
-                        m30_vol_change = unique_bd_data.get('m30_vol_change', 0)
-                        m30_trades = unique_bd_data.get('m30_trade', 0)
+            # Independent sources run side by side, the three Telegram bots included:
+            # replies are matched to requests by the scanner client
+            graph = StageGraph(name=ca)
+            graph.add('price', lambda: self.pri.price(ca), timeout=15, default=0)
+            graph.add('dex', lambda: self.dex.fetch_token_data_from_dex(ca), timeout=15, default={})
+            graph.add('bd_trade', lambda: self.bd_trade_data.process(ca), timeout=20, default={})
+            graph.add('marketcap', get_marketcap, deps=['dex'], timeout=20, default=0)
+            graph.add('liquidity', get_liquidity, deps=['dex'], timeout=15, default=0)
+            graph.add('swt_server', lambda: self.serv_data.swt_server_data(ca), timeout=10, default={
+                'count': 0, 'buys': 0, 'sells': 0,
+                'channels': {}, 'latest_descriptions': [],
+                'trading_links': {'photon': '', 'bull_x': '', 'dex': ''}
+            })
+            graph.add('degen_server', lambda: self.serv_data.degen_server_data(ca), timeout=10, default={
+                'count': 0, 'buys': 0, 'sells': 0,
+                'channels': {'Degen': {'buys': 0, 'sells': 0}},
+                'latest_descriptions': []
+            })
+            graph.add('fresh_server', lambda: self.serv_data.fresh_server_data(ca), timeout=10, default={
+                'count': 0, 'buys': 0, 'sells': 0,
+                'channels': {}, 'latest_descriptions': []
+            })
+            graph.add('soul', lambda: self.soul_scanner_bot.send_and_receive_message(ca), timeout=20,
+                      default={'passes': False, 'dev_holding': 0, 'sniper_percent': 0, 'scans': 0})
+            graph.add('bundle', lambda: self.bundle_bot.send_and_receive_message(ca), timeout=30,
+                      default={'passes': False})
+            graph.add('dex_paid', lambda: self.wallet_pnl_tg.send_and_recieve_message_dex_paid(ca), timeout=20,
+                      default=False)
+            graph.add('alefdao', forward_to_alefdao, deps=['soul', 'bundle'], timeout=15, default=False)
+            graph.add('token_age', lambda: self.token_age.process_pair_age(ca), timeout=15,
+                      default={'value': 0, 'unit': 'minutes'})
+            graph.add('true_age', lambda: self.true_age.get(ca), timeout=20, default=0)
+            graph.add('holders', lambda price: self.get_top_holders.calculate_holder_value(ca, price), deps=['price'],
+                      timeout=30, default=None)
+            graph.add('holder_analysis', analyze_holders, deps=['holders', 'soul'], timeout=90,
+                      default={'total_held': 0, 'holders_over_5': 0, 'holder_criteria': False, 'wallet_analysis': {}})
+            graph.add('dev', get_dev_report, deps=['dex'], timeout=60, default={
+                'weekly_activity': [{}],
+                'general_stats': {
+                    'total_tokens_created': 0,
+                    'total_rugs': 0,
+                    'total_successful': 0,
+                    'rug_rate': 0
+                }
+            })
+            graph.add('supply', lambda: self.sup.supply(ca), timeout=20, default=0)
+            graph.add('ohlcv', get_ohlcv, deps=['dex', 'true_age'], timeout=45, default=None)
+            graph.add('sr', get_sr, deps=['dex', 'supply', 'ohlcv'], timeout=30, default=None)
+            graph.add('ob', get_order_blocks, deps=['dex', 'supply', 'ohlcv'], timeout=30, default={})
+
+            results = await graph.run(deadline=deadline)
+            graph.print_timings()
+
+            price = results['price']
+            dex_data = results['dex']
+            unique_bd_data = results['bd_trade']
+            print("DEBUG: Got unique BD data")
+
+            marketcap = results['marketcap']
+            liquidity = results['liquidity']
+            m5_vol = 0
+            pool_address = None
+            try:
+                token_name = dex_data.get('token_name') or backup_bd_data.get('name', 'Unknown Name')
+                print(f"Token Name: {token_name} CA: {ca}")
+                print(f"Marketcap: ${marketcap:.2f}")
+                m5_vol = dex_data.get('token_5m_vol', 0)
+                print(f"5m volume: {m5_vol:.2f}")     
+                print(f"Liquidity: {liquidity}")
+                pool_address = dex_data.get('pool_address')
+                print(f"Pool Address: {pool_address if pool_address else 'Not found'}")
+            except Exception as e:
+                print(f"Error processing token data: {str(e)}")
 
-                        # unique wallet data 
-                        new_unique_wallet_count_30m = unique_bd_data.get('new_unique_wallets_30_min_count', 0)
-                        print(f"New Unique wallets last 30m: {new_unique_wallet_count_30m}")
+            print("DEBUG: About to fetch social data")
+            try:
+                if dex_data and 'socials' in dex_data:
+                    telegram = dex_data['socials'].get('telegram')
+                    twitter = dex_data['socials'].get('twitter')
+                if not telegram and backup_bd_data:
+                    telegram = backup_bd_data.get('telegram')
+                if not twitter and backup_bd_data:
+                    twitter = backup_bd_data.get('twitter')
+                print(f"Twitter: {twitter}")
+                print(f"Telegram: {telegram}")
+            except Exception as e:
+                print(f"Error processing social data: {e}")
 
-                        new_unique_wallet_percent_change_30m = unique_bd_data.get('new_unique_wallets_30_min_percent_change', 0)
-                        print(f"Percentage change in unique wallets last 30m: {new_unique_wallet_percent_change_30m}%")
+            websites_data = None
+            try:
+                if dex_data and 'websites' in dex_data:
+                    websites_data = dex_data['websites']
+                    print(f"Websites: Count={websites_data['count']}, Types={websites_data['types']}")
+            except Exception as e:
+                print(f"Error processing website data: {e}")
+                websites_data = {'count': 0, 'types': [], 'urls': {}}
+            
+            print("DEBUG: About to process birdeye data")
+            m30_buys = 0
+            m30_sells = 0
+            m30_price_change = 0
+            m30_trades = 0
+            try:
+                if unique_bd_data:
+                    m30_vol = unique_bd_data.get('m30_vol', 0)
+                    m30_buys = unique_bd_data.get('m30_buys', 0)
+                    m30_sells = unique_bd_data.get('m30_sells', 0)
+                    m30_price_change = unique_bd_data.get('m30_price_change', 0)
+                    m30_vol_change = unique_bd_data.get('m30_vol_change', 0)
+                    m30_trades = unique_bd_data.get('m30_trade', 0)
 
-                        new_unique_wallet_count_1h = unique_bd_data.get('new_unique_wallets_1h_count', 0)
-                        print(f"New Unique wallets last 1h: {new_unique_wallet_count_1h}")
+                    # unique wallet data 
+                    new_unique_wallet_count_30m = unique_bd_data.get('new_unique_wallets_30_min_count', 0)
+                    print(f"New Unique wallets last 30m: {new_unique_wallet_count_30m}")
 
-                        new_unique_wallet_percent_change_1h = unique_bd_data.get('new_unique_wallets_1h_percent_change', 0)
-                        print(f"Percentage change in unique wallets last 1h: {new_unique_wallet_percent_change_1h}%")
+                    new_unique_wallet_percent_change_30m = unique_bd_data.get('new_unique_wallets_30_min_percent_change', 0)
+                    print(f"Percentage change in unique wallets last 30m: {new_unique_wallet_percent_change_30m}%")
 
-                        # general buy sell data 
-                        trade_percent_change_30m = unique_bd_data.get('trade_30_min_percent_change', 0)
-                        print(f"Trade percentage change last 30m: {trade_percent_change_30m}%")
+                    new_unique_wallet_count_1h = unique_bd_data.get('new_unique_wallets_1h_count', 0)
+                    print(f"New Unique wallets last 1h: {new_unique_wallet_count_1h}")
 
-                        buy_percent_change_30m = unique_bd_data.get('buy_30_min_percent_change', 0)
-                        print(f"Buy percentage change last 30m: {buy_percent_change_30m}%")
+                    new_unique_wallet_percent_change_1h = unique_bd_data.get('new_unique_wallets_1h_percent_change', 0)
+                    print(f"Percentage change in unique wallets last 1h: {new_unique_wallet_percent_change_1h}%")
 
-                        sell_percent_change_30m = unique_bd_data.get('sell_30_min_percent_change', 0)
-                        print(f"Sell percentage change last 30m: {sell_percent_change_30m}%")
+                    # general buy sell data 
+                    trade_percent_change_30m = unique_bd_data.get('trade_30_min_percent_change', 0)
+                    print(f"Trade percentage change last 30m: {trade_percent_change_30m}%")
 
-                        holder_count = unique_bd_data.get('holders', 0)
-                    else:
-                        new_unique_wallet_count_30m = 0
-                        new_unique_wallet_percent_change_30m = 0
-                        new_unique_wallet_count_1h = 0
-                        new_unique_wallet_percent_change_1h = 0
-                        trade_percent_change_30m = 0
-                        buy_percent_change_30m = 0
-                        sell_percent_change_30m = 0
-                        holder_count = 0
-                except Exception as e:
-                    print(f"Error processing birdeye data: {e}")
+                    buy_percent_change_30m = unique_bd_data.get('buy_30_min_percent_change', 0)
+                    print(f"Buy percentage change last 30m: {buy_percent_change_30m}%")
+
+                    sell_percent_change_30m = unique_bd_data.get('sell_30_min_percent_change', 0)
+                    print(f"Sell percentage change last 30m: {sell_percent_change_30m}%")
+
+                    holder_count = unique_bd_data.get('holders', 0)
+                else:
                     new_unique_wallet_count_30m = 0
                     new_unique_wallet_percent_change_30m = 0
                     new_unique_wallet_count_1h = 0
@@ -549,820 +620,705 @@ class ScrapeAD:
                     buy_percent_change_30m = 0
                     sell_percent_change_30m = 0
                     holder_count = 0
+            except Exception as e:
+                print(f"Error processing birdeye data: {e}")
+                new_unique_wallet_count_30m = 0
+                new_unique_wallet_percent_change_30m = 0
+                new_unique_wallet_count_1h = 0
+                new_unique_wallet_percent_change_1h = 0
+                trade_percent_change_30m = 0
+                buy_percent_change_30m = 0
+                sell_percent_change_30m = 0
+                holder_count = 0
 
-                print("DEBUG: About to fetch server data")           
-                #get servercount & buy/sell data
-                print(f"\nFetching server data for CA: {ca}")
-                self.serv_data.target_ca = ca
-
-                # Check SWT data
-                swt_data = {}
-                try:
-                    swt_data = await self.serv_data.swt_server_data() or {}
-                    print("DEBUG: Got SWT server data")
-                except Exception as e:
-                    print(f"Error fetching SWT server data: {str(e)}")
-                    swt_data = {
-                        'count': 0, 'buys': 0, 'sells': 0, 
-                        'channels': {}, 'latest_descriptions': [],
-                        'trading_links': {'photon': '', 'bull_x': '', 'dex': ''}
-                    }
-
-                # Check Degen data
-                degen_data = {}
-                try:
-                    degen_data = await self.serv_data.degen_server_data() or {}
-                    print("DEBUG: Got Degen server data")
-                except Exception as e:
-                    print(f"Error fetching Degen server data: {str(e)}")
-                    degen_data = {
-                        'count': 0, 'buys': 0, 'sells': 0,
-                        'channels': {'Degen': {'buys': 0, 'sells': 0}},
-                        'latest_descriptions': []
-                    }
+            #servercount & buy/sell data
+            swt_data = results['swt_server']
+            degen_data = results['degen_server']
+            fresh_data = results['fresh_server']
 
-                # Check Fresh data
-                fresh_data = {}
-                try:
-                    fresh_data = await self.serv_data.fresh_server_data() or {}
-                    print("DEBUG: Got Fresh server data")
-                except Exception as e:
-                    print(f"Error fetching Fresh server data: {str(e)}")
-                    fresh_data = {
-                        'count': 0, 'buys': 0, 'sells': 0,
-                        'channels': {}, 'latest_descriptions': []
-                    }
+            print("DEBUG: About to process trading links")
+            #trading links:
+            try:
+                links = swt_data.get('trading_links', {})
+                if not links:
+                    links = {'photon': '', 'bull_x': '', 'dex': ''}
+                
+                photon_link = links.get('photon', '')
+                bull_x_link = links.get('bull_x', '')
+                dexscreener_link = links.get('dex', '')
+                print(f"Photon: {photon_link}")
+                print(f"Bullx: {bull_x_link}")
+                print(f"Dex Link: {dexscreener_link}")
+            except Exception as e:
+                print(f"Error processing trading links: {str(e)}")
+                photon_link = ''
+                bull_x_link = ''
+                dexscreener_link = ''
 
-                print("DEBUG: About to process trading links")
-                #trading links:
-                try:
-                    links = swt_data.get('trading_links', {})
-                    if not links:
-                        links = {'photon': '', 'bull_x': '', 'dex': ''}
-                    
-                    photon_link = links.get('photon', '')
-                    bull_x_link = links.get('bull_x', '')
-                    dexscreener_link = links.get('dex', '')
-                    print(f"Photon: {photon_link}")
-                    print(f"Bullx: {bull_x_link}")
-                    print(f"Dex Link: {dexscreener_link}")
-                except Exception as e:
-                    print(f"Error processing trading links: {str(e)}")
-                    photon_link = ''
-                    bull_x_link = ''
-                    dexscreener_link = ''
-
-                print("DEBUG: About to process server count data")
-                try:
-                    swt_count = swt_data.get('count', 0)
-                    swt_buys = swt_data.get('buys', 0)
-                    swt_sells = swt_data.get('sells', 0)
-                    degen_count = degen_data.get('count', 0)
-                    degen_buys = degen_data.get('buys', 0)
-                    degen_sells = degen_data.get('sells', 0)
-                    
-                    total_swt_count = swt_count + degen_count
-                    total_swt_buys = swt_buys + degen_buys
-                    total_swt_sells = swt_sells + degen_sells
-                    total_fresh_count = fresh_data.get('count', 0)
-                    total_fresh_buys = fresh_data.get('buys', 0)
-                    total_fresh_sells = fresh_data.get('sells', 0)
-                    print(f"\nBuy Sell & Server Count Data for {ca}")
-                    print(f"SWT BUYS: {total_swt_buys}")
-                    print(f"SWT SELLS: {total_swt_sells}")
-                    print(f"Fresh Buys: {total_fresh_buys}")
-                    print(f"Fresh Sells: {total_fresh_sells}")
-                    print(f"SWT COUNT: {total_swt_count} || Fresh Count: {total_fresh_count}")
-                except Exception as e:
-                    print(f"Error processing server count data: {str(e)}")
-                    total_swt_count = 0
-                    total_swt_buys = 0
-                    total_swt_sells = 0
-                    total_fresh_count = 0
-                    total_fresh_buys = 0
-                    total_fresh_sells = 0
-
-                #get last 5 txs (serverdata.py)
-                try:
-                    last_swt = swt_data.get('latest_descriptions', [])[-1:] if swt_data else []
-                    last_degen = degen_data.get('latest_descriptions', [])[-1:] if degen_data else []
-                    last_fresh = fresh_data.get('latest_descriptions', [])[-1:] if fresh_data else []
-                    print(f"\nLast 3 Descriptions: ")
-                    print(last_swt)
-                    print(last_fresh)
-                    print(last_degen)
-                except Exception as e:
-                    print(f"Error processing transaction descriptions: {str(e)}")
-                    last_swt = []
-                    last_degen = []
-                    last_fresh = []
-
-                print("DEBUG: About to call TG evaluation")
-                #call tg evaluation
-                soul_data = {'passes': False, 'dev_holding': 0, 'sniper_percent': 0, 'scans': 0}
-                try:
-                    soul_data = await self.soul_scanner_bot.send_and_receive_message(ca) or soul_data
-                    if soul_data:
-                        try:
-                            holder_count = unique_bd_data.get('holders', 0)
-                            #top_hold = soul_data['top_percentage']
-                            dev_holding = soul_data.get('dev_holding', 0)
-                            sniper_percent = soul_data.get('sniper_percent', 0)
-                            scans = soul_data.get('scans', 0)
-
-                            tg_metrics = {
-                                'token_migrated': False,
-                                'holding_percentage': None,
-                                'holder_count': holder_count,
-                                #'top_holding_percentage': top_hold,
-                                'dev_holding_percentage': dev_holding,
-                                'sniper_percent': sniper_percent,
-                                'scans': scans
-                            }
-                    
-                            if soul_data.get('passes', False):
-                                print(f"\nSOUL SCANNER TEST PASSED FOR: {ca}")
-                            else:
-                                print(f"Soul Scanner Failed")
-                        except Exception as e:
-                            print(f"Error processing soul scanner data: {str(e)}")
-                            dev_holding = 0
-                            sniper_percent = 0
-                            scans = 0
-                            tg_metrics = {
-                                'token_migrated': False,
-                                'holding_percentage': None,
-                                'holder_count': holder_count,
-                                'dev_holding_percentage': 0,
-                                'sniper_percent': 0,
-                                'scans': 0
-                            }
-                except Exception as e:
-                    print(f"Error during soul scanner: {str(e)}")
-                    dev_holding = 0
-                    sniper_percent = 0
-                    scans = 0
-                    tg_metrics = {
-                        'token_migrated': False,
-                        'holding_percentage': None,
-                        'holder_count': holder_count,
-                        'dev_holding_percentage': 0,
-                        'sniper_percent': 0,
-                        'scans': 0
-                    }
-                    
-                bundle_data = {'passes': False}
-                try:
-                    bundle_data = await self.bundle_bot.send_and_receive_message(ca) or bundle_data
-                    if bundle_data and bundle_data.get('passes', False):
-                            #await self.rickbot_webhook.full_send_ca_to_alefdao(ca)
-                            #await self.slime_alert.send_message(ca)
-                            print(f"\nBundle bot PASSED FOR: {ca}")
-                            if isinstance(bundle_data['token_bonded'], bool):
-                                tg_metrics['token_migrated'] = bundle_data['token_bonded']
-                                print(f"Token Migrated to Dex!")
-                            else:
-                                print(f"Token on pump!")
-                            
-                            #tg_metrics['holding_percentage'] = ['holding_percentage']
-                            #if bundle_data['token_bonded']:
-                                #if isinstance(bundle_data['token_bonded'], bool):
-                                    #tg_metrics['token_migrated'] = bundle_data['token_bonded']
-                                    #print(f"Token Migrated")
-                                #else:
-                                    #print(F"Token On Pump")
+            print("DEBUG: About to process server count data")
+            try:
+                swt_count = swt_data.get('count', 0)
+                swt_buys = swt_data.get('buys', 0)
+                swt_sells = swt_data.get('sells', 0)
+                degen_count = degen_data.get('count', 0)
+                degen_buys = degen_data.get('buys', 0)
+                degen_sells = degen_data.get('sells', 0)
+                
+                total_swt_count = swt_count + degen_count
+                total_swt_buys = swt_buys + degen_buys
+                total_swt_sells = swt_sells + degen_sells
+                total_fresh_count = fresh_data.get('count', 0)
+                total_fresh_buys = fresh_data.get('buys', 0)
+                total_fresh_sells = fresh_data.get('sells', 0)
+                print(f"\nBuy Sell & Server Count Data for {ca}")
+                print(f"SWT BUYS: {total_swt_buys}")
+                print(f"SWT SELLS: {total_swt_sells}")
+                print(f"Fresh Buys: {total_fresh_buys}")
+                print(f"Fresh Sells: {total_fresh_sells}")
+                print(f"SWT COUNT: {total_swt_count} || Fresh Count: {total_fresh_count}")
+            except Exception as e:
+                print(f"Error processing server count data: {str(e)}")
+                total_swt_count = 0
+                total_swt_buys = 0
+                total_swt_sells = 0
+                total_fresh_count = 0
+                total_fresh_buys = 0
+                total_fresh_sells = 0
+
+            #get last 5 txs (serverdata.py)
+            try:
+                last_swt = swt_data.get('latest_descriptions', [])[-1:] if swt_data else []
+                last_degen = degen_data.get('latest_descriptions', [])[-1:] if degen_data else []
+                last_fresh = fresh_data.get('latest_descriptions', [])[-1:] if fresh_data else []
+                print(f"\nLast 3 Descriptions: ")
+                print(last_swt)
+                print(last_fresh)
+                print(last_degen)
+            except Exception as e:
+                print(f"Error processing transaction descriptions: {str(e)}")
+                last_swt = []
+                last_degen = []
+                last_fresh = []
+
+            print("DEBUG: About to process TG evaluation")
+            #tg evaluation
+            soul_data = results['soul']
+            try:
+                if soul_data:
+                    try:
+                        holder_count = unique_bd_data.get('holders', 0)
+                        #top_hold = soul_data['top_percentage']
+                        dev_holding = soul_data.get('dev_holding', 0)
+                        sniper_percent = soul_data.get('sniper_percent', 0)
+                        scans = soul_data.get('scans', 0)
+
+                        tg_metrics = {
+                            'token_migrated': False,
+                            'holding_percentage': None,
+                            'holder_count': holder_count,
+                            #'top_holding_percentage': top_hold,
+                            'dev_holding_percentage': dev_holding,
+                            'sniper_percent': sniper_percent,
+                            'scans': scans
+                        }
+                
+                        if soul_data.get('passes', False):
+                            print(f"\nSOUL SCANNER TEST PASSED FOR: {ca}")
+                        else:
+                            print(f"Soul Scanner Failed")
+                    except Exception as e:
+                        print(f"Error processing soul scanner data: {str(e)}")
+                        dev_holding = 0
+                        sniper_percent = 0
+                        scans = 0
+                        tg_metrics = {
+                            'token_migrated': False,
+                            'holding_percentage': None,
+                            'holder_count': holder_count,
+                            'dev_holding_percentage': 0,
+                            'sniper_percent': 0,
+                            'scans': 0
+                        }
+            except Exception as e:
+                print(f"Error during soul scanner: {str(e)}")
+                dev_holding = 0
+                sniper_percent = 0
+                scans = 0
+                tg_metrics = {
+                    'token_migrated': False,
+                    'holding_percentage': None,
+                    'holder_count': holder_count,
+                    'dev_holding_percentage': 0,
+                    'sniper_percent': 0,
+                    'scans': 0
+                }
+                
+            bundle_data = results['bundle']
+            try:
+                if bundle_data and bundle_data.get('passes', False):
+                        #await self.rickbot_webhook.full_send_ca_to_alefdao(ca)
+                        #await self.slime_alert.send_message(ca)
+                        print(f"\nBundle bot PASSED FOR: {ca}")
+                        if isinstance(bundle_data['token_bonded'], bool):
+                            tg_metrics['token_migrated'] = bundle_data['token_bonded']
+                            print(f"Token Migrated to Dex!")
+                        else:
+                            print(f"Token on pump!")
+                        
+                        #tg_metrics['holding_percentage'] = ['holding_percentage']
+                        #if bundle_data['token_bonded']:
+                            #if isinstance(bundle_data['token_bonded'], bool):
+                                #tg_metrics['token_migrated'] = bundle_data['token_bonded']
+                                #print(f"Token Migrated")
                             #else:
-                                #await self.rickbot_webhooks.conditional_send_ca_to_alefdao(ca)
-                                #await self.slime_alert.send_message(ca)
-                            
-                except Exception as e:
-                    print(f"Bundle Bot Error: {str(e)}")
+                                #print(F"Token On Pump")
+                        #else:
+                            #await self.rickbot_webhooks.conditional_send_ca_to_alefdao(ca)
+                            #await self.slime_alert.send_message(ca)
+                        
+            except Exception as e:
+                print(f"Bundle Bot Error: {str(e)}")
 
-                try:
-                    if soul_data.get('passes', False) and bundle_data.get('passes', False):
-                        await self.rickbot_webhook.full_send_ca_to_alefdao(ca)
-                        #await self.slime_alert.send_message(ca)
-                    elif soul_data.get('passes', False) or bundle_data.get('passes', False):
-                        await self.rickbot_webhook.conditional_send_ca_to_alefdao(ca)
-                except Exception as e:
-                    print(f"Error sending to webhook: {str(e)}")
+            try:
+                print(f"Holder Count: {tg_metrics['holder_count']}")
+                #print(f"Top Holders hold total of: {tg_metrics['top_holding_percentage']} %")
+                print(f"Dev holds: {tg_metrics['dev_holding_percentage']} %" )
+                print(f"Sniper Percent: {tg_metrics['sniper_percent']}")
+            except Exception as e:
+                print(f"Error printing TG metrics: {str(e)}")
 
-                try:
-                    print(f"Holder Count: {tg_metrics['holder_count']}")
-                    #print(f"Top Holders hold total of: {tg_metrics['top_holding_percentage']} %")
-                    print(f"Dev holds: {tg_metrics['dev_holding_percentage']} %" )
-                    print(f"Sniper Percent: {tg_metrics['sniper_percent']}")
-                except Exception as e:
-                    print(f"Error printing TG metrics: {str(e)}")
-
-                print("DEBUG: About to check dex paid")
-                #dex paid check
-                dex_paid = False
-                try:
-                    dex_paid = await self.wallet_pnl_tg.send_and_recieve_message_dex_paid(ca) or False
-                    print(f"Dex Paid? {dex_paid}")
-                except Exception as e:
-                    print(f"Error checking dex paid: {str(e)}")
-                    
-                #get dex chat .png
-                """
-                dex_chart_data = await self.wallet_pnl_tg.send_and_recieve_dex_chart(ca)
-                if dex_chart_data:
-                    chart_image = dex_chart_data['image_data']
-                """
-
-                print("DEBUG: About to check token age")
-                #token age
-                bonded_time = {'value': 0, 'unit': 'minutes'}
-                try:
-                    bonded_time = await self.token_age.process_pair_age(ca) or bonded_time
-                    if bonded_time:
-                        age_value = bonded_time.get('value', 0)
-                        age_unit = bonded_time.get('unit', 'minutes')
-                        age_str = f"{age_value} {age_unit}"
-                        print(f"Bonded time: {age_str}")
-                    else:
-                        print("No bonded time data available, using default")
-                        age_value = 0
-                        age_unit = 'minutes'
-                        age_str = "0 minutes"
-                except Exception as e:
-                    print(f"Error processing bonded time: {str(e)}")
+            #dex paid check
+            dex_paid = results['dex_paid']
+            print(f"Dex Paid? {dex_paid}")
+                
+            #get dex chat .png
+            """
+            dex_chart_data = await self.wallet_pnl_tg.send_and_recieve_dex_chart(ca)
+            if dex_chart_data:
+                chart_image = dex_chart_data['image_data']
+            """
+
+            #token age
+            bonded_time = results['token_age']
+            try:
+                if bonded_time:
+                    age_value = bonded_time.get('value', 0)
+                    age_unit = bonded_time.get('unit', 'minutes')
+                    age_str = f"{age_value} {age_unit}"
+                    print(f"Bonded time: {age_str}")
+                else:
+                    print("No bonded time data available, using default")
                     age_value = 0
                     age_unit = 'minutes'
                     age_str = "0 minutes"
-                
-                true_age_minutes = 0
-                try:
-                    true_age_minutes = await self.true_age.get(ca) or 0
-                    if true_age_minutes:
-                        # Convert to appropriate units
-                        if true_age_minutes >= 1440:  # 24 hours in minutes
-                            days = true_age_minutes // 1440
-                            true_age = {'value': days, 'unit': 'days'}
-                            print(f"True age: {days} days")
-                        elif true_age_minutes >= 60:
-                            hours = true_age_minutes // 60
-                            true_age = {'value': hours, 'unit': 'hours'}
-                            print(f"True age: {hours} hours")
-                        else:
-                            true_age = {'value': true_age_minutes, 'unit': 'minutes'}
-                            print(f"True age: {true_age_minutes} minutes")
+            except Exception as e:
+                print(f"Error processing bonded time: {str(e)}")
+                age_value = 0
+                age_unit = 'minutes'
+                age_str = "0 minutes"
+            
+            true_age_minutes = results['true_age']
+            try:
+                if true_age_minutes:
+                    # Convert to appropriate units
+                    if true_age_minutes >= 1440:  # 24 hours in minutes
+                        days = true_age_minutes // 1440
+                        true_age = {'value': days, 'unit': 'days'}
+                        print(f"True age: {days} days")
+                    elif true_age_minutes >= 60:
+                        hours = true_age_minutes // 60
+                        true_age = {'value': hours, 'unit': 'hours'}
+                        print(f"True age: {hours} hours")
                     else:
-                        print("No true age data available, using default")
-                        true_age = {'value': 0, 'unit': 'minutes'}
-                except Exception as e:
-                    print(f"Error processing true age: {str(e)}")
+                        true_age = {'value': true_age_minutes, 'unit': 'minutes'}
+                        print(f"True age: {true_age_minutes} minutes")
+                else:
+                    print("No true age data available, using default")
                     true_age = {'value': 0, 'unit': 'minutes'}
+            except Exception as e:
+                print(f"Error processing true age: {str(e)}")
+                true_age = {'value': 0, 'unit': 'minutes'}
 
-                time_to_bond_minutes = 0
-                try:
-                    # Convert bonded_time to minutes if it's a dictionary with value and unit
-                    if isinstance(bonded_time, dict) and 'value' in bonded_time and 'unit' in bonded_time:
-                        bonded_time_value = bonded_time['value']
-                        bonded_time_unit = bonded_time['unit'].lower()
-                        
-                        if bonded_time_unit == 'minutes':
-                            bonded_time_minutes = bonded_time_value
-                        elif bonded_time_unit == 'hours':
-                            bonded_time_minutes = bonded_time_value * 60
-                        elif bonded_time_unit == 'days':
-                            bonded_time_minutes = bonded_time_value * 1440  # 24 * 60
-                        else:
-                            bonded_time_minutes = 0
-                    else:
-                        bonded_time_minutes = 0
+            time_to_bond_minutes = 0
+            try:
+                # Convert bonded_time to minutes if it's a dictionary with value and unit
+                if isinstance(bonded_time, dict) and 'value' in bonded_time and 'unit' in bonded_time:
+                    bonded_time_value = bonded_time['value']
+                    bonded_time_unit = bonded_time['unit'].lower()
                     
-                    # Only calculate the difference if both values are positive
-                    if true_age_minutes > 0 and bonded_time_minutes > 0:
-                        time_to_bond_minutes = max(0, true_age_minutes - bonded_time_minutes)
-                        print(f"Time to bond: {time_to_bond_minutes} minutes")
+                    if bonded_time_unit == 'minutes':
+                        bonded_time_minutes = bonded_time_value
+                    elif bonded_time_unit == 'hours':
+                        bonded_time_minutes = bonded_time_value * 60
+                    elif bonded_time_unit == 'days':
+                        bonded_time_minutes = bonded_time_value * 1440  # 24 * 60
                     else:
-                        time_to_bond_minutes = 0
-                        print("Cannot calculate time to bond - using default value of 0 minutes")
-                except Exception as e:
-                    print(f"Error calculating time to bond: {str(e)}")
-                    time_to_bond_minutes = 0  # Default to 0 if calculation fails
+                        bonded_time_minutes = 0
+                else:
+                    bonded_time_minutes = 0
+                
+                # Only calculate the difference if both values are positive
+                if true_age_minutes > 0 and bonded_time_minutes > 0:
+                    time_to_bond_minutes = max(0, true_age_minutes - bonded_time_minutes)
+                    print(f"Time to bond: {time_to_bond_minutes} minutes")
+                else:
+                    time_to_bond_minutes = 0
+                    print("Cannot calculate time to bond - using default value of 0 minutes")
+            except Exception as e:
+                print(f"Error calculating time to bond: {str(e)}")
+                time_to_bond_minutes = 0  # Default to 0 if calculation fails
 
 
 
-                print("DEBUG: About to analyze holders")
-                total_held = 0
-                holders_over_5 = 0
-                holder_criteria = False
-                wallet_analysis = {}
-                self.wallet_analysis = None
-                try:
-                    holder_data = await self.get_top_holders.calculate_holder_value(ca, price)
-                    if holder_data and isinstance(holder_data, tuple) and len(holder_data) == 2:
-                        holder_values, holder_evaluation = holder_data
-                        if holder_values and isinstance(holder_values, dict) and 'metadata' in holder_values:
-                            metadata = holder_values.get('metadata', {})
-                            if metadata:
-                                supply = metadata.get('supply', 0)
-                                # Validate the values
-                                total_held = metadata.get('total_percentage_held', 0)
-                                if total_held > 100:  # Sanity check
-                                    print(f"Warning: Invalid total_held value: {total_held}%, capping at 100%")
-                                    total_held = 100
-                                    
-                                holders_over_5 = metadata.get('holders_over_5_percent', 0)
-                                if holders_over_5 > 10:  # Sanity check for reasonable max
-                                    print(f"Warning: Suspicious holders_over_5: {holders_over_5}, capping at 10")
-                                    holders_over_5 = 10
-
-                                #check criteria to run top wallet pnl analysis
-                                if soul_data.get('passes', False) and holders_over_5 < 4 and dev_holding < 5:
-                                    holder_criteria = True
-                                    if holder_criteria:
-                                        wallet_analysis = {}
-                                        wallets_processed = 0
-                                    #Tonly then run below analysis
-                                        print("\nTop Wallet Performance Analysis:")
-                                        print("-" * 50)
-                                        # Process top 4 wallets excluding metadata
-                                        wallets_processed = 0
-                                        for wallet_address, wallet_info in holder_values.items():
-                                            if wallet_address != 'metadata' and wallets_processed < 4:
-                                                try:
-                                                    wallet_pnl = await self.wallet_pnl.calculate_pnl(wallet_address)
-                                                    if wallet_pnl and isinstance(wallet_pnl, dict):  # Make sure wallet_pnl is not None and is a dict
-                                                        wallet_analysis[wallet_address] = {
-                                                            'pnl': wallet_pnl.get('pnl', 0),  # Use .get() to handle missing keys
-                                                            'tokens_traded': wallet_pnl.get('tokens_traded', 0),
-                                                            'wins': wallet_pnl.get('trades_won', 0),
-                                                            'losses': wallet_pnl.get('trades_loss', 0),
-                                                            'avg_entry': wallet_pnl.get('average_entry_per_trade', 0) if wallet_pnl.get('average_entry_per_trade', 0) > 0 else None
-                                                        }
-                                                        wallets_processed += 1  # Increment counter by 1
-                                                except Exception as e:
-                                                    print(f"Error processing wallet PNL for {wallet_address}: {str(e)}")
-                                self.wallet_analysis = wallet_analysis if holder_criteria else None
-                except Exception as e:
-                    print(f"Error in holder analysis: {str(e)}")
-                                                    
-                print("DEBUG: About to process transactions")
-                all_transactions = []
+            holder_analysis = results['holder_analysis']
+            total_held = holder_analysis['total_held']
+            holders_over_5 = holder_analysis['holders_over_5']
+            holder_criteria = holder_analysis['holder_criteria']
+            wallet_analysis = holder_analysis['wallet_analysis']
+                                                
+            print("DEBUG: About to process transactions")
+            all_transactions = []
 
-                # Add transactions from each source
-                try:
-                    if swt_data and swt_data.get('latest_descriptions', []):
-                        all_transactions.extend(swt_data.get('latest_descriptions', [])[-1:])
-                    if degen_data and degen_data.get('latest_descriptions', []):
-                        all_transactions.extend(degen_data.get('latest_descriptions', [])[-1:])
-                    if fresh_data and fresh_data.get('latest_descriptions', []):
-                        all_transactions.extend(fresh_data.get('latest_descriptions', [])[-1:])
-
-                    # Format for webhook
-                    if all_transactions:
-                        tx_summary = "\n".join([f"• {tx}" for tx in all_transactions])
-                    else:
-                        tx_summary = "No recent transactions"
-                except Exception as e:
-                    print(f"Error processing transactions: {str(e)}")
-                    all_transactions = []
-                    tx_summary = "Error processing transactions"
+            # Add transactions from each source
+            try:
+                if swt_data and swt_data.get('latest_descriptions', []):
+                    all_transactions.extend(swt_data.get('latest_descriptions', [])[-1:])
+                if degen_data and degen_data.get('latest_descriptions', []):
+                    all_transactions.extend(degen_data.get('latest_descriptions', [])[-1:])
+                if fresh_data and fresh_data.get('latest_descriptions', []):
+                    all_transactions.extend(fresh_data.get('latest_descriptions', [])[-1:])
+
+                # Format for webhook
+                if all_transactions:
+                    tx_summary = "\n".join([f"• {tx}" for tx in all_transactions])
+                else:
+                    tx_summary = "No recent transactions"
+            except Exception as e:
+                print(f"Error processing transactions: {str(e)}")
+                all_transactions = []
+                tx_summary = "Error processing transactions"
 
-                try:
-                    channel_metrics = {
-                        'swt': {
-                            'channels': swt_data.get('channels', {}),
-                            'total_count': total_swt_count,
-                            'total_buys': total_swt_buys,
-                            'total_sells': total_swt_sells
-                        },
-                        'fresh': {
-                            'channels': fresh_data.get('channels', {}),
-                            'total_count': total_fresh_count,
-                            'total_buys': total_fresh_buys,
-                            'total_sells': total_fresh_sells
-                        },
-                        'degen': {
-                            'channels': degen_data.get('channels', {}),
-                            'total_count': degen_count,
-                            'total_buys': degen_buys,
-                            'total_sells': degen_sells
-                        }
+            try:
+                channel_metrics = {
+                    'swt': {
+                        'channels': swt_data.get('channels', {}),
+                        'total_count': total_swt_count,
+                        'total_buys': total_swt_buys,
+                        'total_sells': total_swt_sells
+                    },
+                    'fresh': {
+                        'channels': fresh_data.get('channels', {}),
+                        'total_count': total_fresh_count,
+                        'total_buys': total_fresh_buys,
+                        'total_sells': total_fresh_sells
+                    },
+                    'degen': {
+                        'channels': degen_data.get('channels', {}),
+                        'total_count': degen_count,
+                        'total_buys': degen_buys,
+                        'total_sells': degen_sells
                     }
+                }
 
-                    channels_ca_found_in = {}
-                    for channel_name, data in swt_data.get('channels', {}).items():
-                        if data.get('buys', 0) > 0:
-                            channels_ca_found_in[channel_name] = data.get('buys', 0)
-                    try:
-                        if degen_data.get('channels', {}).get('Degen', {}).get('buys', 0) > 0:
-                            channels_ca_found_in['Degen'] = degen_data.get('channels', {}).get('Degen', {}).get('buys', 0)
-                    except:
-                        pass
-                    for channel_name, data in fresh_data.get('channels', {}).items():
-                        if data.get('buys', 0) > 0:
-                            channels_ca_found_in[channel_name] = data.get('buys', 0)
-
-                    channel_text = "No active channels yet" if not channels_ca_found_in else "\n".join([f"• {channel} ({amount:.2f}sol)" for channel, amount in channels_ca_found_in.items() if amount > 0])                
-                except Exception as e:
-                    print(f"Error processing channel metrics: {str(e)}")
-                    channel_text = "Error processing channel data"
-
-                print("DEBUG: About to calculate scores")
-                #----------------------------------------------------------------------------------
-                holder_score = {}
+                channels_ca_found_in = {}
+                for channel_name, data in swt_data.get('channels', {}).items():
+                    if data.get('buys', 0) > 0:
+                        channels_ca_found_in[channel_name] = data.get('buys', 0)
                 try:
-                    holder_score = await self.holderscore.calculate_score(
-                        token_age=true_age,
-                        holder_count=holder_count,
-                        top10holds=total_held,
-                        holdersover5percent=holders_over_5,
-                        devholds=dev_holding,
-                        sniper_percent=sniper_percent,
-                        wallet_data=wallet_analysis if holder_criteria else None
-                    ) or {'total_score': 0, 'holder_count_age_confluence': 0, 'holder_security': 0, 'wallet_score': 0}
-                except Exception as e:
-                    print(f"Error calculating holder score: {str(e)}")
-                    holder_score = {'total_score': 0, 'holder_count_age_confluence': 0, 'holder_security': 0, 'wallet_score': 0}
-
-                tokenomic_score, tokenomic_breakdown = 0, {}
-                try:
-                    m30_vol = m30_vol if isinstance(m30_vol, (int, float)) else 0
-                    m30_vol_change = m30_vol_change if isinstance(m30_vol_change, (int, float)) else 0
-                    m5_vol = m5_vol if isinstance(m5_vol, (int, float)) else 0
-                    trade_percent_change_30m = trade_percent_change_30m if isinstance(trade_percent_change_30m, (int, float)) else 0
-                    buy_percent_change_30m = buy_percent_change_30m if isinstance(buy_percent_change_30m, (int, float)) else 0
-                    sell_percent_change_30m = sell_percent_change_30m if isinstance(sell_percent_change_30m, (int, float)) else 0
-                    new_unique_wallet_count_30m = new_unique_wallet_count_30m if isinstance(new_unique_wallet_count_30m, (int, float)) else 0
-                    new_unique_wallet_count_1h = new_unique_wallet_count_1h if isinstance(new_unique_wallet_count_1h, (int, float)) else 0
-                    new_unique_wallet_percent_change_30m = new_unique_wallet_percent_change_30m if isinstance(new_unique_wallet_percent_change_30m, (int, float)) else 0
-                    new_unique_wallet_percent_change_1h = new_unique_wallet_percent_change_1h if isinstance(new_unique_wallet_percent_change_1h, (int, float)) else 0
-                    holder_count = holder_count if isinstance(holder_count, (int, float)) else 0
-                    tokenomic_score, tokenomic_breakdown = await self.tokenomicscore.calculate_tokenomic_score(
-                        token_age=true_age,
-                        marketcap=marketcap,
-                        m30_vol=m30_vol,
-                        m30_vol_change=m30_vol_change,
-                        liquidity=liquidity,
-                        total_trade_change=trade_percent_change_30m,
-                        buys_change=buy_percent_change_30m,
-                        sells_change=sell_percent_change_30m,
-                        total_unique_wallets_30m=new_unique_wallet_count_30m,
-                        total_unique_wallets_1h=new_unique_wallet_count_1h,
-                        unique_wallet_change_30m=new_unique_wallet_percent_change_30m,
-                        unique_wallet_change_1h=new_unique_wallet_percent_change_1h,
-                        holder_count=holder_count,
-                        m5_vol=m5_vol
-                    ) or (0, {'total_score': 0, 'volume_marketcap_liquidity_confluence': 0, 'm30_age_volume_confluence': 0, 
-                            'm5_age_volume_confluence': 0, 'total_trades_buy_confluence': 0, 'buying_pressure': 0, 'wallet_growth': 0})
-                except Exception as e:
-                    print(f"Error calculating tokenomic score: {str(e)}")
-                    tokenomic_score, tokenomic_breakdown = 0, {'total_score': 0, 'volume_marketcap_liquidity_confluence': 0, 'm30_age_volume_confluence': 0,
-                                                            'm5_age_volume_confluence': 0, 'total_trades_buy_confluence': 0, 'buying_pressure': 0, 'wallet_growth': 0}
-
-                trust_score, trust_breakdown = 0, {}
-                try:
-                    trust_score, trust_breakdown = await self.trustscore.calculate_trust_score(
-                        token_age=true_age,
-                        server_buys=total_swt_buys + total_fresh_buys,
-                        server_sells=total_swt_sells + total_fresh_sells,
-                        server_count=total_swt_count + total_fresh_count,
-                        has_tg=telegram is not None,
-                        has_x=twitter is not None,
-                        dexpaid=dex_paid,
-                        soulscannerpass=soul_data.get('passes', False),
-                        bundlebotpass=bundle_data.get('passes', False),
-                        buys_change=buy_percent_change_30m,
-                        sells_change=sell_percent_change_30m
-                    ) or (0, {'total_score': 0, 'server_buy_sell_pool_buy_sells_confluence': 0, 'age_server_count_confluence': 0,
-                            'security_evaluation': 0, 'server_activity_evaluation': 0, 'social_presence_evaluation': 0})
-                except Exception as e:
-                    print(f"Error calculating trust score: {str(e)}")
-                    trust_score, trust_breakdown = 0, {'total_score': 0, 'server_buy_sell_pool_buy_sells_confluence': 0, 'age_server_count_confluence': 0,
-                                                    'security_evaluation': 0, 'server_activity_evaluation': 0, 'social_presence_evaluation': 0}
-
-                # Calculate penalties
-                penalties = 0
-                try:
-                    penalties = await self.penalizescore.calculate_penalties(
-                        token_age=true_age,
-                        liquidity=liquidity,
-                        server_buys=total_swt_buys + total_fresh_buys,
-                        server_sells=total_swt_sells + total_fresh_sells,
-                        has_tg=telegram is not None,
-                        has_x=twitter is not None,
-                        holdersover5percent=holders_over_5,
-                        sniper_percent=sniper_percent,
-                        soulscannerpasses=soul_data.get('passes', False),
-                        bundlebotpasses=bundle_data.get('passes', False),
-                        dex_paid=dex_paid
-                    ) or 0
-                except Exception as e:
-                    print(f"Error calculating penalties: {str(e)}")
-
-                # Calculate composite score
-                total_score_before_penalties = 0
-
-                if holder_score and isinstance(holder_score, dict):
-                    total_score_before_penalties += holder_score.get('total_score', 0)
-
-                if tokenomic_breakdown and isinstance(tokenomic_breakdown, dict):
-                    total_score_before_penalties += tokenomic_breakdown.get('total_score', 0)
-
-                if trust_breakdown and isinstance(trust_breakdown, dict):
-                    total_score_before_penalties += trust_breakdown.get('total_score', 0)
-
-                final_score = max(0, total_score_before_penalties - (penalties or 0))
-
-                weekly_stats = None
-                tokens_created = 0
-                rug_count = 0
-                successful_count = 0
-                rug_rate = 0
-                """
-                #Twitter Analysis
-                if final_score >= 75:
-                    print(f"Running Twitter Analysis for: {ca}")
-                    #extract twit user for twitter processing
-                    if twitter:
-                        username = twitter.split("/")[-1]
-                        print(f"\nRunning Searchbar Analysis for: {ca} as well as token account analysis for @{username}")
-                """
-                
-                dev_data = await self.dev_history.dev_report(ca=ca, token_name=token_name)
-                if not dev_data:
-                    dev_data = {
-                        'weekly_activity': [{}],
-                        'general_stats': {
-                            'total_tokens_created': 0,
-                            'total_rugs': 0,
-                            'total_successful': 0,
-                            'rug_rate': 0
-                        }
-                    }
-                
+                    if degen_data.get('channels', {}).get('Degen', {}).get('buys', 0) > 0:
+                        channels_ca_found_in['Degen'] = degen_data.get('channels', {}).get('Degen', {}).get('buys', 0)
+                except:
+                    pass
+                for channel_name, data in fresh_data.get('channels', {}).items():
+                    if data.get('buys', 0) > 0:
+                        channels_ca_found_in[channel_name] = data.get('buys', 0)
+
+                channel_text = "No active channels yet" if not channels_ca_found_in else "\n".join([f"• {channel} ({amount:.2f}sol)" for channel, amount in channels_ca_found_in.items() if amount > 0])                
+            except Exception as e:
+                print(f"Error processing channel metrics: {str(e)}")
+                channel_text = "Error processing channel data"
 
-                weekly_stats = dev_data['weekly_activity'][0] if dev_data['weekly_activity'] else {}
-                tokens_created = dev_data['general_stats'].get('total_tokens_created', 0)
-                rug_count = dev_data['general_stats'].get('total_rugs', 0)
-                successful_count = dev_data['general_stats'].get('total_successful', 0)
-                rug_rate = dev_data['general_stats'].get('rug_rate', 0)
-                
+            print("DEBUG: About to calculate scores")
+            #----------------------------------------------------------------------------------
+            holder_score = {}
+            try:
+                holder_score = await self.holderscore.calculate_score(
+                    token_age=true_age,
+                    holder_count=holder_count,
+                    top10holds=total_held,
+                    holdersover5percent=holders_over_5,
+                    devholds=dev_holding,
+                    sniper_percent=sniper_percent,
+                    wallet_data=wallet_analysis if holder_criteria else None
+                ) or {'total_score': 0, 'holder_count_age_confluence': 0, 'holder_security': 0, 'wallet_score': 0}
+            except Exception as e:
+                print(f"Error calculating holder score: {str(e)}")
+                holder_score = {'total_score': 0, 'holder_count_age_confluence': 0, 'holder_security': 0, 'wallet_score': 0}
 
-                supply = await self.sup.supply(ca)
-                ohlcv_data = await self._get_ohlcv_d(age=true_age_minutes, pair_address=pool_address)
-                if not ohlcv_data:
-                    print(f"Fatal error in getting ohlcv")
+            tokenomic_score, tokenomic_breakdown = 0, {}
+            try:
+                m30_vol = m30_vol if isinstance(m30_vol, (int, float)) else 0
+                m30_vol_change = m30_vol_change if isinstance(m30_vol_change, (int, float)) else 0
+                m5_vol = m5_vol if isinstance(m5_vol, (int, float)) else 0
+                trade_percent_change_30m = trade_percent_change_30m if isinstance(trade_percent_change_30m, (int, float)) else 0
+                buy_percent_change_30m = buy_percent_change_30m if isinstance(buy_percent_change_30m, (int, float)) else 0
+                sell_percent_change_30m = sell_percent_change_30m if isinstance(sell_percent_change_30m, (int, float)) else 0
+                new_unique_wallet_count_30m = new_unique_wallet_count_30m if isinstance(new_unique_wallet_count_30m, (int, float)) else 0
+                new_unique_wallet_count_1h = new_unique_wallet_count_1h if isinstance(new_unique_wallet_count_1h, (int, float)) else 0
+                new_unique_wallet_percent_change_30m = new_unique_wallet_percent_change_30m if isinstance(new_unique_wallet_percent_change_30m, (int, float)) else 0
+                new_unique_wallet_percent_change_1h = new_unique_wallet_percent_change_1h if isinstance(new_unique_wallet_percent_change_1h, (int, float)) else 0
+                holder_count = holder_count if isinstance(holder_count, (int, float)) else 0
+                tokenomic_score, tokenomic_breakdown = await self.tokenomicscore.calculate_tokenomic_score(
+                    token_age=true_age,
+                    marketcap=marketcap,
+                    m30_vol=m30_vol,
+                    m30_vol_change=m30_vol_change,
+                    liquidity=liquidity,
+                    total_trade_change=trade_percent_change_30m,
+                    buys_change=buy_percent_change_30m,
+                    sells_change=sell_percent_change_30m,
+                    total_unique_wallets_30m=new_unique_wallet_count_30m,
+                    total_unique_wallets_1h=new_unique_wallet_count_1h,
+                    unique_wallet_change_30m=new_unique_wallet_percent_change_30m,
+                    unique_wallet_change_1h=new_unique_wallet_percent_change_1h,
+                    holder_count=holder_count,
+                    m5_vol=m5_vol
+                ) or (0, {'total_score': 0, 'volume_marketcap_liquidity_confluence': 0, 'm30_age_volume_confluence': 0, 
+                        'm5_age_volume_confluence': 0, 'total_trades_buy_confluence': 0, 'buying_pressure': 0, 'wallet_growth': 0})
+            except Exception as e:
+                print(f"Error calculating tokenomic score: {str(e)}")
+                tokenomic_score, tokenomic_breakdown = 0, {'total_score': 0, 'volume_marketcap_liquidity_confluence': 0, 'm30_age_volume_confluence': 0,
+                                                        'm5_age_volume_confluence': 0, 'total_trades_buy_confluence': 0, 'buying_pressure': 0, 'wallet_growth': 0}
 
-                try:
-                    sr_data = await self.sr.get_sr_zones(token_name, ca, supply, ohlcv_data)
-                    if sr_data and 'sr_levels' in sr_data:
-                        sr_levels = sr_data['sr_levels']
-                        main_support = sr_levels['support']['mean']
-                        main_resistance = sr_levels['resistance']['mean']
-                        support_strength = sr_levels.get('support_strength', 0) * 100
-                        resistance_strength = sr_levels.get('resistance_strength', 0) * 100
-                        print(f"Successfully obtained SR levels: Support=${main_support:.2f}, Resistance=${main_resistance:.2f}")
-                    else:
-                        print("Failed to get valid SR levels data")
-                        # Default values if SR data is not available
-                        main_support = 0
-                        main_resistance = 0
-                        support_strength = 0
-                        resistance_strength = 0
-                except Exception as e:
-                    print(f"Error processing SR levels: {str(e)}")
-                    import traceback
-                    traceback.print_exc()
-                    # Default values in case of error
+            trust_score, trust_breakdown = 0, {}
+            try:
+                trust_score, trust_breakdown = await self.trustscore.calculate_trust_score(
+                    token_age=true_age,
+                    server_buys=total_swt_buys + total_fresh_buys,
+                    server_sells=total_swt_sells + total_fresh_sells,
+                    server_count=total_swt_count + total_fresh_count,
+                    has_tg=telegram is not None,
+                    has_x=twitter is not None,
+                    dexpaid=dex_paid,
+                    soulscannerpass=soul_data.get('passes', False),
+                    bundlebotpass=bundle_data.get('passes', False),
+                    buys_change=buy_percent_change_30m,
+                    sells_change=sell_percent_change_30m
+                ) or (0, {'total_score': 0, 'server_buy_sell_pool_buy_sells_confluence': 0, 'age_server_count_confluence': 0,
+                        'security_evaluation': 0, 'server_activity_evaluation': 0, 'social_presence_evaluation': 0})
+            except Exception as e:
+                print(f"Error calculating trust score: {str(e)}")
+                trust_score, trust_breakdown = 0, {'total_score': 0, 'server_buy_sell_pool_buy_sells_confluence': 0, 'age_server_count_confluence': 0,
+                                                'security_evaluation': 0, 'server_activity_evaluation': 0, 'social_presence_evaluation': 0}
+
+            # Calculate penalties
+            penalties = 0
+            try:
+                penalties = await self.penalizescore.calculate_penalties(
+                    token_age=true_age,
+                    liquidity=liquidity,
+                    server_buys=total_swt_buys + total_fresh_buys,
+                    server_sells=total_swt_sells + total_fresh_sells,
+                    has_tg=telegram is not None,
+                    has_x=twitter is not None,
+                    holdersover5percent=holders_over_5,
+                    sniper_percent=sniper_percent,
+                    soulscannerpasses=soul_data.get('passes', False),
+                    bundlebotpasses=bundle_data.get('passes', False),
+                    dex_paid=dex_paid
+                ) or 0
+            except Exception as e:
+                print(f"Error calculating penalties: {str(e)}")
+
+            # Calculate composite score
+            total_score_before_penalties = 0
+
+            if holder_score and isinstance(holder_score, dict):
+                total_score_before_penalties += holder_score.get('total_score', 0)
+
+            if tokenomic_breakdown and isinstance(tokenomic_breakdown, dict):
+                total_score_before_penalties += tokenomic_breakdown.get('total_score', 0)
+
+            if trust_breakdown and isinstance(trust_breakdown, dict):
+                total_score_before_penalties += trust_breakdown.get('total_score', 0)
+
+            final_score = max(0, total_score_before_penalties - (penalties or 0))
+
+            weekly_stats = None
+            tokens_created = 0
+            rug_count = 0
+            successful_count = 0
+            rug_rate = 0
+            """
+            #Twitter Analysis
+            if final_score >= 75:
+                print(f"Running Twitter Analysis for: {ca}")
+                #extract twit user for twitter processing
+                if twitter:
+                    username = twitter.split("/")[-1]
+                    print(f"\nRunning Searchbar Analysis for: {ca} as well as token account analysis for @{username}")
+            """
+            
+            dev_data = results['dev']
+
+            weekly_stats = dev_data['weekly_activity'][0] if dev_data['weekly_activity'] else {}
+            tokens_created = dev_data['general_stats'].get('total_tokens_created', 0)
+            rug_count = dev_data['general_stats'].get('total_rugs', 0)
+            successful_count = dev_data['general_stats'].get('total_successful', 0)
+            rug_rate = dev_data['general_stats'].get('rug_rate', 0)
+            
+
+            supply = results['supply']
+            ohlcv_data = results['ohlcv']
+            if not ohlcv_data:
+                print(f"Fatal error in getting ohlcv")
+
+            try:
+                sr_data = results['sr']
+                if sr_data and 'sr_levels' in sr_data:
+                    sr_levels = sr_data['sr_levels']
+                    main_support = sr_levels['support']['mean']
+                    main_resistance = sr_levels['resistance']['mean']
+                    support_strength = sr_levels.get('support_strength', 0) * 100
+                    resistance_strength = sr_levels.get('resistance_strength', 0) * 100
+                    print(f"Successfully obtained SR levels: Support=${main_support:.2f}, Resistance=${main_resistance:.2f}")
+                else:
+                    print("Failed to get valid SR levels data")
+                    # Default values if SR data is not available
                     main_support = 0
                     main_resistance = 0
                     support_strength = 0
                     resistance_strength = 0
-                
-                ob_data = {}
-                ob_entry = False
-                ob_top = 0
-                ob_bottom = 0
-                ob_volume = 0
-                ob_strength = 0
+            except Exception as e:
+                print(f"Error processing SR levels: {str(e)}")
+                import traceback
+                traceback.print_exc()
+                # Default values in case of error
+                main_support = 0
+                main_resistance = 0
+                support_strength = 0
+                resistance_strength = 0
+            
+            ob_data = {}
+            ob_entry = False
+            ob_top = 0
+            ob_bottom = 0
+            ob_volume = 0
+            ob_strength = 0
 
-                try:
-                    if pool_address:
-                        print("\nFetching Order Block data...")
-                        ob_data = await self.ob.update_order_blocks(
-                            ca, 
-                            pool_address, 
-                            token_name, 
-                            supply, 
-                            ohlcv_data,
-                            short_timeframes=self.short_timeframes,
-                            longer_timeframes=self.longer_timeframes
-                        )
+            try:
+                if pool_address:
+                    ob_data = results['ob']
+                    
+                    if ob_data:
+                        print("Successfully retrieved Order Block data")
                         
-                        if ob_data:
-                            print("Successfully retrieved Order Block data")
+                        # Check if we're in an OB zone
+                        active_obs = ob_data.get('active_obs', ())
+                        if active_obs:
+                            # Get closest OB to current price
+                            closest_ob = None
+                            min_distance = float('inf')
                             
-                            # Check if we're in an OB zone
-                            if hasattr(self.ob, 'active_obs') and self.ob.active_obs:
-                                # Get closest OB to current price
-                                closest_ob = None
-                                min_distance = float('inf')
+                            for ob in active_obs:
+                                # Use marketcap as the price metric
+                                ob_mid = (ob['top'] + ob['bottom']) / 2
+                                distance = abs(marketcap - ob_mid) / ob_mid
                                 
-                                for ob in self.ob.active_obs:
-                                    # Use marketcap as the price metric
-                                    ob_mid = (ob['top'] + ob['bottom']) / 2
-                                    distance = abs(marketcap - ob_mid) / ob_mid
-                                    
-                                    if distance < min_distance:
-                                        min_distance = distance
-                                        closest_ob = ob
+                                if distance < min_distance:
+                                    min_distance = distance
+                                    closest_ob = ob
+                            
+                            if closest_ob:
+                                ob_top = closest_ob['top']
+                                ob_bottom = closest_ob['bottom']
+                                ob_volume = closest_ob.get('volume', 0)
+                                ob_strength = closest_ob.get('strength', 0)
                                 
-                                if closest_ob:
-                                    ob_top = closest_ob['top']
-                                    ob_bottom = closest_ob['bottom']
-                                    ob_volume = closest_ob.get('volume', 0)
-                                    ob_strength = closest_ob.get('strength', 0)
-                                    
-                                    # Check if we're in this OB
-                                    if ob_bottom * 0.98 <= marketcap <= ob_top * 1.02:
-                                        ob_entry = True
-                                        print(f"Token is currently in an Order Block zone: ${ob_bottom:.2f} - ${ob_top:.2f}")
-                                    else:
-                                        print(f"Closest Order Block: ${ob_bottom:.2f} - ${ob_top:.2f}, not in zone")
+                                # Check if we're in this OB
+                                if ob_bottom * 0.98 <= marketcap <= ob_top * 1.02:
+                                    ob_entry = True
+                                    print(f"Token is currently in an Order Block zone: ${ob_bottom:.2f} - ${ob_top:.2f}")
                                 else:
-                                    print("No valid Order Blocks found")
-                        else:
-                            print("No Order Block data available")
+                                    print(f"Closest Order Block: ${ob_bottom:.2f} - ${ob_top:.2f}, not in zone")
+                            else:
+                                print("No valid Order Blocks found")
                     else:
-                        print("No pool address available for Order Block analysis")
-                except Exception as e:
-                    print(f"Error processing Order Block data: {str(e)}")
-                    import traceback
-                    traceback.print_exc()
-                
-                rls = 0
-                if all([scans, true_age_minutes, liquidity, m5_vol]):
-                    raw_rls = (scans / true_age_minutes) * ((liquidity + m5_vol) / 2)
-                    rls = math.log10(raw_rls + 1)
+                        print("No Order Block data available")
+                else:
+                    print("No pool address available for Order Block analysis")
+            except Exception as e:
+                print(f"Error processing Order Block data: {str(e)}")
+                import traceback
+                traceback.print_exc()
+            
+            rls = 0
+            if all([scans, true_age_minutes, liquidity, m5_vol]):
+                raw_rls = (scans / true_age_minutes) * ((liquidity + m5_vol) / 2)
+                rls = math.log10(raw_rls + 1)
 
 
+            
+            try:
+                await self.ma_webhooks.multialert_webhook(
+                    token_name=token_name,
+                    ca=ca,
+                    websites_data=websites_data,
+                    marketcap=marketcap,
+                    m5_vol=m5_vol,
+                    liquidity=liquidity,
+                    telegram=telegram,
+                    twitter=twitter,
+                    photon_link=photon_link,
+                    bull_x_link=bull_x_link,
+                    dex_link=dexscreener_link,
+                    swt_count=total_swt_count,
+                    swt_buys=total_swt_buys,
+                    swt_sells=total_swt_sells,
+                    fresh_count=total_fresh_count,
+                    fresh_buys=total_fresh_buys,
+                    fresh_sells=total_fresh_sells,
+                    last_3_tx=all_transactions,
+                    holder_count=holder_count,
+                    dev_holding_percentage=dev_holding,
+                    token_migrated=tg_metrics.get('token_migrated', False),
+                    passes_soulscanner=soul_data.get('passes', False),
+                    passes_bundlebot=bundle_data.get('passes', False) if bundle_data else False,
+                    dex_paid=dex_paid,
+                    token_age=true_age,
+                    time_to_bond=bonded_time if tg_metrics.get('token_migrated') else "N/A",
+                    top_10_holding_percentage=total_held,
+                    holders_over_5=holders_over_5,
+                    wallet_data=wallet_analysis if holder_criteria else None,
+                    m30_vol=m30_vol,
+                    m30_vol_change=m30_vol_change,
+                    new_unique_wallets_30m=new_unique_wallet_count_30m,
+                    new_unique_wallet_30m_change=new_unique_wallet_percent_change_30m,
+                    trade_change_30m=trade_percent_change_30m,
+                    buy_change_30m=buy_percent_change_30m,
+                    sell_change_30m=sell_percent_change_30m,
+                    channel_text=channel_text,
+                    sniper_percent=sniper_percent,
+                    dev_token_created=tokens_created,
+                    dev_rug_count=rug_count,
+                    dev_successful_count=successful_count,
+                    dev_rug_rate=rug_rate,
+                    support=main_support,
+                    support_strength=support_strength,
+                    resistance=main_resistance,
+                    resistance_strength=resistance_strength,
+                    ob_top=ob_top,
+                    ob_bottom=ob_bottom,
+                    ob_volume=ob_volume,
+                    ob_strength=ob_strength,
+                    scans=scans,
+                    comp_score=final_score
+                )
+                print("DEBUG: Sent multi-alert webhook")
+            except Exception as e:
+                print(f"Error sending multi-alert webhook: {str(e)}")
                 
-                try:
-                    await self.ma_webhooks.multialert_webhook(
-                        token_name=token_name,
-                        ca=ca,
-                        websites_data=websites_data,
-                        marketcap=marketcap,
-                        m5_vol=m5_vol,
-                        liquidity=liquidity,
-                        telegram=telegram,
-                        twitter=twitter,
-                        photon_link=photon_link,
-                        bull_x_link=bull_x_link,
-                        dex_link=dexscreener_link,
-                        swt_count=total_swt_count,
-                        swt_buys=total_swt_buys,
-                        swt_sells=total_swt_sells,
-                        fresh_count=total_fresh_count,
-                        fresh_buys=total_fresh_buys,
-                        fresh_sells=total_fresh_sells,
-                        last_3_tx=all_transactions,
-                        holder_count=holder_count,
-                        dev_holding_percentage=dev_holding,
-                        token_migrated=tg_metrics.get('token_migrated', False),
-                        passes_soulscanner=soul_data.get('passes', False),
-                        passes_bundlebot=bundle_data.get('passes', False) if bundle_data else False,
-                        dex_paid=dex_paid,
-                        token_age=true_age,
-                        time_to_bond=bonded_time if tg_metrics.get('token_migrated') else "N/A",
-                        top_10_holding_percentage=total_held,
-                        holders_over_5=holders_over_5,
-                        wallet_data=wallet_analysis if holder_criteria else None,
-                        m30_vol=m30_vol,
-                        m30_vol_change=m30_vol_change,
-                        new_unique_wallets_30m=new_unique_wallet_count_30m,
-                        new_unique_wallet_30m_change=new_unique_wallet_percent_change_30m,
-                        trade_change_30m=trade_percent_change_30m,
-                        buy_change_30m=buy_percent_change_30m,
-                        sell_change_30m=sell_percent_change_30m,
-                        channel_text=channel_text,
-                        sniper_percent=sniper_percent,
-                        dev_token_created=tokens_created,
-                        dev_rug_count=rug_count,
-                        dev_successful_count=successful_count,
-                        dev_rug_rate=rug_rate,
-                        support=main_support,
-                        support_strength=support_strength,
-                        resistance=main_resistance,
-                        resistance_strength=resistance_strength,
-                        ob_top=ob_top,
-                        ob_bottom=ob_bottom,
-                        ob_volume=ob_volume,
-                        ob_strength=ob_strength,
-                        scans=scans,
-                        comp_score=final_score
-                    )
-                    print("DEBUG: Sent multi-alert webhook")
-                except Exception as e:
-                    print(f"Error sending multi-alert webhook: {str(e)}")
+            try:
+                await self.ma_webhooks.score_webhook(
+                    token_name=token_name,
+                    ca=ca,
                     
-                try:
-                    await self.ma_webhooks.score_webhook(
-                        token_name=token_name,
-                        ca=ca,
-                        
-                        holder_total=holder_score.get('total_score', 0),
-                        holder_age_confluence=holder_score.get('holder_count_age_confluence', 0),
-                        holder_security=holder_score.get('holder_security', 0),
-                        holder_wallet_analysis=holder_score.get('wallet_score', 0),
-                        
-                        tokenomic_total=tokenomic_breakdown.get('total_score', 0),
-                        tokenomic_vol_liq=tokenomic_breakdown.get('volume_marketcap_liquidity_confluence', 0),
-                        tokenomic_30m_vol=tokenomic_breakdown.get('m30_age_volume_confluence', 0),
-                        tokenomic_5m_vol=tokenomic_breakdown.get('m5_age_volume_confluence', 0),
-                        tokenomic_trade_confluence=tokenomic_breakdown.get('total_trades_buy_confluence', 0),
-                        tokenomic_buy_pressure=tokenomic_breakdown.get('buying_pressure', 0),
-                        tokenomic_wallet_growth=tokenomic_breakdown.get('wallet_growth', 0),
-                        
-                        trust_total=trust_breakdown.get('total_score', 0),
-                        trust_bs_confluence=trust_breakdown.get('server_buy_sell_pool_buy_sells_confluence', 0),
-                        trust_age_count=trust_breakdown.get('age_server_count_confluence', 0),
-                        trust_security=trust_breakdown.get('security_evaluation', 0),
-                        trust_activity=trust_breakdown.get('server_activity_evaluation', 0),
-                        trust_social=trust_breakdown.get('social_presence_evaluation', 0),
-                        
-                        total_before_penalties=total_score_before_penalties,
-                        penalties=penalties,
-                        final_score=final_score
-                    )
-                    print("DEBUG: Sent score webhook")
-                except Exception as e:
-                    print(f"Error sending score webhook: {str(e)}")
-
-                try:
-                    #if final_score >= 60 and pool_address:
-                        #marketcap_task = asyncio.create_task(self.mc_monitor.monitor_marketcap(token_name, ca, pool_address, true_age_minutes))
-                        #print("DEBUG: Created marketcap monitoring task")
+                    holder_total=holder_score.get('total_score', 0),
+                    holder_age_confluence=holder_score.get('holder_count_age_confluence', 0),
+                    holder_security=holder_score.get('holder_security', 0),
+                    holder_wallet_analysis=holder_score.get('wallet_score', 0),
                     
-
-                    if not hasattr(self, 'background_tasks'):
-                        self.background_tasks = []
+                    tokenomic_total=tokenomic_breakdown.get('total_score', 0),
+                    tokenomic_vol_liq=tokenomic_breakdown.get('volume_marketcap_liquidity_confluence', 0),
+                    tokenomic_30m_vol=tokenomic_breakdown.get('m30_age_volume_confluence', 0),
+                    tokenomic_5m_vol=tokenomic_breakdown.get('m5_age_volume_confluence', 0),
+                    tokenomic_trade_confluence=tokenomic_breakdown.get('total_trades_buy_confluence', 0),
+                    tokenomic_buy_pressure=tokenomic_breakdown.get('buying_pressure', 0),
+                    tokenomic_wallet_growth=tokenomic_breakdown.get('wallet_growth', 0),
                     
-                    #if final_score >= 48 and pool_address and true_age_minutes <= 60:
-                        #self.background_tasks.append(marketcap_task)
-
-                    data_task = asyncio.create_task(self.index_data(
-                        token_name=token_name,
-                        ca=ca,
-                        initial_marketcap=marketcap,
-                        initial_m5_vol=m5_vol,
-                        m30_vol=m30_vol,
-                        m30_vol_change=m30_vol_change,
-                        m30_buys=m30_buys,
-                        m30_sells=m30_sells,
-                        m30_price_change=m30_price_change,
-                        m30_trades=m30_trades,
-                        initial_liquidity=liquidity,
-                        dex_paid=dex_paid,
-                        sniper_percent=sniper_percent,
-                        scans=scans,
-                        passes_soul=soul_data['passes'],
-                        passes_bundle=bundle_data['passes'],
-                        initial_holder_count=holder_count,
-                        migrated=tg_metrics.get('token_migrated', False),
-                        top_holding_percentage=total_held,
-                        holders_over_5_count=holders_over_5,
-                        dev_holding_percentage=dev_holding,
-                        trade_30m_change_percent=trade_percent_change_30m,
-                        buy_30m_change_percent=buy_percent_change_30m,
-                        sell_30m_change_percent=sell_percent_change_30m,
-                        unique_wallet_30m_count=new_unique_wallet_count_30m,
-                        unique_wallet_30m_change_percentage=new_unique_wallet_percent_change_30m,
-                        has_tg=telegram is not None,
-                        has_x=twitter is not None,
-                        server_swt_mentions=total_swt_count,
-                        server_fresh_mentions=total_fresh_count,
-                        swt_buys=total_swt_buys,
-                        swt_sells=total_swt_sells,
-                        fresh_buys=total_fresh_buys,
-                        fresh_sells=total_fresh_sells,
-                        token_age=true_age_minutes,
-                        time_to_bond=time_to_bond_minutes,
-                        comp_score=final_score,
-                        total_swt_sol_amount=swt_data.get('total_sol_amount', 0),
-                        total_fresh_sol_amount=fresh_data.get('total_sol_amount', 0),
-                        swt_wallets=swt_data.get('unique_wallets', 0),
-                        fresh_wallets=fresh_data.get('unique_wallets', 0),
-                        dev_token_created_count=tokens_created,
-                        dev_rug_count=rug_count,
-                        dev_successful_count=successful_count,
-                        rls=rls,
-                        website_count=websites_data.get('count', 0) if websites_data else 0,
-                        channels_data=channels_ca_found_in
-                    ))
-                    self.background_tasks.append(data_task)
-
-                    self.background_tasks = [task for task in self.background_tasks if not task.done()]
-                    print("DEBUG: MultiAlert processing completed successfully")
-                except Exception as e:
-                    print(f"Error creating background tasks: {str(e)}")
-        
+                    trust_total=trust_breakdown.get('total_score', 0),
+                    trust_bs_confluence=trust_breakdown.get('server_buy_sell_pool_buy_sells_confluence', 0),
+                    trust_age_count=trust_breakdown.get('age_server_count_confluence', 0),
+                    trust_security=trust_breakdown.get('security_evaluation', 0),
+                    trust_activity=trust_breakdown.get('server_activity_evaluation', 0),
+                    trust_social=trust_breakdown.get('social_presence_evaluation', 0),
+                    
+                    total_before_penalties=total_score_before_penalties,
+                    penalties=penalties,
+                    final_score=final_score
+                )
+                print("DEBUG: Sent score webhook")
+            except Exception as e:
+                print(f"Error sending score webhook: {str(e)}")
+
+            try:
+                #if final_score >= 60 and pool_address:
+                    #marketcap_task = asyncio.create_task(self.mc_monitor.monitor_marketcap(token_name, ca, pool_address, true_age_minutes))
+                    #print("DEBUG: Created marketcap monitoring task")
+                
+
+                if not hasattr(self, 'background_tasks'):
+                    self.background_tasks = []
+                
+                #if final_score >= 48 and pool_address and true_age_minutes <= 60:
+                    #self.background_tasks.append(marketcap_task)
+
+                data_task = asyncio.create_task(self.index_data(
+                    token_name=token_name,
+                    ca=ca,
+                    initial_marketcap=marketcap,
+                    initial_m5_vol=m5_vol,
+                    m30_vol=m30_vol,
+                    m30_vol_change=m30_vol_change,
+                    m30_buys=m30_buys,
+                    m30_sells=m30_sells,
+                    m30_price_change=m30_price_change,
+                    m30_trades=m30_trades,
+                    initial_liquidity=liquidity,
+                    dex_paid=dex_paid,
+                    sniper_percent=sniper_percent,
+                    scans=scans,
+                    passes_soul=soul_data['passes'],
+                    passes_bundle=bundle_data['passes'],
+                    initial_holder_count=holder_count,
+                    migrated=tg_metrics.get('token_migrated', False),
+                    top_holding_percentage=total_held,
+                    holders_over_5_count=holders_over_5,
+                    dev_holding_percentage=dev_holding,
+                    trade_30m_change_percent=trade_percent_change_30m,
+                    buy_30m_change_percent=buy_percent_change_30m,
+                    sell_30m_change_percent=sell_percent_change_30m,
+                    unique_wallet_30m_count=new_unique_wallet_count_30m,
+                    unique_wallet_30m_change_percentage=new_unique_wallet_percent_change_30m,
+                    has_tg=telegram is not None,
+                    has_x=twitter is not None,
+                    server_swt_mentions=total_swt_count,
+                    server_fresh_mentions=total_fresh_count,
+                    swt_buys=total_swt_buys,
+                    swt_sells=total_swt_sells,
+                    fresh_buys=total_fresh_buys,
+                    fresh_sells=total_fresh_sells,
+                    token_age=true_age_minutes,
+                    time_to_bond=time_to_bond_minutes,
+                    comp_score=final_score,
+                    total_swt_sol_amount=swt_data.get('total_sol_amount', 0),
+                    total_fresh_sol_amount=fresh_data.get('total_sol_amount', 0),
+                    swt_wallets=swt_data.get('unique_wallets', 0),
+                    fresh_wallets=fresh_data.get('unique_wallets', 0),
+                    dev_token_created_count=tokens_created,
+                    dev_rug_count=rug_count,
+                    dev_successful_count=successful_count,
+                    rls=rls,
+                    website_count=websites_data.get('count', 0) if websites_data else 0,
+                    channels_data=channels_ca_found_in,
+                    wallet_data=wallet_analysis if holder_criteria else None
+                ))
+                self.background_tasks.append(data_task)
+
+                self.background_tasks = [task for task in self.background_tasks if not task.done()]
+                print("DEBUG: MultiAlert processing completed successfully")
+            except Exception as e:
+                print(f"Error creating background tasks: {str(e)}")
         except Exception as e:
             print(f"Error in running check for multialert: {str(e)}")
             import traceback
@@ -1378,28 +1334,22 @@ class ScrapeAD:
         
     async def _get_ohlcv_d(self, age, pair_address):
         try:
-            if age < 60:
-                for tf in self.short_timeframes:
-                    print(f"\nTrying Timeframe: {tf}")
-                    ohlcv_data = await self.o.fetch(timeframe=tf, pair_address=pair_address)
-                    if not ohlcv_data or (isinstance(ohlcv_data, dict) and 'message' in ohlcv_data and 'Internal server error' in ohlcv_data.get('message', '')):
-                        print(f"Failed to get OHLCV")
-                        continue  # Try next timeframe
-                    if isinstance(ohlcv_data, dict) and ohlcv_data:
-                        return ohlcv_data
-            else:
-                for tf in self.longer_timeframes:
-                    print(f"\nTrying Longer Timeframe: {tf}")
-                    ohlcv_data = await self.o.fetch(timeframe=tf, pair_address=pair_address)
-                    if not ohlcv_data or (isinstance(ohlcv_data, dict) and 'message' in ohlcv_data and 'Internal server error' in ohlcv_data.get('message', '')):
-                        print(f"Failed to get OHLCV")
-                        continue  # Try next timeframe
-                    if isinstance(ohlcv_data, dict) and ohlcv_data:
-                        return ohlcv_data
-            return None
+            timeframes = self.short_timeframes if age < 60 else self.longer_timeframes
+            # the ladder order is the preferred granularity, health only pushes failing timeframes back
+            return await waterfall(
+                "ohlcv_short" if age < 60 else "ohlcv_long",
+                [(tf, functools.partial(self.o.fetch, timeframe=tf, pair_address=pair_address)) for tf in timeframes],
+                valid=self._valid_ohlcv,
+                keep_order=True
+            )
         except Exception as e:
             print(f"Error in _get_ohlcv_d: {str(e)}")
             return None
+
+    def _valid_ohlcv(self, ohlcv_data):
+        if not ohlcv_data or not isinstance(ohlcv_data, dict):
+            return False
+        return 'Internal server error' not in ohlcv_data.get('message', '')
         
     async def apply_penalities(composite_score, penalties):
         try:
@@ -1456,7 +1406,8 @@ class ScrapeAD:
                 dev_successful_count,
                 rls,
                 website_count=0,
-                channels_data=None):
+                channels_data=None,
+                wallet_data=None):
 
         try:
             # Convert token age to minutes if it's not already
@@ -1512,30 +1463,31 @@ class ScrapeAD:
                         elif "Fresh" in channel_name:  # Must be after other Fresh checks
                             fresh_amount = amount
                 else:
-                    # Fallback to set-based detection
-                    if ca in self.legend_cas:
+                    # Fallback to the channels the multialert detector saw
+                    seen_channels = self.multialerts.channels_for(ca)
+                    if "Legend" in seen_channels:
                         legend_amount = 1.0
-                    if ca in self.kol_regular_cas:
+                    if "Kol Regular" in seen_channels:
                         kol_regular_amount = 1.0
-                    if ca in self.kol_alpha_cas:
+                    if "Kol Alpha" in seen_channels:
                         kol_alpha_amount = 1.0
-                    if ca in self.smart_cas:
+                    if "Smart" in seen_channels:
                         smart_amount = 1.0
-                    if ca in self.degen_cas:
+                    if "Degen" in seen_channels:
                         degen_amount = 1.0
-                    if ca in self.whale_cas:
+                    if "Whale" in seen_channels:
                         whale_amount = 1.0
-                    if ca in self.challenge_cas:
+                    if "Challenge" in seen_channels:
                         challenge_amount = 1.0
-                    if ca in self.high_freq_cas:
+                    if "High Freq" in seen_channels:
                         high_freq_amount = 1.0
-                    if ca in self.insider_wallet_cas:
+                    if "Insider" in seen_channels:
                         insider_amount = 1.0
-                    if ca in self.fresh_cas:
+                    if "Fresh" in seen_channels:
                         fresh_amount = 1.0
-                    if ca in self.fresh_1h_cas:
+                    if "Fresh 1h" in seen_channels:
                         fresh_1h_amount = 1.0
-                    if ca in self.fresh_5sol_1m_mc_cas:
+                    if "Fresh 5sol 1m MC" in seen_channels:
                         fresh_5sol_1m_mc_amount = 1.0
                         
                 # Convert values to float for consistency
@@ -1572,8 +1524,7 @@ class ScrapeAD:
             top_wallet4_pnl = 0
             
             # If wallet analysis data exists, process it
-            if hasattr(self, 'wallet_analysis') and self.wallet_analysis:
-                wallet_data = self.wallet_analysis
+            if wallet_data:
                 wallet_count = len(wallet_data)
                 if wallet_count > 0:
                     # Calculate average PNL
@@ -1794,278 +1745,69 @@ class ScrapeAD:
             passes_bundle = 1 if passes_bundle else 0
             migrated = 1 if migrated else 0
             
-            with sqlite3.connect('memedb.db') as conn:
-                cursor = conn.cursor()
-                cursor.execute("PRAGMA table_info(multialerts)")
-                columns = cursor.fetchall()
-                print(f"Table 'multialerts' has {len(columns)} columns")
-                
-                insert_columns = [
-                    'alert_time', 'token_name', 'ca', 'initial_marketcap', 'initial_m5_vol', 
-                    'initial_m30_vol', 'm30_vol_change', 'm30_buy_count', 'm30_sell_count', 'm30_price_change', 'm30_trade_count',
-                    'initial_liquidity', 'dex_paid', 
-                    'sniper_percent', 'scans', 'passes_soul', 'passes_bundle', 
-                    'initial_holder_count', 'migrated', 'top_holding_percentage', 
-                    'holders_over_5', 'dev_holding_percentage', 'trade_30m_change_percentage',
-                    'buy_30m_change_percentage', 'sell_30m_change_percentage', 
-                    'unique_wallet_30m_change_percentage', 'unique_wallet_30m_change_count',
-                    'has_tg', 'has_x', 'swt_mentions', 'fresh_mentions', 
-                    'total_swt_buy_amount', 'total_swt_sell_amount', 
-                    'total_fresh_buy_amount', 'total_fresh_sell_amount',
-                    'token_age_minutes', 'time_to_bond_minutes', 'score', 
-                    'website_count', 'total_social_count', 'dev_token_created_count', 
-                    'dev_rug_count', 'dev_successful_count', 
-                    'vol_1m', 'vol_3m', 'vol_5m', 'vol_10m',
-                    'mc_3m', 'mc_8m', 'mc_15m', 'hr24_max_mc',
-                    'top_wallet_avg_pnl', 'top_wallet_avg_trade_count', 
-                    'top_wallet1_pnl', 'top_wallet2_pnl', 'top_wallet3_pnl', 'top_wallet4_pnl',
-                    'legend_amount', 'kol_regular_amount', 'kol_alpha_amount', 'smart_amount', 
-                    'degen_amount', 'whale_amount', 'challenge_amount', 'high_freq_amount', 
-                    'insider_amount', 'fresh_amount', 'fresh_1h_amount', 'fresh_5sol_1m_mc_amount',
-                    'rls', 'twox'
-                ]
-                
-                # Create SQL insert statement with explicit columns
-                column_list = ', '.join(insert_columns)
-                value_placeholders = ', '.join(['?' for _ in range(len(insert_columns))])
-                insert_sql = f"INSERT OR REPLACE INTO multialerts ({column_list}) VALUES ({value_placeholders})"
-                
-                # Create a matching values tuple with values in the same order as insert_columns
-                values = (
-                    current_time, token_name, ca, initial_marketcap, initial_m5_vol, m30_vol, 
-                    m30_vol_change, m30_buys, m30_sells, m30_price_change, m30_trades, initial_liquidity, dex_paid, sniper_percent, scans, passes_soul, 
-                    passes_bundle, initial_holder_count, migrated, top_holding_percentage, 
-                    holders_over_5_count, dev_holding_percentage, trade_30m_change_percent,
-                    buy_30m_change_percent, sell_30m_change_percent, 
-                    unique_wallet_30m_change_percentage, unique_wallet_30m_count,
-                    has_tg, has_x, server_swt_mentions, server_fresh_mentions, 
-                    swt_buys, swt_sells, fresh_buys, fresh_sells,
-                    token_age, time_to_bond_minutes, comp_score, 
-                    website_count, total_social_count, dev_token_created_count, 
-                    dev_rug_count, dev_successful_count, 
-                    vol_1m_after, vol_3m_after, vol_5m_after, vol_10m_after,  # Pass None for these values
-                    mc_3m, mc_8m, mc_15m, hr24_max_mc,  # Pass None for these values
-                    top_wallet_avg_pnl, top_wallet_avg_trade_count, 
-                    top_wallet1_pnl, top_wallet2_pnl, top_wallet3_pnl, top_wallet4_pnl,
-                    legend_amount, kol_regular_amount, kol_alpha_amount, smart_amount, 
-                    degen_amount, whale_amount, challenge_amount, high_freq_amount, 
-                    insider_amount, fresh_amount, fresh_1h_amount, fresh_5sol_1m_mc_amount,
-                    rls, 0  # twox - set to False initially
-                )
-                cursor.execute(insert_sql, values)
-                conn.commit()
-                
-                print(f"Successfully indexed token {token_name} ({ca}) to db")
-                
-                asyncio.create_task(self.update_volume_data(ca))
-                asyncio.create_task(self.update_marketcap_data(ca))
-                
-        except Exception as e:
-            print(f"Error in DB Indexing: {str(e)}")
-            import traceback
-            print(traceback.format_exc())
-
-    async def update_volume_data(self, ca):
-        """
-        Updates volume data at specific intervals after token indexing.
-        This function monitors the token age and only updates the DB when
-        each specific interval is reached from initial indexing time.
-        """
-        try:
-            # Intervals to check (in minutes)
-            intervals = [1, 3, 5, 10]
-            completed = set()
-            
-            # Get the reference time - when this function started running
-            # This serves as our "time zero" for all interval calculations
-            reference_time = time.time()
-            print(f"Starting volume tracking for {ca} at {datetime.fromtimestamp(reference_time).strftime('%H:%M:%S')}")
-            
-            while len(completed) < len(intervals):
-                current_time = time.time()
-                # Calculate elapsed time since we started tracking this token
-                elapsed_minutes = (current_time - reference_time) / 60
-                
-                # Check each interval
-                for interval in intervals:
-                    if interval in completed:
-                        continue
-                    
-                    # Only update if we've reached this interval
-                    if elapsed_minutes >= interval:
-                        print(f"Reached {interval}m interval for {ca}, updating volume data...")
-                        
-                        # Get current volume from DexScreener
-                        try:
-                            dex_data = await self.dex.fetch_token_data_from_dex(ca)
-                            if dex_data:
-                                volume = dex_data.get('token_5m_vol', 0)
-                                
-                                # Update DB with the volume at this interval
-                                column_name = f"vol_{interval}m"
-                                
-                                with sqlite3.connect('memedb.db') as conn:
-                                    cursor = conn.cursor()
-                                    cursor.execute(f"""
-                                        UPDATE multialerts 
-                                        SET {column_name} = ?
-                                        WHERE ca = ?
-                                    """, (volume, ca))
-                                    conn.commit()
-                                    
-                                print(f"Updated {column_name} for {ca} with value {volume}")
-                                completed.add(interval)
-                        except Exception as e:
-                            print(f"Error updating volume at {interval}m interval: {str(e)}")
-                
-                # If we've completed all intervals, exit
-                if len(completed) == len(intervals):
-                    print(f"All volume intervals completed for {ca}")
-                    break
-                    
-                # Sleep before checking again - shorter sleep to be more accurate with timing
-                await asyncio.sleep(10)  # Check every 10 seconds
-                
-        except Exception as e:
-            print(f"Error in update_volume_data: {str(e)}")
-            import traceback
-            traceback.print_exc()
-
-    async def update_marketcap_data(self, ca):
-        """
-        Updates marketcap data at specific intervals after token indexing.
-        This function monitors time from function start and only updates 
-        the DB when each specific interval is reached.
-        """
-        try:
-            # Intervals to check (in minutes)
-            intervals = [3, 8, 15]
-            completed = set()
-            max_mc = 0  # Still track max_mc locally but don't update DB with it
-            pool_address = None
+            insert_columns = [
+                'alert_time', 'token_name', 'ca', 'initial_marketcap', 'initial_m5_vol', 
+                'initial_m30_vol', 'm30_vol_change', 'm30_buy_count', 'm30_sell_count', 'm30_price_change', 'm30_trade_count',
+                'initial_liquidity', 'dex_paid', 
+                'sniper_percent', 'scans', 'passes_soul', 'passes_bundle', 
+                'initial_holder_count', 'migrated', 'top_holding_percentage', 
+                'holders_over_5', 'dev_holding_percentage', 'trade_30m_change_percentage',
+                'buy_30m_change_percentage', 'sell_30m_change_percentage', 
+                'unique_wallet_30m_change_percentage', 'unique_wallet_30m_change_count',
+                'has_tg', 'has_x', 'swt_mentions', 'fresh_mentions', 
+                'total_swt_buy_amount', 'total_swt_sell_amount', 
+                'total_fresh_buy_amount', 'total_fresh_sell_amount',
+                'token_age_minutes', 'time_to_bond_minutes', 'score', 
+                'website_count', 'total_social_count', 'dev_token_created_count', 
+                'dev_rug_count', 'dev_successful_count', 
+                'vol_1m', 'vol_3m', 'vol_5m', 'vol_10m',
+                'mc_3m', 'mc_8m', 'mc_15m', 'hr24_max_mc',
+                'top_wallet_avg_pnl', 'top_wallet_avg_trade_count', 
+                'top_wallet1_pnl', 'top_wallet2_pnl', 'top_wallet3_pnl', 'top_wallet4_pnl',
+                'legend_amount', 'kol_regular_amount', 'kol_alpha_amount', 'smart_amount', 
+                'degen_amount', 'whale_amount', 'challenge_amount', 'high_freq_amount', 
+                'insider_amount', 'fresh_amount', 'fresh_1h_amount', 'fresh_5sol_1m_mc_amount',
+                'rls', 'twox'
+            ]
             
-            # Get the reference time - when this function started running
-            # This serves as our "time zero" for all interval calculations
-            reference_time = time.time()
-            print(f"Starting marketcap tracking for {ca} at {datetime.fromtimestamp(reference_time).strftime('%H:%M:%S')}")
+            # Create SQL insert statement with explicit columns
+            column_list = ', '.join(insert_columns)
+            value_placeholders = ', '.join(['?' for _ in range(len(insert_columns))])
+            insert_sql = f"INSERT OR REPLACE INTO multialerts ({column_list}) VALUES ({value_placeholders})"
             
-            # For 24hr tracking, we'll need to wait a full 24 hours + 20 minutes
-            hr24_check_time = reference_time + ((24 * 60 * 60) + (20 * 60))
-                
-            # Get pool address once for later use
-            try:
-                dex_data = await self.dex.fetch_token_data_from_dex(ca)
-                if dex_data:
-                    pool_address = dex_data.get('pool_address')
-                    print(f"Found pool address for {ca}: {pool_address}")
-            except Exception as e:
-                print(f"Error getting pool address: {str(e)}")
+            # Create a matching values tuple with values in the same order as insert_columns
+            values = (
+                current_time, token_name, ca, initial_marketcap, initial_m5_vol, m30_vol, 
+                m30_vol_change, m30_buys, m30_sells, m30_price_change, m30_trades, initial_liquidity, dex_paid, sniper_percent, scans, passes_soul, 
+                passes_bundle, initial_holder_count, migrated, top_holding_percentage, 
+                holders_over_5_count, dev_holding_percentage, trade_30m_change_percent,
+                buy_30m_change_percent, sell_30m_change_percent, 
+                unique_wallet_30m_change_percentage, unique_wallet_30m_count,
+                has_tg, has_x, server_swt_mentions, server_fresh_mentions, 
+                swt_buys, swt_sells, fresh_buys, fresh_sells,
+                token_age, time_to_bond_minutes, comp_score, 
+                website_count, total_social_count, dev_token_created_count, 
+                dev_rug_count, dev_successful_count, 
+                vol_1m_after, vol_3m_after, vol_5m_after, vol_10m_after,  # Pass None for these values
+                mc_3m, mc_8m, mc_15m, hr24_max_mc,  # Pass None for these values
+                top_wallet_avg_pnl, top_wallet_avg_trade_count, 
+                top_wallet1_pnl, top_wallet2_pnl, top_wallet3_pnl, top_wallet4_pnl,
+                legend_amount, kol_regular_amount, kol_alpha_amount, smart_amount, 
+                degen_amount, whale_amount, challenge_amount, high_freq_amount, 
+                insider_amount, fresh_amount, fresh_1h_amount, fresh_5sol_1m_mc_amount,
+                rls, 0  # twox - set to False initially
+            )
+            await db_writer.execute(insert_sql, values)
             
-            # Continue until all intervals are completed and 24hr check is done
-            hr24_completed = False
+            print(f"Successfully indexed token {token_name} ({ca}) to db")
             
-            while (len(completed) < len(intervals)) or (not hr24_completed and time.time() < hr24_check_time + 300):
-                current_time = time.time()
-                # Calculate elapsed time since we started tracking this token
-                elapsed_minutes = (current_time - reference_time) / 60
-                elapsed_hours = elapsed_minutes / 60
-                
-                # Log progress occasionally
-                if elapsed_minutes % 5 < 0.17:  # Log roughly every 5 minutes
-                    fmt_time = "{:.1f}".format(elapsed_minutes)
-                    print(f"Tracking 24hr max for {ca}: {fmt_time} minutes elapsed")
-                
-                # After 24 hours + 20 minutes, fetch and record the 24hr max price
-                if not hr24_completed and current_time >= hr24_check_time and pool_address:
-                    try:
-                        print(f"Reached 24hr mark for {ca}, fetching max price...")
-                        hr24_max_mc = await self.ath.get_ath(ca)
-                        if not hr24_max_mc:
-                            hr24_max_mc = await self.bath.calculate_all_time_high(ca, pool_address)
-                            if hr24_max_mc is not None:
-                                # Update the database with the 24hr max market cap
-                                with sqlite3.connect('memedb.db') as conn:
-                                    cursor = conn.cursor()
-                                    cursor.execute("""
-                                        UPDATE multialerts 
-                                        SET hr24_max_mc = ?
-                                        WHERE ca = ?
-                                    """, (hr24_max_mc, ca))
-                                    conn.commit()
-                                    
-                                print(f"Updated 24hr max MC for {ca}: ${hr24_max_mc:.2f}")
-                            else:
-                                print(f"Got None value for hr24_max_mc, skipping update")
-                            
-                            hr24_completed = True
-                        else:
-                            print(f"No valid 24hr max price data for {ca}")
-                            hr24_completed = True  # Mark as completed even if it failed
-                    except Exception as e:
-                        print(f"Error fetching 24hr max price: {str(e)}")
-                        hr24_completed = True  # Mark as completed even if it failed
-                
-                # Get current marketcap for interval checking and local max tracking
-                try:
-                    marketcap = await self.markca.marketcap(ca)
-                    
-                    if marketcap is None:
-                        print(f"WARNING: marketcap is None for {ca}, setting to 0")
-                        marketcap = 0
-                    
-                    try:
-                        marketcap = float(marketcap)
-                    except (ValueError, TypeError):
-                        print(f"WARNING: Cannot convert marketcap to float for {ca}, setting to 0")
-                        marketcap = 0
-                    
-                    # Still track max locally but don't update DB
-                    if marketcap > max_mc:
-                        max_mc = marketcap
-                    
-                    # Check each interval - only update when we reach the exact interval
-                    for interval in intervals:
-                        if interval in completed:
-                            continue
-                        
-                        # Only update if we've reached this interval
-                        if elapsed_minutes >= interval:
-                            print(f"Reached {interval}m interval for {ca}, updating marketcap...")
-                            
-                            # Update DB with the marketcap at this interval
-                            column_name = f"mc_{interval}m"
-                            
-                            with sqlite3.connect('memedb.db') as conn:
-                                cursor = conn.cursor()
-                                cursor.execute(f"""
-                                    UPDATE multialerts 
-                                    SET {column_name} = ?
-                                    WHERE ca = ?
-                                """, (marketcap, ca))
-                                conn.commit()
-                                
-                            print(f"Updated {column_name} for {ca} with value {marketcap}")
-                            completed.add(interval)
-                    
-                except Exception as e:
-                    print(f"Error updating marketcap: {str(e)}")
-                    import traceback
-                    traceback.print_exc()
-                
-                # If we've completed all intervals and the 24hr check, exit
-                if len(completed) == len(intervals) and hr24_completed:
-                    print(f"All marketcap intervals and 24hr check completed for {ca}")
-                    break
-                    
-                # Sleep before checking again - shorter sleep to be more accurate with timing
-                await asyncio.sleep(30)  # Check every 30 seconds
+            # vol_/mc_ intervals and the 24h max are written later by the job store
+            await self.snapshot_jobs.schedule_alert(ca)
                 
         except Exception as e:
-            print(f"Error in update_marketcap_data: {str(e)}")
+            print(f"Error in DB Indexing: {str(e)}")
             import traceback
-            traceback.print_exc()
-    
-
+            print(traceback.format_exc())
 
     async def convert_token_age_to_minutes(self, token_age):
         """
@@ -2109,14 +1851,21 @@ class Main:
             print(f"Bot logged in as {bot.user}")
             await self.ad_scraper.initialize()
 
-        async with aiohttp.ClientSession() as session:
+        async with http.session() as session:
+            ingest = self.ad_scraper.ingest
             tasks = [
                 bot.start(DISCORD_BOT_TOKEN),
-                self.ad_scraper.swt_process_messages(session), 
-                self.ad_scraper.fresh_process_messages(session),  
-                self.ad_scraper.degen_fetch_and_process_messages(session)
+                self.ad_scraper.consume_messages(session, ingest.swt_queue, self.ad_scraper.handle_swt_message),
+                self.ad_scraper.consume_messages(session, ingest.fresh_queue, self.ad_scraper.handle_fresh_message),
+                self.ad_scraper.consume_messages(session, ingest.degen_queue, self.ad_scraper.handle_degen_message),
+                self.ad_scraper.enrichment_pool.run(),
+                self.ad_scraper.snapshot_jobs.run(),
+                self.ad_scraper.report_ingest_stats(),
+                sol_price.run()
                 #self.ad_scraper.check_multialert(session, "test_name", 'test_ca', "test_channel")
             ]
+            if self.ad_scraper.ingest_mode == "poll":
+                tasks.append(ingest.poll())
             
             try:
                 await asyncio.gather(*tasks)
@@ -0,0 +1,136 @@
+import time
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of sending a request to a provider whose circuit is open"""
+
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class CircuitBreaker:
+    """
+    Per-provider circuit. Closed lets everything through and counts failures
+    (timeouts, connection errors, 5xx); failure_threshold of them in a row, or
+    a failure rate above failure_rate over the last `window` calls, opens it.
+    Open rejects immediately for reset_timeout seconds, then one probe request
+    is let through (half-open): success closes the circuit, failure opens it
+    again for twice as long, up to max_reset_timeout.
+    """
+    def __init__(self, name, failure_threshold=5, failure_rate=0.5, window=20, reset_timeout=30, max_reset_timeout=300):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.failure_rate = failure_rate
+        self.window = window
+        self.base_reset_timeout = reset_timeout
+        self.reset_timeout = reset_timeout
+        self.max_reset_timeout = max_reset_timeout
+
+        self.state = CLOSED
+        self.opened_at = 0.0
+        self.probing = False
+        self.consecutive_failures = 0
+        self.recent = []  # last `window` outcomes, True = success
+
+        self.rejected = 0
+        self.opened = 0
+        self.failures = 0
+        self.successes = 0
+
+    def allow(self):
+        if self.state == OPEN:
+            if time.monotonic() - self.opened_at < self.reset_timeout:
+                self.rejected += 1
+                return False
+            self.state = HALF_OPEN
+            self.probing = False
+        if self.state == HALF_OPEN:
+            if self.probing:
+                self.rejected += 1
+                return False
+            self.probing = True
+        return True
+
+    def is_open(self):
+        """True while requests would be rejected, without taking the probe slot"""
+        if self.state == OPEN:
+            return time.monotonic() - self.opened_at < self.reset_timeout
+        return self.state == HALF_OPEN and self.probing
+
+    def _remember(self, ok):
+        self.recent.append(ok)
+        if len(self.recent) > self.window:
+            del self.recent[0]
+
+    def record_success(self):
+        self.successes += 1
+        self.consecutive_failures = 0
+        self._remember(True)
+        if self.state != CLOSED:
+            print(f"Circuit for {self.name} closed again")
+            self.state = CLOSED
+            self.recent = [True]
+            self.reset_timeout = self.base_reset_timeout
+        self.probing = False
+
+    def record_failure(self):
+        self.failures += 1
+        self.consecutive_failures += 1
+        self._remember(False)
+        if self.state == HALF_OPEN:
+            self.reset_timeout = min(self.max_reset_timeout, self.reset_timeout * 2)
+            self._open()
+            return
+        failed = self.recent.count(False)
+        if self.consecutive_failures >= self.failure_threshold or (
+                len(self.recent) >= self.window and failed / len(self.recent) > self.failure_rate):
+            self._open()
+
+    def release(self):
+        """A call that ended without a verdict (cancelled, out of budget) gives the probe slot back"""
+        self.probing = False
+
+    def _open(self):
+        if self.state != OPEN:
+            self.opened += 1
+            print(f"Circuit for {self.name} opened for {self.reset_timeout:.0f}s")
+        self.state = OPEN
+        self.opened_at = time.monotonic()
+        self.probing = False
+
+    def stats(self):
+        return {
+            'state': self.state,
+            'successes': self.successes,
+            'failures': self.failures,
+            'rejected': self.rejected,
+            'opened': self.opened
+        }
+
+
+class BreakerRegistry:
+    """One CircuitBreaker per provider, created on first use. overrides is {provider: {setting: value}}"""
+    def __init__(self, overrides=None, **defaults):
+        self.defaults = defaults
+        self.overrides = overrides or {}
+        self.breakers = {}
+
+    def get(self, provider):
+        breaker = self.breakers.get(provider)
+        if breaker is None:
+            breaker = CircuitBreaker(provider, **{**self.defaults, **self.overrides.get(provider, {})})
+            self.breakers[provider] = breaker
+        return breaker
+
+    def is_open(self, provider):
+        breaker = self.breakers.get(provider)
+        return breaker is not None and breaker.is_open()
+
+    def stats(self):
+        return {provider: breaker.stats() for provider, breaker in self.breakers.items()}
+
+
+# shared by the http client and the fallback chains
+breakers = BreakerRegistry()
@@ -0,0 +1,127 @@
+import asyncio
+import functools
+import inspect
+import time
+from collections import OrderedDict, defaultdict
+from singleflight import single_flight, call_key
+
+
+# (provider, endpoint) -> (ttl seconds, extra seconds a stale value may be served while it refreshes)
+DEFAULT_TTLS = {
+    ('dexscreener', 'search'): (10, 20),
+    ('dexscreener', 'search_pairs'): (300, 600),
+    ('birdeye', 'trade-data/single'): (30, 60),
+    ('birdeye', 'price'): (10, 20),
+    ('birdeye', 'token_overview'): (60, 120),
+    ('birdeye', 'token_overview/supply'): (600, 3600),
+    ('birdeye', 'txs/token'): (24 * 3600, 0),
+    ('geckoterminal', 'token_price'): (10, 20),
+    ('solana_rpc', 'getTokenSupply'): (600, 3600),
+    ('solanatracker', 'tokens'): (600, 3600),
+}
+
+
+class ResponseCache:
+    """
+    In-memory TTL cache for provider responses with an LRU size bound.
+
+    A value past its TTL but inside the stale window is still returned while a
+    background refresh runs, so bursts of alerts do not all pay for the fetch.
+    """
+    def __init__(self, maxsize=5000, ttls=None, default_ttl=(10, 0)):
+        self.maxsize = maxsize
+        self.ttls = dict(DEFAULT_TTLS)
+        self.ttls.update(ttls or {})
+        self.default_ttl = default_ttl
+        self.entries = OrderedDict()
+        self.refreshing = set()
+
+        self.hits = defaultdict(int)
+        self.stale_hits = defaultdict(int)
+        self.misses = defaultdict(int)
+        self.evictions = 0
+
+    def ttl_for(self, name):
+        return self.ttls.get(name, self.default_ttl)
+
+    def get(self, key):
+        """Returns (value, state) where state is 'fresh', 'stale' or None for a miss"""
+        name = key[:2]
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses[name] += 1
+            return None, None
+        value, stored_at = entry
+        ttl, stale = self.ttl_for(name)
+        age = time.monotonic() - stored_at
+        if age < ttl:
+            self.entries.move_to_end(key)
+            self.hits[name] += 1
+            return value, 'fresh'
+        if age < ttl + stale:
+            self.entries.move_to_end(key)
+            self.stale_hits[name] += 1
+            return value, 'stale'
+        del self.entries[key]
+        self.misses[name] += 1
+        return None, None
+
+    def set(self, key, value):
+        self.entries[key] = (value, time.monotonic())
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, key):
+        self.entries.pop(key, None)
+
+    def stats(self):
+        names = set(self.hits) | set(self.stale_hits) | set(self.misses)
+        result = {}
+        for name in names:
+            lookups = self.hits[name] + self.stale_hits[name] + self.misses[name]
+            result[f"{name[0]}:{name[1]}"] = {
+                'hits': self.hits[name],
+                'stale_hits': self.stale_hits[name],
+                'misses': self.misses[name],
+                'hit_rate': (self.hits[name] + self.stale_hits[name]) / lookups if lookups else 0
+            }
+        return {'entries': len(self.entries), 'evictions': self.evictions, 'endpoints': result}
+
+
+# shared by every provider wrapper
+response_cache = ResponseCache()
+
+
+def cached(provider, endpoint):
+    """
+    Decorator for provider methods: serve from the response cache when fresh
+    enough, otherwise fetch through single-flight and store the result.
+    Failed lookups (None) are not cached.
+    """
+    def decorator(method):
+        signature = inspect.signature(method)
+
+        @functools.wraps(method)
+        async def wrapper(self, *args, **kwargs):
+            key = call_key(signature, provider, endpoint, self, args, kwargs)
+
+            async def fetch():
+                value = await method(self, *args, **kwargs)
+                if value is not None:
+                    response_cache.set(key, value)
+                return value
+
+            value, state = response_cache.get(key)
+            if state == 'fresh':
+                return value
+            if state == 'stale':
+                if key not in response_cache.refreshing:
+                    response_cache.refreshing.add(key)
+                    task = asyncio.ensure_future(single_flight.do(key, fetch))
+                    task.add_done_callback(lambda t: (response_cache.refreshing.discard(key), t.cancelled() or t.exception()))
+                return value
+            return await single_flight.do(key, fetch)
+        return wrapper
+    return decorator
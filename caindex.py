@@ -0,0 +1,81 @@
+import time
+from collections import OrderedDict, deque
+
+
+class CAEventIndex:
+    """
+    Bounded, time-windowed index of channel events keyed by CA.
+
+    The ingest handlers add one event per CA mention so ServerData can answer
+    per-CA questions from memory instead of re-reading channel history.
+    """
+    def __init__(self, window_seconds=6 * 3600, max_events_per_ca=200, max_cas=20000):
+        self.window_seconds = window_seconds
+        self.max_events_per_ca = max_events_per_ca
+        self.max_cas = max_cas
+        # ca -> deque of events, ordered by last update so the stalest CA is first
+        self.events = OrderedDict()
+        self.added = 0
+        self.expired = 0
+
+    def _key(self, ca):
+        return ca.strip().lower()
+
+    def add(self, ca, family, channel_name, channel_id=None, tx_type=None, sol_amount=0.0,
+            description='', trading_links=None, timestamp=None):
+        if not ca:
+            return
+        key = self._key(ca)
+        event = {
+            'ca': ca,
+            'family': family,
+            'channel_name': channel_name,
+            'channel_id': channel_id,
+            'type': tx_type,
+            'sol_amount': sol_amount or 0.0,
+            'description': description or '',
+            'trading_links': trading_links or {},
+            'ts': timestamp or time.time()
+        }
+        ca_events = self.events.get(key)
+        if ca_events is None:
+            ca_events = deque(maxlen=self.max_events_per_ca)
+            self.events[key] = ca_events
+        else:
+            self.events.move_to_end(key)
+        ca_events.append(event)
+        self.added += 1
+        self._evict()
+
+    def _evict(self):
+        """Drop CAs that fell out of the window or past the size bound, oldest first"""
+        cutoff = time.time() - self.window_seconds
+        while self.events:
+            key, ca_events = next(iter(self.events.items()))
+            if len(self.events) > self.max_cas or not ca_events or ca_events[-1]['ts'] < cutoff:
+                self.events.popitem(last=False)
+                self.expired += 1
+                continue
+            break
+
+    def events_for(self, ca, family=None):
+        """Events for one CA inside the window, oldest first"""
+        if not ca:
+            return []
+        ca_events = self.events.get(self._key(ca))
+        if not ca_events:
+            return []
+        cutoff = time.time() - self.window_seconds
+        while ca_events and ca_events[0]['ts'] < cutoff:
+            ca_events.popleft()
+        if family is None:
+            return list(ca_events)
+        return [event for event in ca_events if event['family'] == family]
+
+    def stats(self):
+        return {
+            'cas': len(self.events),
+            'events': sum(len(ca_events) for ca_events in self.events.values()),
+            'added': self.added,
+            'expired': self.expired
+        }
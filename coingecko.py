@@ -1,9 +1,11 @@
 import asyncio
 import aiohttp
 from dexapi import DexScreenerAPI
+from httpclient import http as shared_http
 
 class CoinGeckoTerminal:
-    def __init__(self):
+    def __init__(self, http=None):
+        self.http = http or shared_http
         self.base_url = "https://api.geckoterminal.com/api/v2"
         self.max_retries = 2
     
@@ -15,7 +17,7 @@ class CoinGeckoTerminal:
         headers = {'accept': 'application/json'}
         for attempt in range(1, self.max_retries + 1):
             try:
-                async with aiohttp.ClientSession() as session:
+                async with self.http.session() as session:
                     async with session.get(url, headers=headers) as response:
                         if response.status == 200:
                             return await response.json()
@@ -0,0 +1,179 @@
+import asyncio
+import queue
+import sqlite3
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+
+
+class DBWriter:
+    """
+    Single writer thread for memedb.db.
+
+    The thread owns one WAL-mode connection. Writes are queued from any thread
+    (or the event loop) and the thread drains whatever is waiting into one
+    transaction, folding runs of the same statement into one executemany. So
+    the loop never blocks on fsync and a burst of updates is one commit.
+    sqlite3 keeps compiled statements in its statement cache, so repeated SQL
+    is only prepared once per connection.
+
+    submit() returns a concurrent Future (fire and forget is fine), execute()
+    and executemany() are the awaitable versions. Each resolves to the rowcount.
+    transaction() queues several statements that must land together: they are
+    one item, so a failing batch replays them as one commit.
+    """
+    def __init__(self, db_path='memedb.db', max_batch=500, max_delay=0.05, cached_statements=256, window=1000):
+        self.db_path = db_path
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.cached_statements = cached_statements
+        self.queue = queue.Queue()
+        self.thread = None
+        self.indexed = False
+
+        self.latencies = deque(maxlen=window)
+        self.commit_sizes = deque(maxlen=window)
+        self.commits = 0
+        self.writes = 0
+        self.errors = 0
+        self.max_commit_size = 0
+
+    def start(self):
+        if self.thread is None or not self.thread.is_alive():
+            self.thread = threading.Thread(target=self._run, name="db-writer", daemon=True)
+            self.thread.start()
+
+    def submit(self, sql, params=(), many=False):
+        """Queue one write (or an executemany when many=True)"""
+        self.start()
+        future = Future()
+        self.queue.put((time.monotonic(), sql, params, many, future))
+        return future
+
+    async def execute(self, sql, params=()):
+        return await asyncio.wrap_future(self.submit(sql, params))
+
+    async def executemany(self, sql, rows):
+        return await asyncio.wrap_future(self.submit(sql, list(rows), many=True))
+
+    async def transaction(self, statements):
+        """Run [(sql, params or rows, many)] all or nothing, resolves to the summed rowcount"""
+        return await asyncio.wrap_future(self.submit(None, list(statements), many='transaction'))
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, cached_statements=self.cached_statements)
+        conn.execute("PRAGMA journal_mode=WAL")
+        # WAL with synchronous=NORMAL only fsyncs on checkpoints
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA busy_timeout=5000")
+        return conn
+
+    def _ensure_indexes(self, conn):
+        """Every UPDATE here is keyed by ca, make sure that is an index lookup"""
+        try:
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_multialerts_ca ON multialerts (ca)")
+            conn.commit()
+            self.indexed = True
+        except sqlite3.OperationalError:
+            # table not created yet, tried again before the next batch
+            pass
+
+    def _drain(self):
+        """Block for the first write, then collect whatever arrives within max_delay"""
+        batch = [self.queue.get()]
+        deadline = time.monotonic() + self.max_delay
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            try:
+                batch.append(self.queue.get(timeout=max(0, remaining)) if remaining > 0 else self.queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _group(self, batch):
+        """Consecutive writes with the same SQL become one executemany, order is kept"""
+        groups = []
+        for item in batch:
+            _, sql, params, many, future = item
+            if groups and groups[-1][0] == sql and not many and not groups[-1][2]:
+                groups[-1][1].append(item)
+            else:
+                groups.append((sql, [item], many))
+        return groups
+
+    def _write(self, conn, groups):
+        """Run the groups on conn, returns {future: rowcount} (None when folded into a shared executemany)"""
+        rowcounts = {}
+        for sql, items, many in groups:
+            if many == 'transaction':
+                rowcounts[items[0][4]] = sum(
+                    max(0, (conn.executemany if statement_many else conn.execute)(statement_sql, params).rowcount)
+                    for statement_sql, params, statement_many in items[0][2]
+                )
+            elif many:
+                rowcounts[items[0][4]] = conn.executemany(sql, items[0][2]).rowcount
+            elif len(items) > 1:
+                conn.executemany(sql, [item[2] for item in items])
+            else:
+                rowcounts[items[0][4]] = conn.execute(sql, items[0][2]).rowcount
+        return rowcounts
+
+    def _resolve(self, batch, rowcounts=None, error=None):
+        for _, _, _, _, future in batch:
+            if future.done():
+                continue
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result((rowcounts or {}).get(future))
+
+    def _run(self):
+        conn = self._connect()
+        while True:
+            batch = self._drain()
+            if not self.indexed:
+                self._ensure_indexes(conn)
+            started = time.monotonic()
+            for queued_at, *_ in batch:
+                self.latencies.append(started - queued_at)
+            try:
+                rowcounts = self._write(conn, self._group(batch))
+                conn.commit()
+                self._resolve(batch, rowcounts)
+            except Exception as e:
+                conn.rollback()
+                print(f"DB writer batch of {len(batch)} failed ({str(e)}), retrying one by one")
+                # one bad statement should not take the rest of the batch with it
+                for item in batch:
+                    try:
+                        rowcounts = self._write(conn, [(item[1], [item], item[3])])
+                        conn.commit()
+                        self._resolve([item], rowcounts)
+                    except Exception as item_error:
+                        conn.rollback()
+                        self.errors += 1
+                        print(f"DB write failed: {str(item_error)}")
+                        self._resolve([item], error=item_error)
+            self.commits += 1
+            self.writes += len(batch)
+            self.commit_sizes.append(len(batch))
+            self.max_commit_size = max(self.max_commit_size, len(batch))
+
+    def stats(self):
+        latencies = sorted(self.latencies)
+        sizes = list(self.commit_sizes)
+        return {
+            'depth': self.queue.qsize(),
+            'writes': self.writes,
+            'commits': self.commits,
+            'errors': self.errors,
+            'avg_commit_size': sum(sizes) / len(sizes) if sizes else 0,
+            'max_commit_size': self.max_commit_size,
+            'avg_queue_ms': sum(latencies) / len(latencies) * 1000 if latencies else 0,
+            'p95_queue_ms': latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] * 1000 if latencies else 0
+        }
+
+
+# the one writer for memedb.db
+db_writer = DBWriter()
@@ -0,0 +1,43 @@
+import time
+from contextvars import ContextVar
+
+
+class DeadlineExceeded(Exception):
+    """The alert's latency budget ran out before this call could start"""
+
+
+class Deadline:
+    """
+    Overall latency budget for one alert. It is set as the current deadline
+    (a context variable, so every task spawned under it sees it), and stage
+    timeouts and HTTP timeouts are cut down to whatever is left of it.
+    """
+    def __init__(self, budget):
+        self.budget = budget
+        self.started_at = time.monotonic()
+        self.expires_at = self.started_at + budget
+
+    def remaining(self):
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self):
+        return self.remaining() <= 0
+
+    def elapsed(self):
+        return time.monotonic() - self.started_at
+
+    def timeout(self, cap=None):
+        """cap (a normal timeout) trimmed to the remaining budget"""
+        remaining = self.remaining()
+        return remaining if cap is None else min(cap, remaining)
+
+
+current_deadline = ContextVar('current_deadline', default=None)
+
+
+def time_left(cap=None):
+    """cap trimmed to the current deadline, cap itself when no deadline is set"""
+    deadline = current_deadline.get()
+    if deadline is None:
+        return cap
+    return deadline.timeout(cap)
@@ -5,9 +5,11 @@ from ath import ATH
 from backupath import BATH
 from dexapi import DexScreenerAPI
 from marketcap import MarketcapFetcher
+from httpclient import http as shared_http
 
 class DevTokenHistory:
-    def __init__(self):
+    def __init__(self, http=None):
+        self.http = http or shared_http
         self.ath = ATH()
         self.backup_ath = BATH()
         self.d = DexScreenerAPI()
@@ -21,7 +23,7 @@ class DevTokenHistory:
             "X-API-KEY": BIRDEYE_API_KEY
         }
         try:
-            async with aiohttp.ClientSession() as session:
+            async with self.http.session() as session:
                 async with session.get(url, headers=headers) as response:
                     data = await response.json()
                     if not data:
@@ -43,7 +45,7 @@ class DevTokenHistory:
             'X-API-KEY': SOLANA_TRACKER_API_KEY
         }
         try:
-            async with aiohttp.ClientSession() as session:
+            async with self.http.session() as session:
                 async with session.get(url, headers=headers) as response:
                     data = await response.json()
                     if not data:
@@ -7,13 +7,16 @@ from marketcap import MarketcapFetcher
 from env import SOLANA_TRACKER_API_KEY, BIRDEYE_API_KEY
 from datetime import datetime, timezone, timedelta
 from webhooks import TradeWebhook
+from httpclient import http as shared_http
+from sourcerank import waterfall
 
 class DevHist:
-    def __init__(self):
-        self.ath = ATH()
-        self.bath = BATH()
-        self.dex = DexScreenerAPI()
-        self.webhook = TradeWebhook()
+    def __init__(self, http=None):
+        self.http = http or shared_http
+        self.ath = ATH(http=self.http)
+        self.bath = BATH(http=self.http)
+        self.dex = DexScreenerAPI(http=self.http)
+        self.webhook = TradeWebhook(http=self.http)
 
         self.max_retries = 3
         self.retry_delay = 2
@@ -26,7 +29,7 @@ class DevHist:
             'X-API-KEY': BIRDEYE_API_KEY
         }
         try:
-            async with aiohttp.ClientSession() as session:
+            async with self.http.session() as session:
                 async with session.get(url, headers=headers) as response:
                     data = await response.json()
                     if not data:
@@ -49,7 +52,7 @@ class DevHist:
             'X-API-KEY': SOLANA_TRACKER_API_KEY
         }
         try:
-            async with aiohttp.ClientSession() as session:
+            async with self.http.session() as session:
                 async with session.get(url, headers=headers) as response:
                     data = await response.json()
                     if not data:
@@ -268,20 +271,23 @@ class DevHist:
             
     async def _get_dev_token_aths(self, ca):
         try:
-            ath = await self.ath.get_ath(ca)
-            if not ath:
-                dex_data = await self.dex.fetch_token_data_from_dex(ca)
-                if not dex_data:
-                    return
-                pair_address = dex_data.get('pairAddress')
-                ath = await self.bath.calculate_all_time_high(pair_address=pair_address)
-                if not ath:
-                    return None
-            return ath
+            return await waterfall("dev_ath", [
+                ('solanatracker', lambda: self.ath.get_ath(ca)),
+                ('moralis', lambda: self._bath_ath(ca)),
+            ], valid=bool)
         except Exception as e:
             print(str(e))
             return None
 
+    async def _bath_ath(self, ca):
+        dex_data = await self.dex.fetch_token_data_from_dex(ca)
+        if not dex_data:
+            return None
+        pair_address = dex_data.get('pool_address')
+        if not pair_address:
+            return None
+        return await self.bath.calculate_all_time_high(ca, pair_address)
+
 class Main:
     def __init__(self):
         self.d = DevHist()
@@ -4,10 +4,11 @@ import aiohttp
 from env import MORALIS_API_KEY
 from marketcap import MarketcapFetcher
 from marketcapfinal import Supply, Price, Marketcap
+from httpclient import http as shared_http
 
 class OH:
-    def __init__(self):
-        pass
+    def __init__(self, http=None):
+        self.http = http or shared_http
 
     async def fetch(self, timeframe, pair_address):
         url = f"https://solana-gateway.moralis.io/token/mainnet/pairs/{pair_address}/ohlcv"
@@ -23,7 +24,7 @@ class OH:
             "X-API-Key": MORALIS_API_KEY
         }
         try:
-            async with aiohttp.ClientSession() as session:
+            async with self.http.session() as session:
                 async with session.get(url, params=params, headers=headers) as response:
                     data = await response.json()
                     if not data:
@@ -0,0 +1,121 @@
+import asyncio
+import time
+from collections import defaultdict, deque
+from sourcerank import source_ranker, percentile
+
+
+class HedgeStats:
+    """
+    Per waterfall (price, supply, ...): which source answered, how many hedges
+    were launched and what the hedged call cost compared to the primary alone.
+
+    When a hedge wins the primary is cancelled, so its latency is only known to
+    be at least the time it had been running. Those censored samples go into
+    the primary series as they are, which makes saved_p95_ms a lower bound.
+    """
+    def __init__(self, window=1000):
+        self.calls = defaultdict(int)
+        self.hedges = defaultdict(int)
+        self.failures = defaultdict(int)
+        self.wins = defaultdict(lambda: defaultdict(int))
+        self.latencies = defaultdict(lambda: deque(maxlen=window))
+        self.primary_latencies = defaultdict(lambda: deque(maxlen=window))
+
+    def record(self, name, winner, elapsed, primary_elapsed, hedges):
+        self.calls[name] += 1
+        self.hedges[name] += hedges
+        if winner is None:
+            self.failures[name] += 1
+        else:
+            self.wins[name][winner] += 1
+        self.latencies[name].append(elapsed)
+        if primary_elapsed is not None:
+            self.primary_latencies[name].append(primary_elapsed)
+
+    def stats(self):
+        result = {}
+        for name in self.calls:
+            p95 = percentile(self.latencies[name], 0.95)
+            primary_p95 = percentile(self.primary_latencies[name], 0.95)
+            result[name] = {
+                'calls': self.calls[name],
+                'hedges': self.hedges[name],
+                'failures': self.failures[name],
+                'wins': dict(self.wins[name]),
+                'p50_ms': percentile(self.latencies[name], 0.5) * 1000,
+                'p95_ms': p95 * 1000,
+                'primary_p50_ms': percentile(self.primary_latencies[name], 0.5) * 1000,
+                'primary_p95_ms': primary_p95 * 1000,
+                'saved_p95_ms': max(0, primary_p95 - p95) * 1000
+            }
+        return result
+
+
+# shared by every hedged waterfall
+hedge_stats = HedgeStats()
+
+
+async def hedged(name, sources, hedge_delay=0.5, valid=None, stats=None, ranker=None):
+    """
+    Race a fallback chain instead of walking it. sources is a list of (label,
+    zero-argument coroutine function) in preference order, re-ranked by the
+    source ranker (open sources are skipped). The first one starts right away,
+    the next one after hedge_delay seconds without an answer or as soon as one
+    in flight fails, and the first valid result wins; whatever is still running
+    is cancelled. hedge_delay=0 starts every source at once, None only moves on
+    after a failure (the old sequential behaviour). Returns None if all fail.
+    """
+    stats = stats or hedge_stats
+    ranker = ranker or source_ranker
+    valid = valid or (lambda result: result is not None)
+    funcs = dict(sources)
+    sources = [(label, funcs[label]) for label in ranker.order(name, list(funcs))]
+    if not sources:
+        print(f"Every {name} source is cooling down after repeated failures")
+        return None
+    started = time.monotonic()
+    pending = {}  # task -> (index, label, launched at)
+    launched = 0
+    winner = None
+    primary_elapsed = None
+
+    def launch():
+        nonlocal launched
+        label, func = sources[launched]
+        pending[asyncio.ensure_future(func())] = (launched, label, time.monotonic())
+        launched += 1
+
+    try:
+        launch()
+        while pending:
+            timeout = hedge_delay if hedge_delay is not None and launched < len(sources) else None
+            done, _ = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+            if not done:
+                launch()
+                continue
+            # several can land in the same wakeup, prefer the earlier source
+            for task in sorted(done, key=lambda t: pending[t][0]):
+                index, label, launched_at = pending.pop(task)
+                now = time.monotonic()
+                if index == 0:
+                    primary_elapsed = now - started
+                try:
+                    result = task.result()
+                except Exception as e:
+                    print(f"Error in {name} source {label}: {str(e)}")
+                    result = None
+                ok = valid(result)
+                # cancelled losers are not recorded, they neither failed nor answered
+                ranker.record(name, label, ok, now - launched_at)
+                if ok:
+                    winner = label
+                    return result
+                if launched < len(sources):
+                    launch()
+        print(f"All {name} sources failed")
+        return None
+    finally:
+        for task in pending:
+            task.cancel()
+        elapsed = time.monotonic() - started
+        stats.record(name, winner, elapsed, primary_elapsed if primary_elapsed is not None else elapsed, launched - 1)
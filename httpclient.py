@@ -0,0 +1,229 @@
+import asyncio
+import time
+from collections import defaultdict
+from contextlib import asynccontextmanager
+import aiohttp
+from ratelimit import RateLimiter
+from breaker import breakers as shared_breakers, CircuitOpenError
+from deadline import DeadlineExceeded, current_deadline, time_left
+
+
+def retry_after_seconds(response, fallback):
+    """Retry-After in seconds, falls back when missing or given as a date"""
+    value = response.headers.get('Retry-After')
+    if value:
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+    return fallback
+
+
+class _RequestContext:
+    """Lets a rate-limited request be used with both `async with` and `await`"""
+    def __init__(self, coro):
+        self._coro = coro
+        self._response = None
+
+    def __await__(self):
+        return self._coro.__await__()
+
+    async def __aenter__(self):
+        self._response = await self._coro
+        return self._response
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self._response.release()
+
+
+class PooledSession:
+    """
+    What http.session() lends out. Same get/post surface as ClientSession, but
+    every request first waits on the provider's token bucket and 429s are
+    retried after Retry-After instead of being returned to the caller.
+    """
+    def __init__(self, client):
+        self.client = client
+
+    def request(self, method, url, **kwargs):
+        return _RequestContext(self.client._request(method, url, **kwargs))
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request('POST', url, **kwargs)
+
+
+class HttpClient:
+    """
+    Process-wide aiohttp session shared by every provider module.
+
+    Connections are pooled and kept alive per host, DNS lookups are cached and
+    every request gets a default timeout, cut down to what is left of the
+    current alert's deadline. Each provider sits behind a circuit breaker, so a
+    provider that is down is rejected in microseconds instead of costing every
+    caller a timeout. A trace config counts new vs reused connections so it is
+    visible when handshakes are still being paid.
+    """
+    def __init__(self, limit=100, limit_per_host=20, ttl_dns_cache=300, keepalive_timeout=30,
+                 total_timeout=20, connect_timeout=5, sock_read_timeout=15, limiter=None, max_retries=3, backoff=2, breakers=None):
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.ttl_dns_cache = ttl_dns_cache
+        self.keepalive_timeout = keepalive_timeout
+        self.timeout = aiohttp.ClientTimeout(total=total_timeout, connect=connect_timeout, sock_read=sock_read_timeout)
+        self._session = None
+        self._loop = None
+        self.limiter = limiter or RateLimiter()
+        self.breakers = breakers or shared_breakers
+        self.max_retries = max_retries
+        self.backoff = backoff
+
+        self.requests = 0
+        self.connections_created = 0
+        self.connections_reused = 0
+        self.connect_time_total = 0.0
+        self.dns_hits = 0
+        self.dns_misses = 0
+        self.host_requests = defaultdict(int)
+
+    def _trace_config(self):
+        trace = aiohttp.TraceConfig()
+
+        async def on_request_start(session, ctx, params):
+            self.requests += 1
+            self.host_requests[params.url.host] += 1
+
+        async def on_connection_create_start(session, ctx, params):
+            ctx.connect_started = time.monotonic()
+
+        async def on_connection_create_end(session, ctx, params):
+            self.connections_created += 1
+            started = getattr(ctx, 'connect_started', None)
+            if started:
+                self.connect_time_total += time.monotonic() - started
+
+        async def on_connection_reuseconn(session, ctx, params):
+            self.connections_reused += 1
+
+        async def on_dns_cache_hit(session, ctx, params):
+            self.dns_hits += 1
+
+        async def on_dns_cache_miss(session, ctx, params):
+            self.dns_misses += 1
+
+        trace.on_request_start.append(on_request_start)
+        trace.on_connection_create_start.append(on_connection_create_start)
+        trace.on_connection_create_end.append(on_connection_create_end)
+        trace.on_connection_reuseconn.append(on_connection_reuseconn)
+        trace.on_dns_cache_hit.append(on_dns_cache_hit)
+        trace.on_dns_cache_miss.append(on_dns_cache_miss)
+        return trace
+
+    def get_session(self):
+        """The shared session, created on first use inside the running loop"""
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._loop is not loop:
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                ttl_dns_cache=self.ttl_dns_cache,
+                keepalive_timeout=self.keepalive_timeout
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=self.timeout,
+                trace_configs=[self._trace_config()]
+            )
+            self._loop = loop
+        return self._session
+
+    def _timeout(self):
+        """Default timeout trimmed to the current alert's deadline, (timeout, trimmed)"""
+        remaining = time_left()
+        if remaining is None or remaining >= self.timeout.total:
+            return self.timeout, False
+        if remaining <= 0:
+            raise DeadlineExceeded("deadline passed before the request was sent")
+        return aiohttp.ClientTimeout(
+            total=remaining,
+            connect=min(self.timeout.connect, remaining),
+            sock_read=min(self.timeout.sock_read, remaining)
+        ), True
+
+    async def _request(self, method, url, weight=1, **kwargs):
+        """weight is how many rate limit tokens the request costs, e.g. the calls in a JSON-RPC batch"""
+        session = self.get_session()
+        provider, _ = self.limiter.classify(url)
+        breaker = self.breakers.get(provider)
+        if not breaker.allow():
+            raise CircuitOpenError(f"{provider} circuit is open")
+        trimmed = False
+        try:
+            for attempt in range(self.max_retries + 1):
+                # waiting for a token counts against the deadline as well
+                await asyncio.wait_for(self.limiter.acquire(url, weight), timeout=time_left())
+                timeout = kwargs.get('timeout')
+                if timeout is None:
+                    timeout, trimmed = self._timeout()
+                response = await session.request(method, url, **{**kwargs, 'timeout': timeout})
+                if response.status != 429 or attempt == self.max_retries:
+                    break
+                delay = retry_after_seconds(response, self.backoff * (attempt + 1))
+                response.release()
+                self.limiter.throttle(url, delay)
+        except (asyncio.TimeoutError, DeadlineExceeded):
+            if trimmed or current_deadline.get() is not None and current_deadline.get().expired():
+                # out of the alert's budget, says nothing about the provider
+                breaker.release()
+            else:
+                breaker.record_failure()
+            raise
+        except aiohttp.ClientError:
+            breaker.record_failure()
+            raise
+        except BaseException:
+            breaker.release()
+            raise
+        if response.status >= 500 or response.status == 429:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+        return response
+
+    @asynccontextmanager
+    async def session(self):
+        """
+        Drop-in for `async with aiohttp.ClientSession() as session:` that lends
+        out the shared, rate-limited session instead of opening a new one.
+        """
+        yield PooledSession(self)
+
+    def get(self, url, **kwargs):
+        return PooledSession(self).get(url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return PooledSession(self).post(url, **kwargs)
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    def stats(self):
+        connections = self.connections_created + self.connections_reused
+        return {
+            'requests': self.requests,
+            'connections_created': self.connections_created,
+            'connections_reused': self.connections_reused,
+            'reuse_ratio': self.connections_reused / connections if connections else 0,
+            'avg_connect_ms': self.connect_time_total / self.connections_created * 1000 if self.connections_created else 0,
+            'dns_hits': self.dns_hits,
+            'dns_misses': self.dns_misses,
+            'hosts': dict(self.host_requests)
+        }
+
+
+# shared by every provider class unless one is injected
+http = HttpClient()
@@ -0,0 +1,263 @@
+import asyncio
+import time
+from collections import OrderedDict, deque
+
+
+def parse_trading_links(links_value):
+    """Pull the Photon / DexScreener / BullX urls out of a SWT 'Useful Links:' field"""
+    trading_links = {}
+    for link in links_value.split(" | "):
+        if "Photon](" in link:
+            trading_links['photon'] = link.split("](")[1].rstrip(")")
+        elif "DexScreener](" in link:
+            trading_links['dex'] = link.split("](")[1].rstrip(")")
+        elif "BullX](" in link:
+            trading_links['bull_x'] = link.split("](")[1].rstrip(")")
+    return trading_links
+
+
+def parse_swt_message(message, channel_name):
+    """Flatten the embeds of a SWT channel message into message_data dicts"""
+    parsed = []
+    for embed in message.embeds:
+        message_data = {
+            'timestamp': message.created_at.isoformat(),
+            'description': embed.description or '',
+            'fields': {},
+            'channel_name': channel_name,
+            'channel_id': message.channel.id,
+            'trading_links': {}
+        }
+        if embed.fields:
+            for field in embed.fields:
+                field_name = field.name.strip()
+                field_value = field.value.strip()
+                message_data['fields'][field_name] = field_value
+                if field_name.lower() == "useful links:":
+                    message_data['trading_links'] = parse_trading_links(field_value)
+        parsed.append(message_data)
+    return parsed
+
+
+def parse_fresh_message(message, channel_name):
+    """Flatten the embeds of a Fresh channel message into message_data dicts"""
+    parsed = []
+    for embed in message.embeds:
+        message_data = {
+            'timestamp': message.created_at.isoformat(),
+            'title': embed.title if embed.title else '',
+            'description': embed.description if embed.description else '',
+            'fields': {},
+            'channel_name': channel_name,
+            'channel_id': message.channel.id
+        }
+        if embed.fields:
+            for field in embed.fields:
+                field_name = field.name.strip()
+                field_value = field.value.strip()
+                message_data['fields'][field_name] = field_value
+        parsed.append(message_data)
+    return parsed
+
+
+def parse_degen_message(message, channel_name="Degen"):
+    """Flatten the embeds of a Degen channel message, pulling out the CA and swap details"""
+    parsed = []
+    for embed in message.embeds:
+        if not embed.fields:
+            continue
+        message_data = {
+            'timestamp': message.created_at.isoformat(),
+            'fields': {},
+            'channel_name': channel_name,
+            'channel_id': message.channel.id,
+            'ca': None,
+            'swap_details': None
+        }
+        for field in embed.fields:
+            if "Token:" in field.value and not message_data['ca']:
+                try:
+                    message_data['ca'] = field.value.split('`')[1].strip()
+                except IndexError:
+                    print("Could not extract CA from field")
+            value_lower = field.value.lower()
+            if ("swapped" in value_lower or "transferred" in value_lower) and not message_data['swap_details']:
+                message_data['swap_details'] = field.value
+            message_data['fields'][field.name] = field.value
+        parsed.append(message_data)
+    return parsed
+
+
+class SeenCache:
+    """Fixed-size, time-windowed set of keys, used to hand each message off exactly once"""
+    def __init__(self, maxsize=50000, ttl_seconds=24 * 3600):
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self.entries = OrderedDict()
+        self.duplicates = 0
+
+    def _expire(self, now):
+        cutoff = now - self.ttl_seconds
+        while self.entries:
+            key, seen_at = next(iter(self.entries.items()))
+            if seen_at >= cutoff and len(self.entries) <= self.maxsize:
+                break
+            self.entries.popitem(last=False)
+
+    def add(self, key):
+        """Returns True the first time a key is seen inside the window, False for repeats"""
+        now = time.monotonic()
+        self._expire(now)
+        if key in self.entries:
+            self.duplicates += 1
+            return False
+        self.entries[key] = now
+        if len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+        return True
+
+    def discard(self, key):
+        self.entries.pop(key, None)
+
+    def __contains__(self, key):
+        seen_at = self.entries.get(key)
+        return seen_at is not None and seen_at >= time.monotonic() - self.ttl_seconds
+
+    def __len__(self):
+        return len(self.entries)
+
+
+class IngestQueue:
+    """In-process hand-off between Discord ingestion and one family of handlers"""
+    def __init__(self, family, maxsize=0, latency_window=1000):
+        self.family = family
+        self.queue = asyncio.Queue(maxsize=maxsize)
+        self.latencies = deque(maxlen=latency_window)
+        self.received = 0
+        self.handled = 0
+
+    def put(self, message_id, message_data):
+        message_data['ingested_at'] = time.monotonic()
+        self.received += 1
+        self.queue.put_nowait((message_id, message_data))
+
+    async def get(self):
+        """Wait for the next message and record how long it sat between ingest and handler"""
+        message_id, message_data = await self.queue.get()
+        latency = time.monotonic() - message_data.get('ingested_at', time.monotonic())
+        self.latencies.append(latency)
+        self.handled += 1
+        return message_id, message_data, latency
+
+    def task_done(self):
+        self.queue.task_done()
+
+    def latency_stats(self):
+        """Ingest-to-handler latency in milliseconds over the recent window"""
+        if not self.latencies:
+            return {'family': self.family, 'received': self.received, 'handled': self.handled,
+                    'depth': self.queue.qsize(), 'avg_ms': 0, 'p50_ms': 0, 'p95_ms': 0, 'max_ms': 0}
+        ordered = sorted(self.latencies)
+        return {
+            'family': self.family,
+            'received': self.received,
+            'handled': self.handled,
+            'depth': self.queue.qsize(),
+            'avg_ms': sum(ordered) / len(ordered) * 1000,
+            'p50_ms': ordered[len(ordered) // 2] * 1000,
+            'p95_ms': ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000,
+            'max_ms': ordered[-1] * 1000
+        }
+
+
+class ChannelIngest:
+    """
+    Pushes watched-channel messages into per-family queues, either straight
+    from the gateway on_message event or from a cursor-based history poll.
+    Every message id is handed off once and then only kept in the bounded
+    seen cache.
+    """
+    def __init__(self, bot, swt_channel_ids, fresh_channel_ids, degen_channel_id):
+        self.bot = bot
+        self.swt_channel_ids = swt_channel_ids
+        self.fresh_channel_ids = fresh_channel_ids
+        self.degen_channel_id = degen_channel_id
+
+        self.swt_queue = IngestQueue("SWT")
+        self.fresh_queue = IngestQueue("Fresh")
+        self.degen_queue = IngestQueue("Degen")
+        self.seen = SeenCache()
+        # channel id -> newest message handed off, used as the poll cursor
+        self.cursors = {}
+        self.registered = False
+
+    def register(self):
+        if not self.registered:
+            self.bot.add_listener(self.on_message, 'on_message')
+            self.registered = True
+
+    def ingest(self, message):
+        """Route one discord message to its family queue, returns True if it was watched"""
+        if not message.embeds:
+            return False
+        channel_id = message.channel.id
+        message_id = str(message.id)
+        if not self.is_watched(channel_id):
+            return False
+        if not self.seen.add(message_id):
+            return False
+
+        if channel_id in self.swt_channel_ids:
+            for message_data in parse_swt_message(message, self.swt_channel_ids[channel_id]):
+                self.swt_queue.put(message_id, message_data)
+            return True
+        if channel_id in self.fresh_channel_ids:
+            for message_data in parse_fresh_message(message, self.fresh_channel_ids[channel_id]):
+                self.fresh_queue.put(message_id, message_data)
+            return True
+        if channel_id == self.degen_channel_id:
+            for message_data in parse_degen_message(message):
+                self.degen_queue.put(message_id, message_data)
+            return True
+        return False
+
+    def is_watched(self, channel_id):
+        return channel_id in self.swt_channel_ids or channel_id in self.fresh_channel_ids or channel_id == self.degen_channel_id
+
+    async def on_message(self, message):
+        try:
+            self.ingest(message)
+        except Exception as e:
+            print(f"Error ingesting message {message.id}: {str(e)}")
+
+    async def poll(self, interval=2, limit=50):
+        """
+        Poll-mode producer. Reads everything after the per-channel cursor, oldest
+        first, so bursts between polls are not dropped.
+        """
+        await self.bot.wait_until_ready()
+        channel_ids = list(self.swt_channel_ids) + list(self.fresh_channel_ids) + [self.degen_channel_id]
+
+        while True:
+            for channel_id in channel_ids:
+                channel = self.bot.get_channel(channel_id)
+                if not channel:
+                    continue
+                try:
+                    cursor = self.cursors.get(channel_id)
+                    if cursor is None:
+                        # First pass only takes the latest message, like the old loops
+                        history = channel.history(limit=1)
+                    else:
+                        history = channel.history(limit=limit, after=cursor, oldest_first=True)
+                    async for message in history:
+                        if cursor is None or message.id > cursor.id:
+                            cursor = message
+                            self.cursors[channel_id] = message
+                        self.ingest(message)
+                except Exception as e:
+                    print(f"Error polling channel {channel_id}: {str(e)}")
+            await asyncio.sleep(interval)
+
+    def latency_stats(self):
+        return [q.latency_stats() for q in (self.swt_queue, self.fresh_queue, self.degen_queue)]
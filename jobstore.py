@@ -0,0 +1,245 @@
+import asyncio
+import sqlite3
+import time
+from collections import defaultdict
+from dbwriter import db_writer
+
+
+# column -> (seconds after indexing, quote field or None for the 24h max)
+SNAPSHOT_SCHEDULE = {
+    'vol_1m': (60, 'm5_vol'),
+    'vol_3m': (3 * 60, 'm5_vol'),
+    'vol_5m': (5 * 60, 'm5_vol'),
+    'vol_10m': (10 * 60, 'm5_vol'),
+    'mc_3m': (3 * 60, 'marketcap'),
+    'mc_8m': (8 * 60, 'marketcap'),
+    'mc_15m': (15 * 60, 'marketcap'),
+    'hr24_max_mc': ((24 * 60 * 60) + (20 * 60), None),
+}
+
+
+class SnapshotJobStore:
+    """
+    Post-alert snapshots (vol_/mc_ intervals and the 24h max) kept as rows in
+    SQLite instead of coroutines asleep for a day per token.
+
+    One dispatcher asks the database for the earliest due_at (indexed) and
+    sleeps until then, so idle cost does not grow with the number of pending
+    tokens. Everything due within batch_window runs as one batch: the quote
+    columns go through one quote-engine flush and one executemany per column.
+    Rows survive restarts; interval snapshots that are more than max_lateness
+    overdue by then are dropped rather than written with the wrong value.
+    The slow 24h max jobs are leased (due_at pushed ath_lease seconds out) and
+    run as their own tasks, so they never hold up the next interval batch.
+    All writes go through the shared DB writer, reads run in a worker thread.
+    """
+    def __init__(self, quotes, ath, bath, dex, db_path='memedb.db', writer=None, batch_window=2, batch_limit=500,
+                 max_lateness=300, retry_delay=60, max_attempts=3, ath_concurrency=4, ath_lease=1800):
+        self.writer = writer or db_writer
+        self.quotes = quotes
+        self.ath = ath
+        self.bath = bath
+        self.dex = dex
+        self.db_path = db_path
+        self.batch_window = batch_window
+        self.batch_limit = batch_limit
+        self.max_lateness = max_lateness
+        self.retry_delay = retry_delay
+        self.max_attempts = max_attempts
+        self.ath_slots = asyncio.Semaphore(ath_concurrency)
+        self.ath_lease = ath_lease
+        self.ath_tasks = set()
+        self._wakeup = asyncio.Event()
+
+        self.completed = defaultdict(int)
+        self.failed = defaultdict(int)
+        self.dropped_late = 0
+        self.batches = 0
+        self.pending = 0  # row count as of the last dispatcher look
+        self.create_table()
+
+    def create_table(self):
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS snapshot_jobs (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    ca TEXT NOT NULL,
+                    column_name TEXT NOT NULL,
+                    due_at REAL NOT NULL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    created_at REAL NOT NULL,
+                    UNIQUE (ca, column_name)
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_snapshot_jobs_due_at ON snapshot_jobs (due_at)")
+            conn.commit()
+
+    async def schedule_alert(self, ca, indexed_at=None):
+        """Queue every snapshot in SNAPSHOT_SCHEDULE for a freshly indexed CA"""
+        indexed_at = indexed_at or time.time()
+        rows = [
+            (ca, column, indexed_at + delay, indexed_at)
+            for column, (delay, _) in SNAPSHOT_SCHEDULE.items()
+        ]
+        await self.writer.executemany("""
+            INSERT OR IGNORE INTO snapshot_jobs (ca, column_name, due_at, created_at)
+            VALUES (?, ?, ?, ?)
+        """, rows)
+        self._wakeup.set()
+
+    def _next_due(self):
+        with sqlite3.connect(self.db_path) as conn:
+            row = conn.execute("SELECT MIN(due_at), COUNT(*) FROM snapshot_jobs").fetchone()
+        if not row:
+            return None
+        self.pending = row[1]
+        return row[0]
+
+    def _take_due(self, now):
+        with sqlite3.connect(self.db_path) as conn:
+            return conn.execute("""
+                SELECT id, ca, column_name, due_at, attempts FROM snapshot_jobs
+                WHERE due_at <= ?
+                ORDER BY due_at
+                LIMIT ?
+            """, (now + self.batch_window, self.batch_limit)).fetchall()
+
+    async def run(self):
+        while True:
+            try:
+                # clear before looking, so a schedule() landing meanwhile still wakes us
+                self._wakeup.clear()
+                next_due = await asyncio.to_thread(self._next_due)
+                now = time.time()
+                if next_due is not None and next_due <= now:
+                    await self.dispatch(now)
+                    continue
+                timeout = None if next_due is None else next_due - now
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+                except asyncio.TimeoutError:
+                    pass
+            except Exception as e:
+                print(f"Error in snapshot job dispatcher: {str(e)}")
+                await asyncio.sleep(5)
+
+    async def dispatch(self, now):
+        jobs = await asyncio.to_thread(self._take_due, now)
+        if not jobs:
+            return
+        self.batches += 1
+
+        quote_jobs = []
+        ath_jobs = []
+        late = []
+        for job in jobs:
+            job_id, ca, column, due_at, attempts = job
+            if column not in SNAPSHOT_SCHEDULE:
+                late.append(job_id)
+                continue
+            field = SNAPSHOT_SCHEDULE[column][1]
+            if field is None:
+                ath_jobs.append(job)
+            elif now - due_at > self.max_lateness:
+                late.append(job_id)
+            else:
+                quote_jobs.append(job)
+        if late:
+            self.dropped_late += len(late)
+            print(f"Dropping {len(late)} snapshot jobs that are too late to be meaningful")
+
+        if ath_jobs:
+            # lease the rows so the dispatcher does not pick them up again while they run
+            await self.writer.executemany("UPDATE snapshot_jobs SET due_at = ? WHERE id = ?",
+                                          [(now + self.ath_lease, job[0]) for job in ath_jobs])
+            task = asyncio.create_task(self._ath_batch(ath_jobs))
+            self.ath_tasks.add(task)
+            task.add_done_callback(self.ath_tasks.discard)
+
+        results = await self._run_quote_jobs(quote_jobs)
+        await self._finish(quote_jobs, results, late)
+
+    async def _ath_batch(self, jobs):
+        try:
+            results = await self._run_ath_jobs(jobs)
+            await self._finish(jobs, results, [])
+        except Exception as e:
+            print(f"Error in 24h max snapshot batch: {str(e)}")
+
+    async def _run_quote_jobs(self, jobs):
+        """Snapshot values from one quote-engine flush for every CA in the batch"""
+        if not jobs:
+            return {}
+        cas = sorted({job[1] for job in jobs})
+        quotes = await asyncio.gather(*(self.quotes.quote(ca) for ca in cas))
+        by_ca = dict(zip(cas, quotes))
+
+        results = {}
+        for job_id, ca, column, _, _ in jobs:
+            quote = by_ca.get(ca)
+            value = quote[SNAPSHOT_SCHEDULE[column][1]] if quote else None
+            if value is None and column.startswith('vol_'):
+                # Birdeye batch quotes carry no volume, ask DexScreener for this one
+                dex_data = await self.dex.fetch_token_data_from_dex(ca)
+                value = dex_data.get('token_5m_vol', 0) if dex_data else None
+            results[job_id] = value
+        return results
+
+    async def _run_ath_jobs(self, jobs):
+        async def one(job):
+            job_id, ca = job[0], job[1]
+            async with self.ath_slots:
+                try:
+                    hr24_max_mc = await self.ath.get_ath(ca)
+                    if not hr24_max_mc:
+                        dex_data = await self.dex.fetch_token_data_from_dex(ca)
+                        pool_address = dex_data.get('pool_address') if dex_data else None
+                        if pool_address:
+                            hr24_max_mc = await self.bath.calculate_all_time_high(ca, pool_address)
+                    return job_id, hr24_max_mc
+                except Exception as e:
+                    print(f"Error fetching 24hr max price for {ca}: {str(e)}")
+                    return job_id, None
+        return dict(await asyncio.gather(*(one(job) for job in jobs)))
+
+    async def _finish(self, jobs, results, late):
+        writes = defaultdict(list)
+        done = list(late)
+        retry = []
+        for job_id, ca, column, _, attempts in jobs:
+            if job_id not in results:
+                continue
+            value = results[job_id]
+            if value is not None:
+                writes[column].append((value, ca))
+                done.append(job_id)
+                self.completed[column] += 1
+            elif attempts + 1 >= self.max_attempts:
+                print(f"Giving up on {column} for {ca} after {attempts + 1} attempts")
+                done.append(job_id)
+                self.failed[column] += 1
+            else:
+                retry.append((time.time() + self.retry_delay, job_id))
+
+        pending = []
+        for column, rows in writes.items():
+            # column names only ever come from SNAPSHOT_SCHEDULE
+            pending.append(self.writer.executemany(f"UPDATE multialerts SET {column} = ? WHERE ca = ?", rows))
+        if done:
+            pending.append(self.writer.executemany("DELETE FROM snapshot_jobs WHERE id = ?", [(job_id,) for job_id in done]))
+        if retry:
+            pending.append(self.writer.executemany("UPDATE snapshot_jobs SET due_at = ?, attempts = attempts + 1 WHERE id = ?", retry))
+        # the dispatcher reads due jobs again right after, so wait for these to land
+        await asyncio.gather(*pending)
+        for column, rows in writes.items():
+            print(f"Updated {column} for {len(rows)} tokens")
+
+    def stats(self):
+        return {
+            'pending': self.pending,
+            'ath_running': len(self.ath_tasks),
+            'batches': self.batches,
+            'completed': dict(self.completed),
+            'failed': dict(self.failed),
+            'dropped_late': self.dropped_late
+        }
@@ -7,11 +7,13 @@ from collections import defaultdict
 import pandas as pd
 from env import BIRDEYE_API_KEY
 import json
-from walletpnl import WalletPNL
+from walletservice import wallet_service
 from env import LARGE_BUY_WEBHOOK
 from webhooks import TradeWebhook
+from httpclient import http as shared_http
 class Trade_300:
-    def __init__(self):
+    def __init__(self, http=None):
+        self.http = http or shared_http
         self.c = CoinGeckoTerminal()
         self.hashes = set()
         self.wallets = set()
@@ -41,7 +43,7 @@ class Trade_300:
         }
         
         try:
-            async with aiohttp.ClientSession() as session:
+            async with self.http.session() as session:
                 async with session.get(url=url, headers=headers, params=params) as response:
                     if response.status == 200:
                         try:
@@ -267,15 +269,12 @@ class Trade_300:
 
 async def scan_trades(pair_address, token_name, token_ca, scan_interval):
     trader = Trade_300()
-    w = WalletPNL()
     webhook = TradeWebhook()
     iteration = 0
 
     # Initialize all tracking variables
     prev_hashes = set()
     prev_large_trades = set()
-    # Store PNL data for wallets we've already processed
-    wallet_pnl_cache = {}
     
     prev_metrics = {
         'total_trades': 0,
@@ -330,17 +329,8 @@ async def scan_trades(pair_address, token_name, token_ca, scan_interval):
                     new_buyers = [buy for buy in result['wallet_analysis']['large_trades']['large_buyers']
                                 if (buy['wallet'], buy['amount_sol']) in new_large_buys]
                     
-                    # First, get PNL for any new unique wallets
-                    for wallet in unique_new_wallets:
-                        if wallet not in wallet_pnl_cache:
-                            try:
-                                print(f"\nGetting PNL for new wallet: {wallet[:8]}...")
-                                pnl_result = await w.calculate_pnl(wallet)
-                                if pnl_result:
-                                    print(f"Got PNL Result for {wallet[:8]}: {pnl_result}")
-                                    wallet_pnl_cache[wallet] = pnl_result
-                            except Exception as e:
-                                print(f"Error getting PNL for {wallet[:8]}: {str(e)}")
+                    # First, get PNL for the new unique wallets (cached across scans and tokens)
+                    wallet_pnl_cache = await wallet_service.pnl_many(unique_new_wallets)
                     
                     # Then process all buys, using cached PNL data
                     for buy in new_buyers:
@@ -354,7 +344,7 @@ async def scan_trades(pair_address, token_name, token_ca, scan_interval):
                         }
 
                         # Use cached PNL data if available
-                        if wallet in wallet_pnl_cache:
+                        if wallet_pnl_cache.get(wallet):
                             buy_data['pnl_data'] = wallet_pnl_cache[wallet]
                         
                         new_buyers_with_pnl.append(buy_data)
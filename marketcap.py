@@ -4,56 +4,30 @@ import requests
 import json
 from typing import Dict, Any, Tuple
 from env import BIRDEYE_API_KEY
+from httpclient import http as shared_http
+from solanarpc import RpcBatcher, rpc as shared_rpc
 
 class MarketcapFetcher:
-    def __init__(self, rpc_endpoint: str = "https://api.mainnet-beta.solana.com"):
+    def __init__(self, rpc_endpoint: str = "https://api.mainnet-beta.solana.com", http=None):
+        self.http = http or shared_http
         self.rpc_endpoint = rpc_endpoint
+        self.rpc = shared_rpc if rpc_endpoint == shared_rpc.endpoint else RpcBatcher(endpoint=rpc_endpoint, http=self.http)
         self.gecko_base_url = "https://api.geckoterminal.com/api/v2/simple/networks"
         self.supply_backup = Supply()
         self.price = Price()
 
     async def get_token_supply(self, ca: str) -> float:
-        payload = {
-            "jsonrpc": "2.0", 
-            "id": 1,
-            "method": "getTokenSupply",
-            "params": [ca]
-        }
-        
         try:
             if not ca:
                 print("Invalid CA Not found, trying backup supply...")
                 return await self.supply_backup.supply(ca)
-                
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    self.rpc_endpoint,
-                    json=payload,
-                    headers={"Content-Type": "application/json"}
-                ) as response:
-                    if response.status != 200:
-                        print(f"RPC request failed with status: {response.status}, trying backup supply...")
-                        return await self.supply_backup.supply(ca)
-                        
-                    data = await response.json()
-                    
-                    if 'error' in data:
-                        print(f"RPC error: {data['error']}, trying backup supply...")
-                        return await self.supply_backup.supply(ca)
-                    
-                    if 'result' not in data:
-                        print(f"No result in RPC response: {data}, trying backup supply...")
-                        return await self.supply_backup.supply(ca)
-                        
-                    if 'value' not in data['result']:
-                        print(f"No value in RPC result: {data['result']}, trying backup supply...")
-                        return await self.supply_backup.supply(ca)
-                        
-                    data_supply = float(data['result']['value']['amount'])
-                    data_decimals = int(data['result']['value']['decimals'])
-                    supply = data_supply / (10 ** data_decimals)
-                    print(f"Got supply from RPC: {supply}")
-                    return supply
+
+            supply = await self.rpc.get_token_supply(ca)
+            if supply is None:
+                print(f"No supply from RPC, trying backup supply...")
+                return await self.supply_backup.supply(ca)
+            print(f"Got supply from RPC: {supply}")
+            return supply
 
         except Exception as e:
             print(f"Error fetching token supply: {str(e)}, trying backup supply...")
@@ -67,7 +41,7 @@ class MarketcapFetcher:
             "X-API-KEY": BIRDEYE_API_KEY
         }
         try:
-            async with aiohttp.ClientSession() as session:
+            async with self.http.session() as session:
                 async with session.get(url, headers=headers) as response:
                     if response.status != 200:
                         print(f"Birdeye request failed with status: {response.status}")
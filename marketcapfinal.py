@@ -4,67 +4,41 @@ import requests
 from env import BIRDEYE_API_KEY, SOLANA_TRACKER_API_KEY, MORALIS_API_KEY
 from dexapi import DexScreenerAPI
 from bdmetadata import Tokenomics
+from httpclient import http as shared_http
+from singleflight import coalesce
+from cache import cached
+from hedge import hedged
+from sourcerank import waterfall
+from solanarpc import rpc as shared_rpc
 
 class Supply:
-    def __init__(self):
-        self.rpc_endpoint = "https://api.mainnet-beta.solana.com"
+    def __init__(self, http=None, hedge_delay=0.5, rpc=None):
+        self.http = http or shared_http
+        self.rpc = rpc or shared_rpc
+        # seconds before the next source is raced against a slow one, None = strictly one after another
+        self.hedge_delay = hedge_delay
 
+    @coalesce("marketcapfinal", "supply")
     async def supply(self, ca):
         try:
-            funcs = [
-                self._rpc_supply,
-                self._sol_tracker_supply,
-                self._get_birdeye_supply
-
-            ]
-            for f in funcs:
-                try:
-                    supply = await f(ca=ca)
-                    if supply is not None:
-                        return supply
-                except Exception as e:
-                    continue
+            return await hedged("supply", [
+                ('solana_rpc', lambda: self._rpc_supply(ca=ca)),
+                ('solanatracker', lambda: self._sol_tracker_supply(ca=ca)),
+                ('birdeye', lambda: self._get_birdeye_supply(ca=ca)),
+            ], hedge_delay=self.hedge_delay)
         except Exception as e:
             print(f"Critical Error in Supply fetching: {str(e)}")
             return None
 
-            
-            
-        except Exception as e:
-            print(f"")
-
+    @cached("solana_rpc", "getTokenSupply")
     async def _rpc_supply(self, ca):
-        payload = {
-            "jsonrpc": "2.0", 
-            "id": 1,
-            "method": "getTokenSupply",
-            "params": [ca]
-        }
-        headers = {'accept': 'application/json'}
-        try:
-            if not ca:
-                print(f"Ca not passed to _rpc_supply function")
-                return
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    self.rpc_endpoint,
-                    json=payload,
-                    headers=headers
-                ) as response:
-                    if response.status != 200:
-                        print(f"RPC request failed in _rpc_supply function")
-                    data = await response.json()
-                    if 'error' in data or 'result' not in data or 'value' not in data.get('result', {}):
-                        print(f"Error in rpc response: Supply unfetchable (_rpc_supply function)")
-                        return None
-                    k = float(data['result']['value']['amount'])
-                    d = int(data['result']['value']['decimals'])
-                    supply = k / (10 ** d)
-                    return supply
-        except Exception as e:
-            print(f"Fatal Error in _rpc_supply func: {str(e)}")
+        if not ca:
+            print(f"Ca not passed to _rpc_supply function")
             return None
+        # batched with every other RPC call made in the same few milliseconds
+        return await self.rpc.get_token_supply(ca)
 
+    @cached("birdeye", "token_overview/supply")
     async def _get_birdeye_supply(self, ca):
         url = f"https://public-api.birdeye.so/defi/token_overview?address={ca}"
         headers = {
@@ -73,7 +47,7 @@ class Supply:
             "X-API-KEY": BIRDEYE_API_KEY
         }
         try:
-            async with aiohttp.ClientSession() as session:
+            async with self.http.session() as session:
                 async with session.get(url=url, headers=headers) as response:
                     if response.status == 200:
                             data = await response.json()
@@ -93,6 +67,7 @@ class Supply:
             print(f"Fatal Error in BD Supply: {str(e)}")
             return None
     
+    @cached("solanatracker", "tokens")
     async def _sol_tracker_supply(self, ca):
         try:
             url = f"https://data.solanatracker.io/tokens/{ca}"
@@ -100,7 +75,7 @@ class Supply:
                 'X-API-KEY': SOLANA_TRACKER_API_KEY
             }
             
-            async with aiohttp.ClientSession() as session:
+            async with self.http.session() as session:
                 async with session.get(url, headers=headers) as response:
                     if response.status == 200:
                         data = await response.json()
@@ -122,45 +97,39 @@ class Supply:
 
 
 class Price:
-    def __init__(self):
-        self.dex = DexScreenerAPI()
+    def __init__(self, http=None, hedge_delay=0.5):
+        self.http = http or shared_http
+        self.dex = DexScreenerAPI(http=self.http)
+        # seconds before the next source is raced against a slow one, None = strictly one after another
+        self.hedge_delay = hedge_delay
 
+    @coalesce("marketcapfinal", "price")
     async def price(self, ca):
         try:
-            funcs = [
-                self._cg_price,
-                self._dex_price,
-                self._bd_price_liquidity,
-            ]
-            
-            for f in funcs:
-                try:
-                    result = await f(ca=ca)
-                    
-                    if result is not None:
-                        if f == self._bd_price_liquidity:
-                            price, _ = result
-                            
-                            if isinstance(price, str):
-                                try:
-                                    price = float(price)
-                                except (ValueError, TypeError):
-                                    print(f"Failed to convert price string to float: {price}")
-                                    continue
-                            
-                            return price
-                        else:
-                            return result
-                except Exception as e:
-                    print(f"Error in {f.__name__}: {str(e)}")
-                    continue
-                    
-            print("All price sources failed")
-            return None
+            return await hedged("price", [
+                ('geckoterminal', lambda: self._cg_price(ca=ca)),
+                ('dexscreener', lambda: self._dex_price(ca=ca)),
+                ('birdeye', lambda: self._bd_price(ca=ca)),
+            ], hedge_delay=self.hedge_delay)
         except Exception as e:
             print(f"Critical Error in price fetch: {str(e)}")
             return None
 
+    async def _bd_price(self, ca):
+        """Birdeye price as a float, _bd_price_liquidity returns (price string, liquidity)"""
+        result = await self._bd_price_liquidity(ca=ca)
+        if result is None:
+            return None
+        price, _ = result
+        if isinstance(price, str):
+            try:
+                price = float(price)
+            except (ValueError, TypeError):
+                print(f"Failed to convert price string to float: {price}")
+                return None
+        return price
+
+    @cached("birdeye", "price")
     async def _bd_price_liquidity(self, ca):
         try:
             url = f"https://public-api.birdeye.so/defi/price"
@@ -173,7 +142,7 @@ class Price:
                 "include_liquidity": "true",
                 "address": ca
             }
-            async with aiohttp.ClientSession() as session:
+            async with self.http.session() as session:
                 async with session.get(url, headers=headers, params=params) as response:
                     data = await response.json()
                     if not data:
@@ -195,6 +164,7 @@ class Price:
             print(f"Fatal error in _bd_price_liquidity: {str(e)}")
             return None
 
+    @coalesce("dexscreener", "price")
     async def _dex_price(self, ca):
         try:
             d = await self.dex.fetch_token_data_from_dex(ca)
@@ -217,11 +187,12 @@ class Price:
             print(f"Error in _dex_price: {str(e)}")
             return None
     
+    @cached("geckoterminal", "token_price")
     async def _cg_price(self, ca):
         try:
             url = f'https://api.geckoterminal.com/api/v2/simple/networks/solana/token_price/{ca}'
             headers = {'accept': 'application/json'}
-            async with aiohttp.ClientSession() as session:
+            async with self.http.session() as session:
                 async with session.get(url, headers=headers) as response:
                     data = await response.json()
                     if not data or 'data' not in data:
@@ -245,28 +216,42 @@ class Price:
             return None
 
 class Marketcap:
-    def __init__(self):
-        self.dex = DexScreenerAPI()
-        self.s = Supply()
-        self.p = Price()
-        self.bdmd = Tokenomics()
+    def __init__(self, http=None):
+        self.http = http or shared_http
+        self.dex = DexScreenerAPI(http=self.http)
+        self.s = Supply(http=self.http)
+        self.p = Price(http=self.http)
+        self.bdmd = Tokenomics(http=self.http)
     
+    @coalesce("marketcapfinal", "marketcap")
     async def marketcap(self, ca):
         try:
-            d = await self.dex.fetch_token_data_from_dex(ca)
-            if d and d.get('token_mc', 0) > 0:
-                return d['token_mc']
-            s = await self.s.supply(ca)
-            p = await self.p.price(ca)
-            if s and p:
-                mc = s * p
-                if mc and mc > 5:
-                    return mc
-            bdmd = self.bdmd.process(ca)
-            if bdmd:
-                mc = bdmd.get('marketcap', 0)
-                if mc and mc > 0:
-                    return mc
-            
+            return await waterfall("marketcap", [
+                ('dexscreener', lambda: self._dex_marketcap(ca)),
+                ('supply_price', lambda: self._supply_price_marketcap(ca)),
+                ('birdeye', lambda: self._bd_marketcap(ca)),
+            ], valid=lambda mc: bool(mc) and mc > 0)
         except Exception as e:
-            print(f"Fatal Error in mc calculation")
\ No newline at end of file
+            print(f"Fatal Error in mc calculation")
+
+    async def _dex_marketcap(self, ca):
+        d = await self.dex.fetch_token_data_from_dex(ca)
+        if d and d.get('token_mc', 0) > 0:
+            return d['token_mc']
+        return None
+
+    async def _supply_price_marketcap(self, ca):
+        s, p = await asyncio.gather(self.s.supply(ca), self.p.price(ca))
+        if s and p:
+            mc = float(s) * p
+            if mc > 5:
+                return mc
+        return None
+
+    async def _bd_marketcap(self, ca):
+        bdmd = await self.bdmd.process(ca)
+        if bdmd:
+            mc = bdmd.get('marketcap', 0)
+            if mc and mc > 0:
+                return mc
+        return None
@@ -0,0 +1,132 @@
+import asyncio
+import hashlib
+import random
+import time
+from aiohttp import web
+from httpclient import HttpClient
+from ratelimit import RateLimiter
+from solanarpc import RpcBatcher
+
+
+class MockRpcServer:
+    """
+    Local stand-in for a Solana RPC node, for benchmarking offline.
+
+    Answers getTokenSupply, getMultipleAccounts and getTokenLargestAccounts,
+    single or as batch arrays, with made up but stable values per address.
+    Every HTTP request costs `latency` seconds (plus up to `jitter`), a batch
+    larger than max_batch is rejected the way public nodes do it.
+    """
+    def __init__(self, host="127.0.0.1", port=8899, latency=0.05, jitter=0.02, max_batch=100):
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.jitter = jitter
+        self.max_batch = max_batch
+        self.runner = None
+
+        self.http_requests = 0
+        self.rpc_calls = 0
+
+    @property
+    def url(self):
+        return f"http://{self.host}:{self.port}"
+
+    def _seed(self, address):
+        return int(hashlib.sha256(str(address).encode()).hexdigest()[:12], 16)
+
+    def _result(self, method, params):
+        if method == "getTokenSupply":
+            seed = self._seed(params[0])
+            decimals = 6 + seed % 4
+            amount = (10 ** 9 + seed % 10 ** 9) * 10 ** decimals
+            return {"context": {"slot": 1}, "value": {"amount": str(amount), "decimals": decimals,
+                                                      "uiAmount": amount / 10 ** decimals, "uiAmountString": str(amount / 10 ** decimals)}}
+        if method == "getMultipleAccounts":
+            return {"context": {"slot": 1}, "value": [
+                {"lamports": self._seed(key) % 10 ** 10, "owner": "11111111111111111111111111111111",
+                 "executable": False, "rentEpoch": 0, "data": ["", "base64"]}
+                for key in params[0]
+            ]}
+        if method == "getTokenLargestAccounts":
+            seed = self._seed(params[0])
+            accounts = []
+            for i in range(20):
+                amount = (seed % 10 ** 6 + 1) * (20 - i) * 10 ** 6
+                accounts.append({"address": f"{params[0][:16]}holder{i:02d}", "amount": str(amount), "decimals": 6,
+                                 "uiAmount": amount / 10 ** 6, "uiAmountString": str(amount / 10 ** 6)})
+            return {"context": {"slot": 1}, "value": accounts}
+        return None
+
+    def _answer(self, call):
+        self.rpc_calls += 1
+        method = call.get('method')
+        result = self._result(method, call.get('params') or [])
+        if result is None:
+            return {"jsonrpc": "2.0", "id": call.get('id'), "error": {"code": -32601, "message": f"Method not found: {method}"}}
+        return {"jsonrpc": "2.0", "id": call.get('id'), "result": result}
+
+    async def handle(self, request):
+        self.http_requests += 1
+        body = await request.json()
+        await asyncio.sleep(self.latency + random.uniform(0, self.jitter))
+        if isinstance(body, list):
+            if len(body) > self.max_batch:
+                return web.json_response({"jsonrpc": "2.0", "id": None,
+                                          "error": {"code": -32600, "message": f"Batch larger than {self.max_batch}"}})
+            return web.json_response([self._answer(call) for call in body])
+        return web.json_response(self._answer(body))
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_post("/", self.handle)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        await web.TCPSite(self.runner, self.host, self.port).start()
+
+    async def stop(self):
+        if self.runner is not None:
+            await self.runner.cleanup()
+
+
+class Main:
+    """Single POST per mint vs the batcher, both against the mock node"""
+    def __init__(self, mints=500, latency=0.05):
+        self.server = MockRpcServer(latency=latency)
+        # the mock is not a real provider, do not hold it to the public RPC rate
+        self.http = HttpClient(limiter=RateLimiter(rates={"127.0.0.1": (10000, 10000)}))
+        self.mints = [f"Mint{i:040d}" for i in range(mints)]
+
+    async def one_by_one(self, mint):
+        payload = {"jsonrpc": "2.0", "id": 1, "method": "getTokenSupply", "params": [mint]}
+        async with self.http.post(self.server.url, json=payload) as response:
+            data = await response.json()
+        value = data['result']['value']
+        return float(value['amount']) / (10 ** value['decimals'])
+
+    async def bench(self, name, call):
+        requests_before = self.server.http_requests
+        started = time.monotonic()
+        results = await asyncio.gather(*(call(mint) for mint in self.mints))
+        elapsed = time.monotonic() - started
+        found = sum(1 for result in results if result)
+        print(f"{name:<12} {len(self.mints)} mints in {elapsed:.2f}s ({len(self.mints) / elapsed:.0f}/s), "
+              f"{self.server.http_requests - requests_before} HTTP requests, {found} supplies")
+        return results
+
+    async def run(self):
+        await self.server.start()
+        try:
+            batcher = RpcBatcher(endpoint=self.server.url, http=self.http)
+            single = await self.bench("one-by-one", self.one_by_one)
+            batched = await self.bench("batched", batcher.get_token_supply)
+            print(f"results match: {single == batched}")
+            print(f"batcher: {batcher.stats()}")
+        finally:
+            await self.http.close()
+            await self.server.stop()
+
+
+if __name__ == "__main__":
+    main = Main()
+    asyncio.run(main.run())
@@ -0,0 +1,164 @@
+import time
+from collections import OrderedDict
+
+
+SWT_CHANNELS = ["Whale", "Smart", "Legend", "Kol Alpha", "Kol Regular", "Challenge", "High Freq", "Insider"]
+FRESH_CHANNELS = ["Fresh", "Fresh 5sol 1m MC", "Fresh 1h"]
+DEGEN_CHANNELS = ["Degen"]
+CHANNELS = SWT_CHANNELS + DEGEN_CHANNELS + FRESH_CHANNELS
+
+CHANNEL_BITS = {name: 1 << i for i, name in enumerate(CHANNELS)}
+
+
+def channel_mask(*names):
+    mask = 0
+    for name in names:
+        mask |= CHANNEL_BITS[name]
+    return mask
+
+
+class MultiAlertRule:
+    """
+    A rule is an AND of channel groups, each group an OR mask. It hits once every
+    group has a channel whose latest sighting is inside window_seconds.
+    """
+    def __init__(self, name, groups, window_seconds=24 * 3600):
+        self.name = name
+        self.groups = groups
+        self.required = 0
+        for group in groups:
+            self.required |= group
+        self.window_seconds = window_seconds
+
+
+# Fresh wallet buy AND (degen OR any SWT channel), same as the original set check
+DEFAULT_RULES = [
+    MultiAlertRule("fresh_and_swt_or_degen", [channel_mask(*FRESH_CHANNELS), channel_mask(*SWT_CHANNELS, *DEGEN_CHANNELS)]),
+]
+
+
+class MultiAlertDetector:
+    """
+    Tracks which channels each CA showed up in as one bitmask per CA.
+
+    CAs are interned to small integer ids (ids of expired CAs are reused), and
+    every observe() only touches that one CA's mask and timestamps, so the cost
+    per message does not grow with the number of CAs seen.
+    """
+    def __init__(self, rules=None, ttl_seconds=24 * 3600, max_cas=50000):
+        self.rules = rules or DEFAULT_RULES
+        self.ttl_seconds = ttl_seconds
+        self.max_cas = max_cas
+
+        self.ca_ids = {}
+        self.id_cas = []
+        self.free_ids = []
+        self.masks = []
+        self.channel_seen = []
+        # ca id -> last update, oldest first, drives expiry
+        self.last_seen = OrderedDict()
+
+        self.observed = 0
+        self.expired = 0
+        self.rule_hits = {rule.name: 0 for rule in self.rules}
+
+    def _key(self, ca):
+        return ca.strip().lower()
+
+    def _intern(self, ca):
+        key = self._key(ca)
+        ca_id = self.ca_ids.get(key)
+        if ca_id is not None:
+            return ca_id
+        if self.free_ids:
+            ca_id = self.free_ids.pop()
+            self.id_cas[ca_id] = key
+            self.masks[ca_id] = 0
+            self.channel_seen[ca_id] = [0.0] * len(CHANNELS)
+        else:
+            ca_id = len(self.id_cas)
+            self.id_cas.append(key)
+            self.masks.append(0)
+            self.channel_seen.append([0.0] * len(CHANNELS))
+        self.ca_ids[key] = ca_id
+        return ca_id
+
+    def _release(self, ca_id):
+        self.ca_ids.pop(self.id_cas[ca_id], None)
+        self.id_cas[ca_id] = None
+        self.masks[ca_id] = 0
+        self.free_ids.append(ca_id)
+        self.expired += 1
+
+    def _expire(self, now):
+        cutoff = now - self.ttl_seconds
+        while self.last_seen:
+            ca_id, seen_at = next(iter(self.last_seen.items()))
+            if seen_at >= cutoff and len(self.last_seen) <= self.max_cas:
+                break
+            self.last_seen.popitem(last=False)
+            self._release(ca_id)
+
+    def _rule_hit(self, rule, ca_id, now):
+        mask = self.masks[ca_id]
+        if mask & rule.required == 0:
+            return False
+        cutoff = now - rule.window_seconds
+        timestamps = self.channel_seen[ca_id]
+        for group in rule.groups:
+            hits = mask & group
+            if not hits:
+                return False
+            # walk the set bits of this group only, bounded by the channel count
+            in_window = False
+            while hits:
+                low_bit = hits & -hits
+                if timestamps[low_bit.bit_length() - 1] >= cutoff:
+                    in_window = True
+                    break
+                hits ^= low_bit
+            if not in_window:
+                return False
+        return True
+
+    def observe(self, ca, channel_name, timestamp=None):
+        """Record a sighting and return the names of the rules the CA now satisfies"""
+        bit = CHANNEL_BITS.get(channel_name)
+        if not ca or bit is None:
+            return []
+        now = timestamp or time.time()
+        self._expire(now)
+
+        ca_id = self._intern(ca)
+        self.masks[ca_id] |= bit
+        # latest sighting per channel, so a CA that stays active keeps matching the window
+        index = bit.bit_length() - 1
+        self.channel_seen[ca_id][index] = max(self.channel_seen[ca_id][index], now)
+        self.last_seen[ca_id] = now
+        self.last_seen.move_to_end(ca_id)
+        self.observed += 1
+
+        hits = []
+        for rule in self.rules:
+            if self._rule_hit(rule, ca_id, now):
+                self.rule_hits[rule.name] += 1
+                hits.append(rule.name)
+        return hits
+
+    def channels_for(self, ca):
+        """Channel names the CA has been seen in, inside the ttl"""
+        if not ca:
+            return []
+        ca_id = self.ca_ids.get(self._key(ca))
+        if ca_id is None:
+            return []
+        mask = self.masks[ca_id]
+        return [name for name, bit in CHANNEL_BITS.items() if mask & bit]
+
+    def stats(self):
+        return {
+            'cas': len(self.ca_ids),
+            'observed': self.observed,
+            'expired': self.expired,
+            'rule_hits': dict(self.rule_hits)
+        }
@@ -1,6 +1,8 @@
 from getohlcv import OH
 from supportresistance import SupportResistance
 import asyncio
+import time
+from collections import OrderedDict
 import pandas as pd
 import numpy as np
 import aiohttp
@@ -8,22 +10,68 @@ from webhooks import TradeWebhook
 from env import OB_WEBHOOK
 from datetime import datetime
 from marketcapfinal import Price, Supply, Marketcap
+from records import freeze
+
+
+class OrderBlockState:
+    """Order blocks found so far for one token plus the last analysis result"""
+    def __init__(self, ca):
+        self.ca = ca
+        self.active_obs = []
+        self.result = None
+        self.analyzed_at = None
+        self.touched_at = time.monotonic()
+        self.lock = asyncio.Lock()
+
 
 class OrderBlock:
-    def __init__(self):
+    def __init__(self, state_ttl=6 * 3600, max_states=2000):
         self.sr = SupportResistance()  # for helper methods import
         self.o = OH()
         self.timeframe = "1min"  
-        self.active_obs = []
         self.short_timeframes = ["1min", "5min", "10min"]  # Reduced set to avoid redundancy
         self.longer_timeframes = ["5min", "10min", "30min"]  # Reduced set to avoid redundancy
-        self.data_cache = {}  # Cache for OHLCV data
-        self.ob_cache = {}    # Cache for OB results
-        self.last_analysis_time = {}  # Track when we last analyzed each token
+        self.states = OrderedDict()  # ca -> OrderBlockState, least recently used first
+        # states untouched for state_ttl seconds, or past max_states, are dropped
+        self.state_ttl = state_ttl
+        self.max_states = max_states
         self.s = Supply()
         self.p = Price()
         self.mc = Marketcap()
-        
+
+    def _touch(self, state):
+        state.touched_at = time.monotonic()
+        self.states.move_to_end(state.ca)
+
+    def _evict(self):
+        now = time.monotonic()
+        while self.states:
+            state = next(iter(self.states.values()))
+            if len(self.states) <= self.max_states and now - state.touched_at < self.state_ttl:
+                break
+            self.states.popitem(last=False)
+
+    def state_for(self, ca):
+        state = self.states.get(ca)
+        if state is None:
+            state = OrderBlockState(ca)
+            self.states[ca] = state
+        self._touch(state)
+        self._evict()
+        return state
+
+    def drop_state(self, ca):
+        """Forget ca's order blocks, for when its monitor stops"""
+        self.states.pop(ca, None)
+
+    def active_obs_for(self, ca):
+        """Read-only view of the active order blocks for ca"""
+        state = self.states.get(ca)
+        if state is None:
+            return ()
+        self._touch(state)
+        return freeze(state.active_obs)
+
     async def mark_ob(self, ca, data, supply):
         """Analyze OHLCV data to identify order blocks"""
         try:
@@ -137,78 +185,55 @@ class OrderBlock:
             if not ca:
                 print(f"No CA available, using pair address as fallback: {pair_address}")
                 ca = pair_address
-                
-            # Use provided timeframes or fall back to defaults
-            _short_timeframes = short_timeframes or self.short_timeframes
-            _longer_timeframes = longer_timeframes or self.longer_timeframes
-                
-            # Create cache key - use pair_address if no token_name
-            cache_key = f"{pair_address}_{token_name if token_name else 'unknown'}"
-            
-            # Check if we've analyzed this recently (within 2 minutes)
-            current_time = datetime.now()
-            if cache_key in self.last_analysis_time:
-                time_diff = (current_time - self.last_analysis_time[cache_key]).total_seconds()
-                if time_diff < 120:  # 2 minutes
-                    if cache_key in self.ob_cache:
+
+            state = self.state_for(ca)
+            # one analysis per token at a time, different tokens run side by side
+            async with state.lock:
+                # Check if we've analyzed this recently (within 2 minutes)
+                current_time = datetime.now()
+                if state.analyzed_at and state.result is not None:
+                    time_diff = (current_time - state.analyzed_at).total_seconds()
+                    if time_diff < 120:  # 2 minutes
                         print(f"Using cached OB results for {token_name} (age: {time_diff:.0f}s)")
-                        return self.ob_cache[cache_key]
-            
-            # Process new order blocks
-            if hasattr(self, 'active_obs') and self.active_obs:
-                print(f"Processing potential new OBs for {token_name}")
-                
-                # Track new order blocks to add
-                new_obs = []
-                new_ob_found = False
-                
-                # Get the temporary OBs from timeframe selection
-                temp_result = None
-                for tf in _short_timeframes + _longer_timeframes:
-                    temp_key = f"{pair_address}_{tf}"
-                    if temp_key in self.ob_cache:
-                        temp_result = self.ob_cache[temp_key]
-                        break
-                        
-                if not temp_result:
-                    # If we don't have cached results, get them now
-                    temp_result = await self.mark_ob(ca=ca, data=data, supply=supply)
-                
-                if temp_result and temp_result.get('ob_count', 0) > 0:
-                    # Check each detected order block
-                    for i in range(temp_result['ob_count']):
-                        new_ob = {
-                            'top': temp_result['ob_top'][i],
-                            'bottom': temp_result['ob_bottom'][i],
-                            'volume': temp_result['ob_volume'][i],
-                            'strength': temp_result['ob_strength'][i],
-                            'time_found': datetime.now()
-                        }
-                        
-                        # Check if this is a duplicate of an existing order block
-                        is_duplicate = False
-                        for existing_ob in self.active_obs:
-                            # If top and bottom are within 1% of an existing OB, consider it a duplicate
-                            top_match = abs(existing_ob['top'] - new_ob['top']) / existing_ob['top'] < 0.01
-                            bottom_match = abs(existing_ob['bottom'] - new_ob['bottom']) / existing_ob['bottom'] < 0.01
+                        return state.result
+
+                result = await self.mark_ob(ca=ca, data=data, supply=supply)
+
+                # Process new order blocks
+                if state.active_obs:
+                    print(f"Processing potential new OBs for {token_name}")
+                    new_obs = []
+
+                    if result and result.get('ob_count', 0) > 0:
+                        # Check each detected order block
+                        for i in range(result['ob_count']):
+                            new_ob = {
+                                'top': result['ob_top'][i],
+                                'bottom': result['ob_bottom'][i],
+                                'volume': result['ob_volume'][i],
+                                'strength': result['ob_strength'][i],
+                                'time_found': datetime.now()
+                            }
                             
-                            if top_match and bottom_match:
-                                is_duplicate = True
-                                break
-                        
-                        # Only add if not a duplicate
-                        if not is_duplicate:
-                            new_obs.append(new_ob)
-                            new_ob_found = True
-                            print(f"New unique order block added: ${new_ob['bottom']:.2f} - ${new_ob['top']:.2f}")
-                    
-                    # Add new OBs to active list
-                    if new_obs:
-                        self.active_obs.extend(new_obs)
+                            # Check if this is a duplicate of an existing order block
+                            is_duplicate = False
+                            for existing_ob in state.active_obs:
+                                # If top and bottom are within 1% of an existing OB, consider it a duplicate
+                                top_match = abs(existing_ob['top'] - new_ob['top']) / existing_ob['top'] < 0.01
+                                bottom_match = abs(existing_ob['bottom'] - new_ob['bottom']) / existing_ob['bottom'] < 0.01
+                                
+                                if top_match and bottom_match:
+                                    is_duplicate = True
+                                    break
+                            
+                            # Only add if not a duplicate
+                            if not is_duplicate:
+                                new_obs.append(new_ob)
+                                print(f"New unique order block added: ${new_ob['bottom']:.2f} - ${new_ob['top']:.2f}")
                         
-                        # Only send webhook if new OBs were found
-                        if new_ob_found:
-                            # Prepare webhook data with only new OBs
+                        # Add new OBs to active list and only alert on those
+                        if new_obs:
+                            state.active_obs.extend(new_obs)
                             webhook_data = {
                                 'ob_top': [ob['top'] for ob in new_obs],
                                 'ob_bottom': [ob['bottom'] for ob in new_obs],
@@ -217,61 +242,53 @@ class OrderBlock:
                                 'ob_count': len(new_obs),
                             }
                             
-                            # Send webhook alert for new OBs
                             webhook = TradeWebhook()
                             await webhook.send_ob_webhook(OB_WEBHOOK, webhook_data, token_name, ca=ca)
                             print(f"Sent webhook for {len(new_obs)} new order blocks")
+                        else:
+                            print("No new unique order blocks found")
                     else:
-                        print("No new unique order blocks found")
+                        print("No order blocks found in this analysis")
                 else:
-                    # No OBs found, initialize if first run
-                    if not hasattr(self, 'active_obs') or self.active_obs is None:
-                        self.active_obs = []
-                    print("No order blocks found in this analysis")
-            else:
-                # First run, initialize active_obs from scratch
-                result = await self.mark_ob(ca=ca, data=data, supply=supply)
+                    # First run, initialize active_obs from scratch
+                    if result and result.get('ob_count', 0) > 0:
+                        state.active_obs = []
+                        for i in range(result['ob_count']):
+                            state.active_obs.append({
+                                'top': result['ob_top'][i],
+                                'bottom': result['ob_bottom'][i],
+                                'volume': result['ob_volume'][i],
+                                'strength': result['ob_strength'][i],
+                                'time_found': datetime.now()
+                            })
+                        
+                        print(f"Successfully found {len(state.active_obs)} initial order blocks")
+                        
+                        # Send webhook for initial OBs
+                        webhook_data = {
+                            'ob_top': result['ob_top'],
+                            'ob_bottom': result['ob_bottom'],
+                            'ob_volume': result['ob_volume'],
+                            'ob_strength': result['ob_strength'],
+                            'ob_count': result['ob_count'],
+                        }
+                        
+                        webhook = TradeWebhook()
+                        await webhook.send_ob_webhook(OB_WEBHOOK, webhook_data, token_name, ca=ca)
+                        print(f"Sent initial webhook for {result['ob_count']} order blocks")
+                    else:
+                        print("No initial order blocks found")
+                        state.active_obs = []
                 
-                if result and result.get('ob_count', 0) > 0:
-                    # Create initial OBs
-                    self.active_obs = []
-                    for i in range(result['ob_count']):
-                        self.active_obs.append({
-                            'top': result['ob_top'][i],
-                            'bottom': result['ob_bottom'][i],
-                            'volume': result['ob_volume'][i],
-                            'strength': result['ob_strength'][i],
-                            'time_found': datetime.now()
-                        })
-                    
-                    print(f"Successfully found {len(self.active_obs)} initial order blocks")
-                    
-                    # Send webhook for initial OBs
-                    webhook_data = {
-                        'ob_top': result['ob_top'],
-                        'ob_bottom': result['ob_bottom'],
-                        'ob_volume': result['ob_volume'],
-                        'ob_strength': result['ob_strength'],
-                        'ob_count': result['ob_count'],
-                    }
-                    
-                    webhook = TradeWebhook()
-                    await webhook.send_ob_webhook(OB_WEBHOOK, webhook_data, token_name, ca=ca)
-                    print(f"Sent initial webhook for {result['ob_count']} order blocks")
-                else:
-                    print("No initial order blocks found")
-                    self.active_obs = []
-            
-            # Cache the results and update timestamp
-            result_data = {
-                'active_obs': self.active_obs,
-                'ob_count': len(self.active_obs)
-            }
-            self.ob_cache[cache_key] = result_data
-            self.last_analysis_time[cache_key] = current_time
-            
-            # Return the complete OB data for multialert
-            return result_data
+                # Cache the results and update timestamp
+                state.result = freeze({
+                    'active_obs': state.active_obs,
+                    'ob_count': len(state.active_obs)
+                })
+                state.analyzed_at = current_time
+                
+                # Return the complete OB data for multialert
+                return state.result
             
         except Exception as e:
             print(f"Error in update_order_blocks: {str(e)}")
@@ -282,10 +299,11 @@ class OrderBlock:
     async def monitor_ob_entry(self, token_name, ca, pair_address, current_mc):
         """Check if current marketcap is in any active order block zones"""
         try:
-            if not self.active_obs:
+            active_obs = self.active_obs_for(ca)
+            if not active_obs:
                 return False
                 
-            for ob in self.active_obs:
+            for ob in active_obs:
                 ob_top = ob['top']
                 ob_bottom = ob['bottom']
                 
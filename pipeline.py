@@ -0,0 +1,216 @@
+import asyncio
+import copy
+import time
+from collections import deque
+from deadline import current_deadline
+
+
+class Stage:
+    """
+    One enrichment step. deps are stage names whose results are passed to func
+    as keyword arguments, after are stages that must finish first but whose
+    results are not needed.
+    """
+    def __init__(self, name, func, deps=(), after=(), timeout=None, default=None):
+        self.name = name
+        self.func = func
+        self.deps = tuple(deps)
+        self.after = tuple(after)
+        self.timeout = timeout
+        self.default = default
+
+
+class StageGraph:
+    """
+    Runs a set of stages as a dependency graph. Every stage starts as soon as
+    its dependencies are done, so independent stages overlap. A stage that
+    fails, times out or returns nothing resolves to its default, same as the
+    old `or default` chains, and never blocks its dependents.
+
+    run(deadline) bounds the whole graph: every stage timeout is cut down to
+    what is left of it, stages that would start after it has passed resolve
+    to their default straight away, and HTTP calls made inside the stages see
+    it as the current deadline.
+    """
+    def __init__(self, name=""):
+        self.name = name
+        self.stages = {}
+        self.timings = {}
+        self.started_at = None
+        self.total_ms = 0
+        self.deadline = None
+
+    def add(self, name, func, deps=(), after=(), timeout=None, default=None):
+        if name in self.stages:
+            raise ValueError(f"Duplicate stage: {name}")
+        self.stages[name] = Stage(name, func, deps, after, timeout, default)
+        return self
+
+    def _validate(self):
+        for stage in self.stages.values():
+            for dep in stage.deps + stage.after:
+                if dep not in self.stages:
+                    raise ValueError(f"Stage {stage.name} depends on unknown stage {dep}")
+        # detect cycles with a plain DFS
+        state = {}
+        def visit(name):
+            if state.get(name) == 1:
+                raise ValueError(f"Dependency cycle at stage {name}")
+            if state.get(name) == 2:
+                return
+            state[name] = 1
+            stage = self.stages[name]
+            for dep in stage.deps + stage.after:
+                visit(dep)
+            state[name] = 2
+        for name in self.stages:
+            visit(name)
+
+    def _default(self, stage):
+        return copy.deepcopy(stage.default)
+
+    async def _run_stage(self, stage, tasks):
+        waited = stage.deps + stage.after
+        if waited:
+            await asyncio.gather(*(tasks[dep] for dep in waited))
+        kwargs = {dep: tasks[dep].result() for dep in stage.deps}
+
+        start = time.monotonic()
+        status = "ok"
+        timeout = stage.timeout
+        if self.deadline is not None:
+            timeout = self.deadline.timeout(timeout)
+        try:
+            if timeout is not None and timeout <= 0:
+                status = "skipped"
+                result = self._default(stage)
+            elif timeout:
+                result = await asyncio.wait_for(stage.func(**kwargs), timeout=timeout)
+            else:
+                result = await stage.func(**kwargs)
+            if not result and status == "ok":
+                status = "empty"
+                result = self._default(stage)
+        except asyncio.TimeoutError:
+            print(f"Stage {stage.name} timed out after {timeout:.1f}s, using default")
+            status = "timeout"
+            result = self._default(stage)
+        except Exception as e:
+            print(f"Stage {stage.name} failed: {str(e)}, using default")
+            status = "error"
+            result = self._default(stage)
+
+        end = time.monotonic()
+        self.timings[stage.name] = {
+            'status': status,
+            'start_ms': (start - self.started_at) * 1000,
+            'duration_ms': (end - start) * 1000,
+            'end_ms': (end - self.started_at) * 1000
+        }
+        return result
+
+    async def run(self, deadline=None):
+        """Run every stage and return {stage name: result}"""
+        self._validate()
+        self.timings = {}
+        self.started_at = time.monotonic()
+        self.deadline = deadline
+
+        tasks = {}
+        # tasks copy the context when created, so the stages inherit the deadline
+        token = current_deadline.set(deadline) if deadline is not None else None
+        try:
+            for name, stage in self.stages.items():
+                tasks[name] = asyncio.ensure_future(self._run_stage(stage, tasks))
+        finally:
+            if token is not None:
+                current_deadline.reset(token)
+        await asyncio.gather(*tasks.values())
+
+        self.total_ms = (time.monotonic() - self.started_at) * 1000
+        return {name: task.result() for name, task in tasks.items()}
+
+    def critical_path(self):
+        """Chain of stages that determined the total run time"""
+        if not self.timings:
+            return []
+        path = []
+        name = max(self.timings, key=lambda n: self.timings[n]['end_ms'])
+        while name:
+            path.append(name)
+            stage = self.stages[name]
+            waited = [dep for dep in stage.deps + stage.after if dep in self.timings]
+            name = max(waited, key=lambda n: self.timings[n]['end_ms']) if waited else None
+        return list(reversed(path))
+
+    def print_timings(self):
+        budget = f", budget {self.deadline.budget:.0f}s" if self.deadline is not None else ""
+        print(f"\nStage timings{f' for {self.name}' if self.name else ''} (total {self.total_ms:.0f}ms{budget}):")
+        for name, timing in sorted(self.timings.items(), key=lambda item: item[1]['start_ms']):
+            print(f"  {name:<16} {timing['status']:<8} start={timing['start_ms']:>7.0f}ms took={timing['duration_ms']:>7.0f}ms")
+        print(f"  critical path: {' -> '.join(self.critical_path())}")
+
+
+class WorkerPool:
+    """
+    Bounded queue in front of a fixed number of workers. submit() never waits:
+    when the queue is full the job is dropped and counted, so producers (the
+    ingest consumers) never stall behind slow jobs.
+    """
+    def __init__(self, name, handler, workers=4, maxsize=50, wait_window=1000):
+        self.name = name
+        self.handler = handler
+        self.workers = workers
+        self.queue = asyncio.Queue(maxsize=maxsize)
+        self.waits = deque(maxlen=wait_window)
+        self.submitted = 0
+        self.dropped = 0
+        self.completed = 0
+        self.failed = 0
+        self.max_depth = 0
+        self.busy = 0
+
+    def submit(self, *args):
+        """Queue a job, returns False if it was dropped because the queue is full"""
+        try:
+            self.queue.put_nowait((time.monotonic(), args))
+        except asyncio.QueueFull:
+            self.dropped += 1
+            return False
+        self.submitted += 1
+        self.max_depth = max(self.max_depth, self.queue.qsize())
+        return True
+
+    async def _worker(self, worker_id):
+        while True:
+            queued_at, args = await self.queue.get()
+            self.waits.append(time.monotonic() - queued_at)
+            self.busy += 1
+            try:
+                await self.handler(*args)
+                self.completed += 1
+            except Exception as e:
+                self.failed += 1
+                print(f"Error in {self.name} worker {worker_id}: {str(e)}")
+            finally:
+                self.busy -= 1
+                self.queue.task_done()
+
+    async def run(self):
+        await asyncio.gather(*(self._worker(i) for i in range(self.workers)))
+
+    def stats(self):
+        ordered = sorted(self.waits)
+        return {
+            'name': self.name,
+            'workers': self.workers,
+            'busy': self.busy,
+            'depth': self.queue.qsize(),
+            'max_depth': self.max_depth,
+            'submitted': self.submitted,
+            'dropped': self.dropped,
+            'completed': self.completed,
+            'failed': self.failed,
+            'avg_wait_ms': sum(ordered) / len(ordered) * 1000 if ordered else 0,
+            'p95_wait_ms': ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000 if ordered else 0
+        }
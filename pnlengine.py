@@ -0,0 +1,347 @@
+import asyncio
+import contextlib
+import io
+import random
+import time
+import numpy as np
+import pandas as pd
+from walletpnl import WalletPNL
+
+
+WSOL_ADDRESS = "So11111111111111111111111111111111111111112"
+
+
+class PnLEngine:
+    """
+    Columnar version of WalletPNL.calculate_pnl.
+
+    The tx lists of every wallet are flattened into column arrays in a single
+    pass (one row per tx, one per SOL/token balance change), then swaps are
+    matched against the SOL legs of their tx with bincount, windowed to the
+    latest last_n swaps per token and reduced with groupby, so
+    the per-token spent/received/remaining/ROI and the win/loss counts of a
+    whole batch of wallets come out of a handful of array operations. Results
+    have the calculate_pnl shape (same memecoin filter, window and rounded PnL
+    dedupe).
+
+    score_swaps() takes the already parsed swaps of WalletTxStore.swaps()
+    instead of raw tx lists, which is how WalletService scores wallets. The
+    same last_n window applies there, so a wallet's PnL is defined one way
+    whether its history comes from Birdeye or the store.
+    """
+    def __init__(self, calculator=None, last_n=30):
+        self.calculator = calculator or WalletPNL()
+        self.last_n = last_n
+
+    def frames(self, responses):
+        """
+        (txs, changes) for {wallet: tx_list response}: one row per transaction
+        (wallet, signature, timestamp) and one per SOL or token balance change,
+        pointing back at its transaction by row number.
+        """
+        tx_wallet, tx_signature, tx_time, iso_times = [], [], [], {}
+        kept = []  # (tx row, balance change) for SOL and token legs
+        for wallet, response in responses.items():
+            for tx in ((response or {}).get('data') or {}).get('solana') or []:
+                signature = tx.get('txHash')
+                if not signature:
+                    continue
+                tx_id = len(tx_signature)
+                tx_wallet.append(wallet)
+                tx_signature.append(signature)
+                block_time = tx.get('blockTime', 0)
+                if isinstance(block_time, str):
+                    iso_times[tx_id] = block_time
+                    block_time = 0
+                tx_time.append(block_time or 0)
+                kept.extend((tx_id, change) for change in tx.get('balanceChange') or ()
+                            if 'tokenAccount' in change or change.get('address') == WSOL_ADDRESS)
+
+        timestamps = np.array(tx_time, dtype='int64')
+        if iso_times:
+            parsed = pd.to_datetime(pd.Series(iso_times), utc=True, errors='coerce', format='ISO8601')
+            seconds = ((parsed - pd.Timestamp(0, tz='UTC')) // pd.Timedelta(seconds=1)).fillna(0)
+            timestamps[seconds.index.to_numpy()] = seconds.to_numpy(dtype='int64')
+        txs = pd.DataFrame({'wallet': tx_wallet, 'signature': tx_signature, 'timestamp': timestamps})
+        changes = pd.DataFrame({
+            'tx': np.fromiter((tx_id for tx_id, _ in kept), dtype='int64', count=len(kept)),
+            'address': [change.get('address') for _, change in kept],
+            'token_account': np.fromiter(('tokenAccount' in change for _, change in kept), dtype=bool, count=len(kept)),
+            'amount': pd.to_numeric(pd.Series([change.get('amount', 0) for _, change in kept], dtype=object),
+                                    errors='coerce').fillna(0).to_numpy(dtype=float),
+            'decimals': pd.to_numeric(pd.Series([change.get('decimals') for _, change in kept], dtype=object),
+                                      errors='coerce').to_numpy(dtype=float),
+            'name': [change.get('name', "Unknown") for _, change in kept],
+            'symbol': [change.get('symbol', "Unknown") for _, change in kept]
+        })
+        return txs, changes
+
+    def swaps_frame(self, txs, changes):
+        """Valid memecoin swaps, one row per (tx, token), same rules as process_tx_history_from_response"""
+        tx_ids = changes['tx'].to_numpy()
+        is_sol = (changes['address'] == WSOL_ADDRESS).to_numpy()
+        decimals = changes['decimals'].to_numpy()
+        decimals = np.where(np.isnan(decimals), np.where(is_sol, 9, 6), decimals)
+        amounts = changes['amount'].to_numpy() / np.power(10.0, decimals)
+
+        # SOL legs summed per transaction
+        sol = np.bincount(tx_ids[is_sol], weights=amounts[is_sol], minlength=len(txs))
+        has_sol = np.bincount(tx_ids[is_sol], minlength=len(txs)) > 0
+        in_range = txs['timestamp'].to_numpy() >= self.calculator.min_timestamp
+
+        is_token = ~is_sol & changes['token_account'].to_numpy() & in_range[tx_ids]
+        tokens = pd.DataFrame({
+            'wallet': txs['wallet'].to_numpy()[tx_ids[is_token]],
+            'pos': np.flatnonzero(is_token),
+            'tx': tx_ids[is_token],
+            'ca': changes['address'].to_numpy()[is_token],
+            'name': changes['name'].to_numpy()[is_token],
+            'symbol': changes['symbol'].to_numpy()[is_token],
+            'amount': amounts[is_token]
+        })
+
+        # memecoin check once per token, on the name/symbol it was first seen with
+        first_seen = tokens.drop_duplicates(['wallet', 'ca'])
+        memecoins = first_seen[[self.calculator.is_memecoin(ca, name, symbol) for ca, name, symbol in
+                                zip(first_seen['ca'], first_seen['name'], first_seen['symbol'])]]
+        tokens = tokens.merge(memecoins[['wallet', 'ca']], on=['wallet', 'ca'], sort=False)
+
+        tx = tokens['tx'].to_numpy()
+        token_amount = tokens['amount'].to_numpy()
+        sol_amount = sol[tx]
+        buy = token_amount > 0
+        valid = has_sol[tx] & ((buy & (sol_amount < 0)) | (~buy & (sol_amount > 0)))
+        tokens = tokens[valid]
+        return pd.DataFrame({
+            'wallet': tokens['wallet'].to_numpy(),
+            'pos': tokens['pos'].to_numpy(),
+            'signature': txs['signature'].to_numpy()[tx[valid]],
+            'timestamp': txs['timestamp'].to_numpy()[tx[valid]],
+            'ca': tokens['ca'].to_numpy(),
+            'name': tokens['name'].to_numpy(),
+            'symbol': tokens['symbol'].to_numpy(),
+            'buy': buy[valid],
+            'sol_amount': np.abs(sol_amount[valid]),
+            'token_amount': np.abs(token_amount[valid])
+        })
+
+    def first_seen(self, txs, changes):
+        """Position of each (wallet, token) in the raw history, the order calculate_pnl walks tokens in"""
+        is_token = (changes['token_account'] & (changes['address'] != WSOL_ADDRESS)).to_numpy()
+        return pd.DataFrame({
+            'wallet': txs['wallet'].to_numpy()[changes['tx'].to_numpy()[is_token]],
+            'ca': changes['address'].to_numpy()[is_token],
+            'first_pos': np.flatnonzero(is_token)
+        }).drop_duplicates(['wallet', 'ca']).set_index(['wallet', 'ca'])['first_pos']
+
+    def token_table(self, swaps, order):
+        """Per (wallet, token) totals over the latest last_n swaps, sorted by order, rounded PnL dupes dropped"""
+        # newest first within each token, ties keep the order Birdeye returned them in
+        window = swaps.sort_values(['wallet', 'ca', 'timestamp', 'pos'], ascending=[True, True, False, True], kind='mergesort')
+        window = window[window.groupby(['wallet', 'ca'], sort=False).cumcount() < self.last_n]
+        buy = window['buy'].to_numpy()
+        window = window.assign(
+            bought=np.where(buy, window['token_amount'], 0.0),
+            sold=np.where(buy, 0.0, window['token_amount']),
+            spent=np.where(buy, window['sol_amount'], 0.0),
+            received=np.where(buy, 0.0, window['sol_amount'])
+        )
+        tokens = window.groupby(['wallet', 'ca'], sort=False).agg(
+            name=('name', 'last'),  # oldest swap in the window, like calculate_pnl
+            symbol=('symbol', 'last'),
+            total_bought=('bought', 'sum'),
+            total_sold=('sold', 'sum'),
+            sol_spent=('spent', 'sum'),
+            sol_received=('received', 'sum'),
+            tx_count=('signature', 'size')
+        )
+        tokens['pnl'] = tokens['sol_received'] - tokens['sol_spent']
+        spent = tokens['sol_spent'].to_numpy()
+        tokens['roi_percent'] = np.divide(tokens['pnl'].to_numpy(), spent, out=np.zeros(len(tokens)), where=spent > 0) * 100
+        tokens['remaining'] = tokens['total_bought'] - tokens['total_sold']
+
+        # the dedupe keeps the first token of each rounded PnL, so the order matters
+        tokens = tokens.join(order.rename('first_pos')).sort_values('first_pos', kind='mergesort')
+        tokens['rounded'] = tokens['pnl'].round(6)
+        tokens = tokens[~tokens.reset_index().duplicated(['wallet', 'rounded']).to_numpy()]
+        return tokens.drop(columns=['first_pos', 'rounded'])
+
+    def score_many(self, responses):
+        """{wallet: calculate_pnl shaped result} for {wallet: tx_list response}, one pass for the whole batch"""
+        try:
+            txs, changes = self.frames(responses)
+            swaps = self.swaps_frame(txs, changes)
+            if swaps.empty:
+                return self._results(responses, None)
+            return self._results(responses, self.token_table(swaps, self.first_seen(txs, changes)))
+        except Exception as e:
+            print(f"Error in score_many: {str(e)}")
+            return None
+
+    def score_swaps(self, stored):
+        """{wallet: calculate_pnl shaped result} for {wallet: WalletTxStore.swaps() list}, one pass for the batch"""
+        try:
+            rows = [(wallet, pos, swap) for wallet, swaps in stored.items() for pos, swap in enumerate(swaps or ())]
+            if not rows:
+                return self._results(stored, None)
+            swaps = pd.DataFrame({
+                'wallet': [wallet for wallet, _, _ in rows],
+                'pos': np.fromiter((pos for _, pos, _ in rows), dtype='int64', count=len(rows)),
+                'signature': [swap['hash'] for _, _, swap in rows],
+                'timestamp': np.fromiter((swap['timestamp'] for _, _, swap in rows), dtype='int64', count=len(rows)),
+                'ca': [swap['token_ca'] for _, _, swap in rows],
+                'name': [swap['token_name'] for _, _, swap in rows],
+                'symbol': [swap['token_symbol'] for _, _, swap in rows],
+                'buy': np.fromiter((swap['tx_type'] == 'Buy' for _, _, swap in rows), dtype=bool, count=len(rows)),
+                'sol_amount': np.fromiter((swap['sol_amount'] for _, _, swap in rows), dtype=float, count=len(rows)),
+                'token_amount': np.fromiter((swap['token_amount'] for _, _, swap in rows), dtype=float, count=len(rows))
+            })
+            # raw history is newest first, so calculate_pnl meets the most recently traded token first
+            order = -swaps.groupby(['wallet', 'ca'], sort=False)['timestamp'].max()
+            return self._results(stored, self.token_table(swaps, order))
+        except Exception as e:
+            print(f"Error in score_swaps: {str(e)}")
+            return None
+
+    def _results(self, wallets, tokens):
+        results = {}
+        for wallet in wallets:
+            results[wallet] = {
+                'pnl': 0,
+                'tokens_traded': 0,
+                'trades_won': 0,
+                'trades_loss': 0,
+                'average_entry_per_trade': 0
+            }
+        if tokens is None or tokens.empty:
+            return results
+
+        pnl = tokens['pnl']
+        totals = tokens.assign(win=pnl > 0, loss=pnl < 0).groupby(level='wallet', sort=False).agg(
+            pnl=('pnl', 'sum'),
+            sol_spent=('sol_spent', 'sum'),
+            tokens_traded=('pnl', 'size'),
+            trades=('tx_count', 'sum'),
+            trades_won=('win', 'sum'),
+            trades_loss=('loss', 'sum')
+        )
+        detail_columns = ['name', 'symbol', 'total_bought', 'total_sold', 'sol_spent', 'sol_received', 'pnl',
+                          'roi_percent', 'tx_count', 'remaining']
+        details = {wallet: group.droplevel('wallet')[detail_columns].to_dict('index')
+                   for wallet, group in tokens.groupby(level='wallet', sort=False)}
+        for wallet, row in totals.iterrows():
+            results[wallet] = {
+                'pnl': float(row['pnl']),
+                'tokens_traded': int(row['tokens_traded']),
+                'trades_won': int(row['trades_won']),
+                'trades_loss': int(row['trades_loss']),
+                'average_entry_per_trade': row['sol_spent'] / row['trades'] if row['trades'] > 0 else 0,
+                'overall_roi': row['pnl'] / row['sol_spent'] * 100 if row['sol_spent'] > 0 else 0,
+                'token_details': details.get(wallet, {})
+            }
+        return results
+
+    def score(self, wallet, response):
+        results = self.score_many({wallet: response})
+        return results.get(wallet) if results else None
+
+    async def pnl_many(self, wallets):
+        """Fetch every wallet's tx list side by side, then score them in one batch"""
+        wallets = list(dict.fromkeys(wallets))
+        responses = await asyncio.gather(*(self.calculator.get_tx_history(wallet) for wallet in wallets))
+        return self.score_many({wallet: response for wallet, response in zip(wallets, responses) if response})
+
+
+# shared so the memecoin check and window settings match everywhere
+pnl_engine = PnLEngine()
+
+
+class FixturePNL(WalletPNL):
+    """WalletPNL answering get_tx_history from in-memory fixtures"""
+    def __init__(self, fixtures):
+        super().__init__()
+        self.fixtures = fixtures
+
+    async def get_tx_history(self, wallet_address, limit=100, before=None):
+        return self.fixtures.get(wallet_address)
+
+
+class Main:
+    """calculate_pnl per wallet vs the engine's batch call, on synthetic Birdeye tx lists"""
+    def __init__(self, wallets=10, txs_per_wallet=1000, tokens_per_wallet=60, seed=7):
+        self.rng = random.Random(seed)
+        self.fixtures = {f"Wallet{i:036d}": self.fixture(txs_per_wallet, tokens_per_wallet) for i in range(wallets)}
+        self.fixtures[f"Whale{0:037d}"] = self.fixture(10000, 300)
+
+    def fixture(self, count, token_count):
+        tokens = [(f"Mint{self.rng.getrandbits(64):032x}{'pump' if i % 3 else 'xyz'}", f"Token {i}", f"TK{i}")
+                  for i in range(token_count)]
+        started = 1700000000
+        txs = []
+        for i in range(count):
+            ca, name, symbol = self.rng.choice(tokens)
+            buy = self.rng.random() < 0.55
+            sol = self.rng.uniform(0.05, 5)
+            amount = self.rng.uniform(1e3, 1e7)
+            block_time = started + i * 30
+            txs.append({
+                'txHash': f"sig{self.rng.getrandbits(96):024x}",
+                'blockTime': time.strftime('%Y-%m-%dT%H:%M:%S+00:00', time.gmtime(block_time)) if i % 2 else block_time,
+                'balanceChange': [
+                    {'address': WSOL_ADDRESS, 'amount': int((-sol if buy else sol) * 1e9), 'decimals': 9},
+                    {'address': ca, 'tokenAccount': f"acct{i}", 'amount': int((amount if buy else -amount) * 1e6),
+                     'decimals': 6, 'name': name, 'symbol': symbol}
+                ]
+            })
+        txs.reverse()  # Birdeye returns newest first
+        return {'success': True, 'data': {'solana': txs}}
+
+    def matches(self, old, new):
+        if old is None or new is None:
+            return old is new
+        if set(old.get('token_details', {})) != set(new.get('token_details', {})):
+            return False
+        return all(abs(old[key] - new[key]) < 1e-6 for key in ('pnl', 'tokens_traded', 'trades_won', 'trades_loss'))
+
+    async def best(self, call, repeat):
+        """(result, best wall time) over repeat runs"""
+        best_time = None
+        for _ in range(repeat):
+            started = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):  # calculate_pnl is chatty
+                result = await call()
+            elapsed = time.perf_counter() - started
+            best_time = elapsed if best_time is None else min(best_time, elapsed)
+        return result, best_time
+
+    async def run(self, repeat=5):
+        total_txs = sum(len(fixture['data']['solana']) for fixture in self.fixtures.values())
+        calculator = FixturePNL(self.fixtures)
+        engine = PnLEngine(calculator=calculator)
+
+        async def current_path():
+            return {wallet: await calculator.calculate_pnl(wallet) for wallet in self.fixtures}
+
+        async def whale_current():
+            return await calculator.calculate_pnl(whale)
+
+        async def whale_engine():
+            return engine.score(whale, self.fixtures[whale])
+
+        whale = next(wallet for wallet in self.fixtures if wallet.startswith("Whale"))
+        current, current_time = await self.best(current_path, repeat)
+        batched, batched_time = await self.best(lambda: engine.pnl_many(self.fixtures), repeat)
+        _, whale_current_time = await self.best(whale_current, repeat)
+        _, whale_engine_time = await self.best(whale_engine, repeat)
+
+        print(f"{len(self.fixtures)} wallets, {total_txs} txs, best of {repeat}")
+        print(f"calculate_pnl   {current_time * 1000:.0f}ms ({total_txs / current_time:.0f} tx/s)")
+        print(f"engine (batch)  {batched_time * 1000:.0f}ms ({total_txs / batched_time:.0f} tx/s)")
+        print(f"10k tx wallet   calculate_pnl {whale_current_time * 1000:.0f}ms, engine {whale_engine_time * 1000:.0f}ms")
+        mismatched = [wallet for wallet in self.fixtures if not self.matches(current[wallet], batched.get(wallet))]
+        print(f"results match: {not mismatched}" + (f" ({len(mismatched)} wallets differ)" if mismatched else ""))
+
+
+if __name__ == "__main__":
+    main = Main()
+    asyncio.run(main.run())
@@ -0,0 +1,331 @@
+import asyncio
+import itertools
+import time
+from collections import defaultdict
+from env import BIRDEYE_API_KEY
+from httpclient import http as shared_http
+from marketcapfinal import Supply, Marketcap
+from records import freeze
+
+
+def chunked(items, size):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+class QuoteEngine:
+    """
+    One place every marketcap/price monitor gets its quotes from.
+
+    Monitors ask for a CA with quote()/marketcap(); the CA is then tracked and
+    every tracked CA is refreshed together once per refresh interval using the
+    multi-address endpoints (DexScreener tokens, 30 per call, then Birdeye
+    multi_price, 100 per call, for whatever DexScreener did not know). So a
+    tick costs ceil(N / chunk) requests instead of one request per CA. CAs
+    nobody asked about for idle_ttl seconds are dropped.
+
+    It is also the market-data ticker: long-lived consumers (2x checker,
+    interval recorders, entry monitor) subscribe() a callback or iterate
+    stream() and get every new snapshot for their CA, instead of each running
+    its own polling loop. Snapshots are handed over through a per-subscriber
+    queue (a callback runs in its own task), so the refresh never waits on a
+    subscriber's I/O. Subscribed CAs stay tracked until unsubscribed.
+    """
+    def __init__(self, http=None, refresh_interval=30, flush_interval=1.0, idle_ttl=600,
+                 dex_chunk=30, birdeye_chunk=100, wait_timeout=30):
+        self.http = http or shared_http
+        self.supply = Supply(http=self.http)
+        self.mc = Marketcap(http=self.http)
+        self.refresh_interval = refresh_interval
+        self.flush_interval = flush_interval
+        self.idle_ttl = idle_ttl
+        self.dex_chunk = dex_chunk
+        self.birdeye_chunk = birdeye_chunk
+        self.wait_timeout = wait_timeout
+
+        self.quotes = {}  # ca -> latest quote record
+        self.tracked = {}  # ca -> last time someone asked for it
+        self.waiters = defaultdict(list)  # ca -> futures waiting for its first/next quote
+        self.attempted = {}  # ca -> last refresh that included it, found or not
+        self.subscribers = defaultdict(dict)  # ca -> {subscription id: queue of new quotes}
+        self.workers = {}  # subscription id -> task feeding its callback
+        self._ids = itertools.count(1)
+        self.last_refresh = 0.0
+        self._task = None
+        self._loop = None
+
+        self.ticks = 0
+        self.requests = defaultdict(int)
+        self.quoted = 0
+        self.fallbacks = 0
+        self.published = 0
+        self.dropped = 0
+        self.callback_errors = 0
+
+    def _ensure_running(self):
+        loop = asyncio.get_running_loop()
+        if self._task is None or self._task.done() or self._loop is not loop:
+            self._task = loop.create_task(self.run())
+            self._loop = loop
+
+    def _fresh(self, ca, now):
+        quote = self.quotes.get(ca)
+        return quote is not None and now - quote['updated_at'] < self.refresh_interval
+
+    async def quote(self, ca):
+        """Latest quote for ca ({price, marketcap, liquidity, m5_vol, source, updated_at, timestamp}) or None"""
+        self._ensure_running()
+        now = time.monotonic()
+        self.tracked[ca] = now
+        if self._fresh(ca, now):
+            return self.quotes[ca]
+        future = asyncio.get_running_loop().create_future()
+        self.waiters[ca].append(future)
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), timeout=self.wait_timeout)
+        except asyncio.TimeoutError:
+            print(f"Quote for {ca[:8]}... timed out")
+            return self.quotes.get(ca)
+
+    async def marketcap(self, ca):
+        quote = await self.quote(ca)
+        return quote['marketcap'] if quote else None
+
+    async def price(self, ca):
+        quote = await self.quote(ca)
+        return quote['price'] if quote else None
+
+    def _due(self, ca, now):
+        if self._fresh(ca, now):
+            return False
+        # CAs no source could quote wait for the next refresh tick instead of retrying every flush
+        attempted = self.attempted.get(ca)
+        return attempted is None or now - attempted >= self.refresh_interval
+
+    def latest(self, ca):
+        """Last snapshot for ca without waiting, None if it has never been quoted"""
+        return self.quotes.get(ca)
+
+    def _add_queue(self, ca, queue):
+        self._ensure_running()
+        subscription_id = next(self._ids)
+        self.subscribers[ca][subscription_id] = queue
+        self.tracked[ca] = time.monotonic()
+        return subscription_id
+
+    def subscribe(self, ca, callback, backlog=16):
+        """
+        Call `await callback(quote)` on every new snapshot for ca, one at a time
+        from the subscriber's own task; past `backlog` pending snapshots the
+        oldest are dropped. Returns the id for unsubscribe().
+        """
+        queue = asyncio.Queue(maxsize=backlog)
+        subscription_id = self._add_queue(ca, queue)
+        self.workers[subscription_id] = asyncio.get_running_loop().create_task(
+            self._consume(ca, subscription_id, queue, callback))
+        return subscription_id
+
+    async def _consume(self, ca, subscription_id, queue, callback):
+        while subscription_id in self.subscribers.get(ca, {}):
+            quote = await queue.get()
+            try:
+                await callback(quote)
+            except Exception as e:
+                self.callback_errors += 1
+                print(f"Error in quote subscriber {subscription_id} for {ca[:8]}...: {str(e)}")
+
+    def unsubscribe(self, ca, subscription_id):
+        worker = self.workers.pop(subscription_id, None)
+        # a callback unsubscribing itself just lets its loop end
+        if worker is not None and worker is not asyncio.current_task():
+            worker.cancel()
+        queues = self.subscribers.get(ca)
+        if queues is None:
+            return
+        queues.pop(subscription_id, None)
+        if not queues:
+            del self.subscribers[ca]
+
+    async def stream(self, ca):
+        """Async iterator over new snapshots for ca; a slow reader only ever sees the newest one"""
+        queue = asyncio.Queue(maxsize=1)
+        subscription_id = self._add_queue(ca, queue)
+        try:
+            while True:
+                yield await queue.get()
+        finally:
+            self.unsubscribe(ca, subscription_id)
+
+    def _publish(self, ca, quote):
+        """Queue quote for every subscriber of ca without waiting on any of them"""
+        for queue in self.subscribers.get(ca, {}).values():
+            if queue.full():
+                queue.get_nowait()
+                self.dropped += 1
+            queue.put_nowait(quote)
+            self.published += 1
+
+    def untrack(self, ca):
+        self.tracked.pop(ca, None)
+        self.quotes.pop(ca, None)
+        self.attempted.pop(ca, None)
+
+    async def run(self):
+        while True:
+            try:
+                await self.tick()
+            except Exception as e:
+                print(f"Error in quote engine tick: {str(e)}")
+            await asyncio.sleep(self.flush_interval)
+
+    async def tick(self):
+        now = time.monotonic()
+        for ca, asked_at in list(self.tracked.items()):
+            if now - asked_at > self.idle_ttl and ca not in self.subscribers:
+                self.untrack(ca)
+
+        # every tracked CA on the refresh tick, in between only CAs somebody is waiting on
+        if now - self.last_refresh >= self.refresh_interval:
+            due = set(self.tracked)
+            self.last_refresh = now
+        else:
+            due = {ca for ca in self.waiters if self._due(ca, now)}
+        waiting = {ca: self.waiters.pop(ca) for ca in list(self.waiters)}
+        if not due and not waiting:
+            return
+
+        self.ticks += 1
+        try:
+            if due:
+                await self.refresh(sorted(due))
+        finally:
+            for ca, futures in waiting.items():
+                for future in futures:
+                    if not future.done():
+                        future.set_result(self.quotes.get(ca))
+
+    async def refresh(self, cas):
+        """Quote every ca in as few requests as possible"""
+        started = time.monotonic()
+        for ca in cas:
+            self.attempted[ca] = started
+        found = {}
+        results = await asyncio.gather(*(self._dex_quotes(chunk) for chunk in chunked(cas, self.dex_chunk)))
+        for result in results:
+            found.update(result)
+
+        missing = [ca for ca in cas if ca not in found]
+        if missing:
+            results = await asyncio.gather(*(self._birdeye_quotes(chunk) for chunk in chunked(missing, self.birdeye_chunk)))
+            for result in results:
+                found.update(result)
+
+        # last resort for the few CAs neither batch endpoint knows
+        missing = [ca for ca in cas if ca not in found]
+        if missing:
+            self.fallbacks += len(missing)
+            marketcaps = await asyncio.gather(*(self.mc.marketcap(ca) for ca in missing))
+            for ca, marketcap in zip(missing, marketcaps):
+                if marketcap:
+                    found[ca] = {'price': None, 'marketcap': marketcap, 'liquidity': None, 'm5_vol': None, 'source': 'marketcap'}
+
+        now = time.monotonic()
+        timestamp = time.time()
+        for ca, quote in found.items():
+            quote['ca'] = ca
+            quote['updated_at'] = now
+            quote['timestamp'] = timestamp
+            self.quotes[ca] = freeze(quote)
+        self.quoted += len(found)
+
+        for ca in found:
+            if ca in self.subscribers:
+                self._publish(ca, self.quotes[ca])
+
+    async def _dex_quotes(self, cas):
+        url = f"https://api.dexscreener.com/latest/dex/tokens/{','.join(cas)}"
+        wanted = set(cas)
+        quotes = {}
+        try:
+            self.requests['dexscreener'] += 1
+            async with self.http.get(url) as response:
+                if response.status != 200:
+                    print(f"DexScreener tokens returned status {response.status}")
+                    return {}
+                data = await response.json()
+            for pair in (data or {}).get('pairs') or []:
+                ca = pair.get('baseToken', {}).get('address')
+                if ca not in wanted:
+                    continue
+                liquidity = float((pair.get('liquidity') or {}).get('usd', 0) or 0)
+                # keep the deepest pool per token
+                if ca in quotes and quotes[ca]['liquidity'] >= liquidity:
+                    continue
+                quotes[ca] = {
+                    'price': float(pair.get('priceUsd') or 0),
+                    'marketcap': float(pair.get('fdv') or 0),
+                    'liquidity': liquidity,
+                    'm5_vol': float((pair.get('volume') or {}).get('m5', 0) or 0),
+                    'source': 'dexscreener'
+                }
+            return {ca: quote for ca, quote in quotes.items() if quote['marketcap'] > 0}
+        except Exception as e:
+            print(f"Error in _dex_quotes: {str(e)}")
+            return {}
+
+    async def _birdeye_quotes(self, cas):
+        url = "https://public-api.birdeye.so/defi/multi_price"
+        headers = {
+            "accept": "application/json",
+            "x-chain": "solana",
+            "X-API-KEY": BIRDEYE_API_KEY
+        }
+        params = {
+            "list_address": ','.join(cas),
+            "include_liquidity": "true"
+        }
+        try:
+            self.requests['birdeye'] += 1
+            async with self.http.get(url, headers=headers, params=params) as response:
+                if response.status != 200:
+                    print(f"Birdeye multi_price returned status {response.status}")
+                    return {}
+                data = await response.json()
+            if not data or not data.get('success'):
+                return {}
+            prices = {ca: item for ca, item in (data.get('data') or {}).items() if item and item.get('value')}
+            # supply is cached per CA, so this only hits the network for new tokens
+            supplies = await asyncio.gather(*(self.supply.supply(ca) for ca in prices))
+            quotes = {}
+            for (ca, item), supply in zip(prices.items(), supplies):
+                if not supply:
+                    continue
+                price = float(item['value'])
+                quotes[ca] = {
+                    'price': price,
+                    'marketcap': price * float(supply),
+                    'liquidity': item.get('liquidity'),
+                    'm5_vol': None,
+                    'source': 'birdeye'
+                }
+            return quotes
+        except Exception as e:
+            print(f"Error in _birdeye_quotes: {str(e)}")
+            return {}
+
+    def stats(self):
+        return {
+            'tracked': len(self.tracked),
+            'ticks': self.ticks,
+            'quoted': self.quoted,
+            'fallbacks': self.fallbacks,
+            'subscribed': len(self.subscribers),
+            'published': self.published,
+            'dropped': self.dropped,
+            'callback_errors': self.callback_errors,
+            'requests': dict(self.requests)
+        }
+
+
+# shared by every monitor so their CAs land in the same batches
+quote_engine = QuoteEngine()
@@ -0,0 +1,170 @@
+import asyncio
+import time
+from collections import defaultdict
+from urllib.parse import urlparse
+
+
+# host -> provider name
+PROVIDER_HOSTS = {
+    'public-api.birdeye.so': 'birdeye',
+    'data.solanatracker.io': 'solanatracker',
+    'deep-index.moralis.io': 'moralis',
+    'solana-gateway.moralis.io': 'moralis',
+    'api.geckoterminal.com': 'geckoterminal',
+    'api.coingecko.com': 'coingecko',
+    'api.dexscreener.com': 'dexscreener',
+    'api.mainnet-beta.solana.com': 'solana_rpc',
+    'discord.com': 'discord_webhook',
+}
+
+# provider -> (tokens per second, burst)
+DEFAULT_RATES = {
+    'birdeye': (10, 10),
+    'solanatracker': (4, 4),
+    'moralis': (20, 20),
+    'geckoterminal': (0.5, 5),
+    'coingecko': (0.5, 5),
+    'dexscreener': (5, 10),
+    'solana_rpc': (8, 16),
+    'discord_webhook': (2.5, 5),
+}
+
+# (provider, endpoint) -> (tokens per second, burst), on top of the provider bucket
+DEFAULT_ENDPOINT_RATES = {
+    ('dexscreener', '/latest/dex/search'): (5, 5),
+    ('birdeye', '/v1/wallet/tx_list'): (2, 4),
+}
+
+
+def endpoint_of(path):
+    """
+    Path with address-like segments folded, so /tokens/<ca>/ath is one endpoint.
+    Comma separated address lists (multi-token lookups) fold the same way.
+    """
+    parts = []
+    for part in path.split('/'):
+        if part and all(len(item) >= 32 and item.isalnum() for item in part.split(',')):
+            parts.append('{id}')
+        else:
+            parts.append(part)
+    return '/'.join(parts) or '/'
+
+
+class TokenBucket:
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.capacity = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.lock = asyncio.Lock()
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self, n=1):
+        """
+        Wait for n tokens, returns the seconds spent waiting. More than the
+        burst is taken as debt once the bucket is full, so the callers after
+        it wait the difference off.
+        """
+        started = time.monotonic()
+        needed = min(n, self.capacity)
+        # the lock keeps waiters in arrival order
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                if now < self.blocked_until:
+                    delay = self.blocked_until - now
+                else:
+                    self._refill(now)
+                    if self.tokens >= needed:
+                        self.tokens -= n
+                        return now - started
+                    delay = (needed - self.tokens) / self.rate
+                await asyncio.sleep(delay)
+
+    def block(self, seconds):
+        """Stop handing out tokens for a while, e.g. after a 429 with Retry-After"""
+        self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+        self.tokens = 0
+
+
+class RateLimiter:
+    """
+    Token buckets per provider (and optionally per endpoint), keyed off the
+    request url. Callers wait for a token instead of failing, and 429s push the
+    whole provider back by the server's Retry-After.
+    """
+    def __init__(self, rates=None, endpoint_rates=None, default_rate=(10, 10)):
+        self.rates = dict(DEFAULT_RATES)
+        self.rates.update(rates or {})
+        self.endpoint_rates = dict(DEFAULT_ENDPOINT_RATES)
+        self.endpoint_rates.update(endpoint_rates or {})
+        self.default_rate = default_rate
+
+        self.buckets = {}
+        self.endpoint_buckets = {}
+
+        self.requests = defaultdict(int)
+        self.wait_total = defaultdict(float)
+        self.wait_max = defaultdict(float)
+        self.throttled = defaultdict(int)
+
+    def classify(self, url):
+        parsed = urlparse(str(url))
+        host = parsed.hostname or ''
+        provider = PROVIDER_HOSTS.get(host, host)
+        return provider, endpoint_of(parsed.path)
+
+    def _bucket(self, provider):
+        bucket = self.buckets.get(provider)
+        if bucket is None:
+            rate, burst = self.rates.get(provider, self.default_rate)
+            bucket = TokenBucket(rate, burst)
+            self.buckets[provider] = bucket
+        return bucket
+
+    def _endpoint_bucket(self, provider, endpoint):
+        key = (provider, endpoint)
+        if key not in self.endpoint_rates:
+            return None
+        bucket = self.endpoint_buckets.get(key)
+        if bucket is None:
+            rate, burst = self.endpoint_rates[key]
+            bucket = TokenBucket(rate, burst)
+            self.endpoint_buckets[key] = bucket
+        return bucket
+
+    async def acquire(self, url, weight=1):
+        """Wait for `weight` tokens (e.g. the calls in a JSON-RPC batch) from the url's buckets"""
+        provider, endpoint = self.classify(url)
+        waited = 0.0
+        endpoint_bucket = self._endpoint_bucket(provider, endpoint)
+        if endpoint_bucket is not None:
+            waited += await endpoint_bucket.acquire(weight)
+        waited += await self._bucket(provider).acquire(weight)
+
+        self.requests[provider] += 1
+        self.wait_total[provider] += waited
+        self.wait_max[provider] = max(self.wait_max[provider], waited)
+        return waited
+
+    def throttle(self, url, seconds):
+        provider, endpoint = self.classify(url)
+        self.throttled[provider] += 1
+        self._bucket(provider).block(seconds)
+        print(f"Rate limited by {provider} on {endpoint}, backing off {seconds:.1f}s")
+
+    def stats(self):
+        return {
+            provider: {
+                'requests': self.requests[provider],
+                'throttled': self.throttled[provider],
+                'wait_total_s': self.wait_total[provider],
+                'wait_avg_ms': self.wait_total[provider] / self.requests[provider] * 1000 if self.requests[provider] else 0,
+                'wait_max_ms': self.wait_max[provider] * 1000
+            }
+            for provider in self.requests
+        }
@@ -0,0 +1,15 @@
+from types import MappingProxyType
+
+
+def freeze(value):
+    """
+    Read-only copy of a result: dicts become mapping proxies and lists become
+    tuples, all the way down. Results are shared between concurrent alerts (and
+    the response cache), so nobody gets to edit them in place.
+    """
+    if isinstance(value, (dict, MappingProxyType)):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    return value
+
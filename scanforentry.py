@@ -6,6 +6,7 @@ from webhooks import TradeWebhook
 from ob import OrderBlock
 from datetime import datetime
 from marketcapfinal import Supply, Price, Marketcap
+from quotes import quote_engine
 
 
 class MarketcapMonitor:
@@ -23,14 +24,13 @@ class MarketcapMonitor:
         self.s = Supply()
         self.p = Price()
         self.mc = Marketcap()
+        self.quotes = quote_engine
 
 
     async def monitor_marketcap(self, token_name, ca, pair_address, age_minutes=180):
         """Monitor marketcap for both support and OB entries"""
         try:
             print("\n=== Starting Market Monitor ===")
-            self.ob.ca = ca
-            self.sr.ca = ca
             
             # Initialize components
             if not await self.initialize(token_name, ca, pair_address, age_minutes):
@@ -46,7 +46,8 @@ class MarketcapMonitor:
             OB_UPDATE_INTERVAL = 180  # 3 minutes
             MC_CHECK_INTERVAL = 60    # 1 minute
             
-            while True:
+            # one snapshot per ticker refresh, no polling loop of our own
+            async for quote in self.quotes.stream(ca):
                 try:
                     current_time = datetime.now()
                     
@@ -63,7 +64,7 @@ class MarketcapMonitor:
                         if not self.sr_last_update or (current_time - self.sr_last_update).seconds >= self.sr_update_interval:
                             update_tasks.append(self.update_sr_levels(pair_address, token_name, ca, age_minutes))
                             
-                        if (not hasattr(self.ob, 'active_obs') or not self.ob.active_obs) and (current_time - last_ob_update).seconds >= OB_UPDATE_INTERVAL:
+                        if not self.ob.active_obs_for(ca) and (current_time - last_ob_update).seconds >= OB_UPDATE_INTERVAL:
                             print("\n🔍 Looking for Order Blocks...")
                             update_tasks.append(self.ob.update_order_blocks(pair_address, token_name))
                             last_ob_update = current_time
@@ -72,11 +73,10 @@ class MarketcapMonitor:
                         if update_tasks:
                             await asyncio.gather(*update_tasks, return_exceptions=True)
                         
-                        # Get current marketcap
-                        current_mc = await self.rpc.calculate_marketcap(ca)
+                        # Current marketcap from the ticker snapshot
+                        current_mc = quote['marketcap']
                         if not current_mc:
                             print("❌ Failed to get current marketcap")
-                            await asyncio.sleep(MC_CHECK_INTERVAL)
                             continue
 
                         print(f"\n💰 Current MC: ${current_mc:.2f}")
@@ -103,8 +103,9 @@ class MarketcapMonitor:
 
                         # Order Block Check
                         in_ob = await self.ob.monitor_ob_entry(token_name, ca, pair_address, current_mc)
-                        if hasattr(self.ob, 'active_obs') and self.ob.active_obs:
-                            ob_levels = [ob['bottom'] for ob in self.ob.active_obs]
+                        active_obs = self.ob.active_obs_for(ca)
+                        if active_obs:
+                            ob_levels = [ob['bottom'] for ob in active_obs]
                             if ob_levels:
                                 min_ob = min(ob_levels)
                                 distance_from_ob = ((current_mc - min_ob) / min_ob) * 100
@@ -139,18 +140,17 @@ class MarketcapMonitor:
                                 await self.stop_trade_scanner()
                                 start_time = None
 
-                    await asyncio.sleep(MC_CHECK_INTERVAL)
-
                 except Exception as e:
                     print(f"Error in monitoring loop: {str(e)}")
                     import traceback
                     traceback.print_exc()
-                    await asyncio.sleep(MC_CHECK_INTERVAL)
 
         except Exception as e:
             print(f"Fatal error in monitor_marketcap: {str(e)}")
             if self.trade_scanner_task:
                 await self.stop_trade_scanner()
+        finally:
+            self.ob.drop_state(ca)
 
     async def start_trade_scanner(self, token_name, pair_address, token_ca):
         """Start the trade scanner if not already running"""
@@ -10,11 +10,12 @@ intents.guild_messages = True
 bot = commands.Bot(command_prefix='!', intents=intents)
 
 class ServerData:
-    def __init__(self, bot):
+    def __init__(self, bot, index=None):
         self.bot = bot
         self.tx = TX_ANALYZER()
         self.limit = 100
-        self.target_ca = None
+        # CAEventIndex filled by the ingest handlers, history is only scanned without one
+        self.index = index
         
         # SWT Channel configurations
         self.swt_channel_ids = {
@@ -53,10 +54,72 @@ class ServerData:
             }
         }
 
-    async def swt_server_data(self):
-        if not self.target_ca:
+    def _indexed_server_data(self, ca, family, channel_ids, with_links=False):
+        """Builds the server data structure from the in-memory CA index"""
+        server_data = self._create_base_server_data()
+        if not with_links:
+            del server_data['trading_links']
+
+        for channel_id, channel_name in channel_ids.items():
+            server_data['channels'][channel_name] = {
+                'count': 0,
+                'buys': 0.0,
+                'sells': 0.0,
+                'buy_pressure': 0.0,
+                'channel_id': channel_id
+            }
+
+        for event in self.index.events_for(ca, family):
+            channel = server_data['channels'].setdefault(event['channel_name'], {
+                'count': 0,
+                'buys': 0.0,
+                'sells': 0.0,
+                'buy_pressure': 0.0,
+                'channel_id': event['channel_id']
+            })
+            channel['count'] += 1
+            if event['description']:
+                server_data['latest_descriptions'].append(event['description'])
+            if event['type'] == "Buy":
+                channel['buys'] += event['sol_amount']
+            elif event['type'] == "Sell":
+                channel['sells'] += event['sol_amount']
+            if with_links:
+                for link_name, link in event['trading_links'].items():
+                    if link:
+                        server_data['trading_links'][link_name] = link
+
+        for channel in server_data['channels'].values():
+            channel['buy_pressure'] = channel['buys'] / (channel['sells'] + 0.0001)  # Avoid division by zero
+            server_data['count'] += channel['count']
+            server_data['buys'] += channel['buys']
+            server_data['sells'] += channel['sells']
+
+        server_data['latest_descriptions'] = server_data['latest_descriptions'][-5:]
+        return server_data
+
+    async def swt_server_data(self, ca):
+        if not ca:
             return
-            
+        if self.index is not None:
+            return self._indexed_server_data(ca, "SWT", self.swt_channel_ids, with_links=True)
+        return await self._swt_history_scan(ca)
+
+    async def fresh_server_data(self, ca):
+        if not ca:
+            return
+        if self.index is not None:
+            return self._indexed_server_data(ca, "Fresh", self.fresh_channel_ids)
+        return await self._fresh_history_scan(ca)
+
+    async def degen_server_data(self, ca):
+        if not ca:
+            return
+        if self.index is not None:
+            return self._indexed_server_data(ca, "Degen", {self.degen_channel_id: "Degen"})
+        return await self._degen_history_scan(ca)
+
+    async def _swt_history_scan(self, target_ca):
         server_data = self._create_base_server_data()
         
         for channel_id, channel_name in self.swt_channel_ids.items():
@@ -84,7 +147,7 @@ class ServerData:
                                                 field_name = field.name.lower() if field.name else ''
                                                 if field_name not in excluded_fields:
                                                     ca = field.value.strip() if field.value else ''
-                                                    if ca.lower() == self.target_ca.lower():
+                                                    if ca.lower() == target_ca.lower():
                                                         found_ca = True
                                                         channel_count += 1
                                                         if embed.description:
@@ -147,10 +210,7 @@ class ServerData:
         server_data['latest_descriptions'] = server_data['latest_descriptions'][-5:] if server_data['latest_descriptions'] else []
         return server_data
 
-    async def fresh_server_data(self):
-        if not self.target_ca:
-            return
-            
+    async def _fresh_history_scan(self, target_ca):
         server_data = self._create_base_server_data()
         del server_data['trading_links']  # Not needed for fresh data
         
@@ -168,7 +228,7 @@ class ServerData:
                                     for field in embed.fields:
                                         if field.name.strip(':').lower() == "token address":
                                             ca = field.value.strip()
-                                            if ca.lower() == self.target_ca.lower():
+                                            if ca.lower() == target_ca.lower():
                                                 channel_count += 1
                                                 if embed.description:
                                                     server_data['latest_descriptions'].append(embed.description)
@@ -203,10 +263,7 @@ class ServerData:
         server_data['latest_descriptions'] = server_data['latest_descriptions'][-5:] if server_data['latest_descriptions'] else []
         return server_data
 
-    async def degen_server_data(self):
-        if not self.target_ca:
-            return
-        
+    async def _degen_history_scan(self, target_ca):
         server_data = self._create_base_server_data()
         del server_data['trading_links']  # Not needed for degen data
         
@@ -227,7 +284,7 @@ class ServerData:
                                     if "Token:" in field.value:
                                         try:
                                             current_ca = field.value.split('`')[1].strip()
-                                            if current_ca.lower() == self.target_ca.lower():
+                                            if current_ca.lower() == target_ca.lower():
                                                 is_target_tx = True
                                                 channel_count += 1
                                                 break
@@ -0,0 +1,92 @@
+import asyncio
+import functools
+import inspect
+from collections import defaultdict
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent identical calls. The first caller for a key starts the
+    work, everyone arriving while it is in flight awaits the same future.
+    Nothing is kept once the call finishes, that is the response cache's job.
+    """
+    def __init__(self):
+        self.inflight = {}
+        self.calls = defaultdict(int)
+        self.saved = defaultdict(int)
+
+    def _forget(self, key, future):
+        if self.inflight.get(key) is future:
+            del self.inflight[key]
+        # mark the exception as retrieved when nobody is left waiting
+        if not future.cancelled():
+            future.exception()
+
+    async def do(self, key, func):
+        """Run func() once per in-flight key, key starts with (provider, endpoint)"""
+        name = key[:2]
+        future = self.inflight.get(key)
+        if future is not None:
+            self.saved[name] += 1
+            return await asyncio.shield(future)
+
+        self.calls[name] += 1
+        future = asyncio.ensure_future(func())
+        self.inflight[key] = future
+        future.add_done_callback(functools.partial(self._forget, key))
+        # shield so one caller timing out does not cancel the call for the others
+        return await asyncio.shield(future)
+
+    def claim(self, key):
+        """
+        (future, owner) for callers that compute several keys in one go: the
+        in-flight future for key, or a new one registered for it that the
+        caller must resolve (owner is True then). do() callers join it too.
+        """
+        name = key[:2]
+        future = self.inflight.get(key)
+        if future is not None:
+            self.saved[name] += 1
+            return future, False
+
+        self.calls[name] += 1
+        future = asyncio.get_running_loop().create_future()
+        self.inflight[key] = future
+        future.add_done_callback(functools.partial(self._forget, key))
+        return future, True
+
+    def stats(self):
+        return {
+            f"{provider}:{endpoint}": {
+                'calls': self.calls[(provider, endpoint)],
+                'saved': self.saved[(provider, endpoint)]
+            }
+            for provider, endpoint in self.calls
+        }
+
+
+# shared by every provider wrapper
+single_flight = SingleFlight()
+
+
+def call_key(signature, provider, endpoint, self, args, kwargs):
+    """(provider, endpoint, *arguments) with f(ca) and f(ca=ca) landing on the same key"""
+    bound = signature.bind(self, *args, **kwargs)
+    bound.apply_defaults()
+    return (provider, endpoint) + tuple(bound.arguments.values())[1:]
+
+
+def coalesce(provider, endpoint):
+    """
+    Decorator for provider methods: concurrent calls with the same arguments
+    (across instances) share one in-flight request.
+    """
+    def decorator(method):
+        signature = inspect.signature(method)
+
+        @functools.wraps(method)
+        async def wrapper(self, *args, **kwargs):
+            key = call_key(signature, provider, endpoint, self, args, kwargs)
+            return await single_flight.do(key, lambda: method(self, *args, **kwargs))
+        return wrapper
+    return decorator
@@ -0,0 +1,175 @@
+import asyncio
+import itertools
+import json
+import time
+from collections import defaultdict
+from httpclient import http as shared_http
+
+
+DEFAULT_RPC_ENDPOINT = "https://api.mainnet-beta.solana.com"
+
+# getMultipleAccounts takes at most 100 keys per call
+MAX_ACCOUNTS_PER_CALL = 100
+
+
+class RpcError(Exception):
+    def __init__(self, method, error):
+        self.method = method
+        self.error = error
+        message = error.get('message') if isinstance(error, dict) else error
+        super().__init__(f"{method} failed: {message}")
+
+
+class RpcBatcher:
+    """
+    Solana JSON-RPC client that batches calls across callers.
+
+    Calls made within flush_interval of each other go out as one JSON-RPC
+    batch array (at most max_batch calls, max_inflight batches at a time per
+    endpoint) and every caller gets its own result back by id. Identical calls
+    in the same batch are sent once. Each batch is one HTTP request through the
+    shared client and costs one rate limit token per call inside it, since the
+    node counts every call; 429 handling and the circuit breaker apply per batch.
+    """
+    def __init__(self, endpoint=DEFAULT_RPC_ENDPOINT, http=None, flush_interval=0.01, max_batch=100, max_inflight=4):
+        self.endpoint = endpoint
+        self.http = http or shared_http
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self.inflight = asyncio.Semaphore(max_inflight)
+        self.pending = {}  # (method, params json) -> (method, params, [futures])
+        self._ids = itertools.count(1)
+        self._timer = None
+
+        self.calls = defaultdict(int)
+        self.batches = 0
+        self.batched_calls = 0
+        self.coalesced = 0
+        self.errors = 0
+        self.batch_time_total = 0.0
+
+    async def call(self, method, params=None):
+        """Result of one RPC call, raises RpcError on a JSON-RPC error"""
+        params = list(params or [])
+        key = (method, json.dumps(params, sort_keys=True))
+        future = asyncio.get_running_loop().create_future()
+        self.calls[method] += 1
+        if key in self.pending:
+            self.coalesced += 1
+            self.pending[key][2].append(future)
+        else:
+            self.pending[key] = (method, params, [future])
+        if len(self.pending) >= self.max_batch:
+            self._flush_now()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.flush_interval, self._flush_now)
+        return await future
+
+    def _flush_now(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        while self.pending:
+            keys = list(itertools.islice(self.pending, self.max_batch))
+            calls = [self.pending.pop(key) for key in keys]
+            asyncio.ensure_future(self._send(calls))
+
+    async def _send(self, calls):
+        by_id = {}
+        payload = []
+        for method, params, futures in calls:
+            request_id = next(self._ids)
+            by_id[request_id] = (method, futures)
+            payload.append({"jsonrpc": "2.0", "id": request_id, "method": method, "params": params})
+
+        async with self.inflight:
+            started = time.monotonic()
+            try:
+                async with self.http.post(self.endpoint, json=payload, headers={"Content-Type": "application/json"},
+                                          weight=len(payload)) as response:
+                    if response.status != 200:
+                        raise RpcError("batch", f"HTTP {response.status}")
+                    data = await response.json()
+                if isinstance(data, dict):
+                    # whole batch rejected (e.g. too large), the error is not per call
+                    raise RpcError("batch", data.get('error', data))
+                if not isinstance(data, list) or not all(isinstance(item, dict) for item in data):
+                    raise RpcError("batch", f"unexpected response: {str(data)[:100]}")
+            except Exception as e:
+                self.errors += 1
+                print(f"RPC batch of {len(payload)} calls failed: {str(e)}")
+                for _, futures in by_id.values():
+                    for future in futures:
+                        if not future.done():
+                            future.set_exception(e if isinstance(e, RpcError) else RpcError("batch", str(e)))
+                return
+            finally:
+                self.batches += 1
+                self.batched_calls += len(payload)
+                self.batch_time_total += time.monotonic() - started
+
+        for item in data:
+            method, futures = by_id.pop(item.get('id'), (None, ()))
+            for future in futures:
+                if future.done():
+                    continue
+                if 'error' in item:
+                    future.set_exception(RpcError(method, item['error']))
+                else:
+                    future.set_result(item.get('result'))
+        for method, futures in by_id.values():
+            for future in futures:
+                if not future.done():
+                    future.set_exception(RpcError(method, "missing from batch response"))
+
+    async def get_token_supply(self, mint):
+        """UI supply (amount / 10**decimals) or None"""
+        try:
+            result = await self.call("getTokenSupply", [mint])
+            value = (result or {}).get('value')
+            if not value:
+                return None
+            return float(value['amount']) / (10 ** int(value['decimals']))
+        except Exception as e:
+            print(f"Error in getTokenSupply for {mint}: {str(e)}")
+            return None
+
+    async def get_multiple_accounts(self, pubkeys, encoding="jsonParsed"):
+        """Account infos in the order of pubkeys (None for missing accounts), longer lists are split"""
+        pubkeys = list(pubkeys)
+        try:
+            results = await asyncio.gather(*(
+                self.call("getMultipleAccounts", [pubkeys[i:i + MAX_ACCOUNTS_PER_CALL], {"encoding": encoding}])
+                for i in range(0, len(pubkeys), MAX_ACCOUNTS_PER_CALL)
+            ))
+            accounts = []
+            for result in results:
+                accounts.extend((result or {}).get('value') or [])
+            return accounts
+        except Exception as e:
+            print(f"Error in getMultipleAccounts: {str(e)}")
+            return None
+
+    async def get_token_largest_accounts(self, mint):
+        """[{address, amount, decimals, uiAmount, uiAmountString}] largest first, or None"""
+        try:
+            result = await self.call("getTokenLargestAccounts", [mint])
+            return (result or {}).get('value')
+        except Exception as e:
+            print(f"Error in getTokenLargestAccounts for {mint}: {str(e)}")
+            return None
+
+    def stats(self):
+        return {
+            'endpoint': self.endpoint,
+            'calls': dict(self.calls),
+            'batches': self.batches,
+            'avg_batch_size': self.batched_calls / self.batches if self.batches else 0,
+            'coalesced': self.coalesced,
+            'errors': self.errors,
+            'avg_batch_ms': self.batch_time_total / self.batches * 1000 if self.batches else 0
+        }
+
+
+# shared by every module that talks to the default RPC endpoint
+rpc = RpcBatcher()
@@ -0,0 +1,118 @@
+import asyncio
+import time
+from env import BIRDEYE_API_KEY
+from httpclient import http as shared_http
+from singleflight import single_flight
+from sourcerank import waterfall
+
+
+WSOL_ADDRESS = "So11111111111111111111111111111111111111112"
+
+
+class SolPriceTicker:
+    """
+    SOL/USD kept in memory for every module.
+
+    run() refreshes it every `interval` seconds in the background (CoinGecko,
+    Birdeye as fallback) and readers take the last value with get(). A price
+    older than max_age counts as missing, so callers see None instead of a
+    stale number; price() refreshes on demand in that case, with concurrent
+    callers sharing one request.
+    """
+    def __init__(self, http=None, interval=30, max_age=300):
+        self.http = http or shared_http
+        self.interval = interval
+        self.max_age = max_age
+        self.value = None
+        self.updated_at = None  # monotonic
+
+        self.refreshes = 0
+        self.failures = 0
+        self.stale_reads = 0
+
+    def age(self):
+        return time.monotonic() - self.updated_at if self.updated_at is not None else None
+
+    def get(self):
+        """Last SOL/USD price, None if there is none younger than max_age"""
+        age = self.age()
+        if age is None or age > self.max_age:
+            self.stale_reads += 1
+            return None
+        return self.value
+
+    async def price(self):
+        """Like get(), but fetches right away when the in-memory price is missing or stale"""
+        value = self.get()
+        if value is not None:
+            return value
+        return await single_flight.do(("solprice", "refresh"), self.refresh)
+
+    async def refresh(self):
+        value = await waterfall("sol_price", [
+            ('coingecko', self._coingecko),
+            ('birdeye', self._birdeye),
+        ], valid=lambda price: isinstance(price, float) and price > 0)
+        self.refreshes += 1
+        if value is None:
+            self.failures += 1
+            print(f"SOL price refresh failed, keeping {self.value} (age {self.age() or 0:.0f}s)")
+            return self.get()
+        self.value = value
+        self.updated_at = time.monotonic()
+        return value
+
+    async def run(self):
+        while True:
+            try:
+                await self.refresh()
+            except Exception as e:
+                print(f"Error in SOL price ticker: {str(e)}")
+            await asyncio.sleep(self.interval)
+
+    async def _coingecko(self):
+        try:
+            url = "https://api.coingecko.com/api/v3/simple/price"
+            params = {"ids": "solana", "vs_currencies": "usd"}
+            async with self.http.session() as session:
+                async with session.get(url, headers={'accept': 'application/json'}, params=params) as response:
+                    if response.status != 200:
+                        print(f"CoinGecko SOL price returned {response.status}")
+                        return None
+                    data = await response.json()
+            return float(data['solana']['usd'])
+        except Exception as e:
+            print(f"Error getting SOL price from CoinGecko: {str(e)}")
+            return None
+
+    async def _birdeye(self):
+        try:
+            url = "https://public-api.birdeye.so/defi/price"
+            headers = {
+                "accept": "application/json",
+                "x-chain": "solana",
+                "X-API-KEY": BIRDEYE_API_KEY
+            }
+            async with self.http.session() as session:
+                async with session.get(url, headers=headers, params={"address": WSOL_ADDRESS}) as response:
+                    if response.status != 200:
+                        print(f"Birdeye SOL price returned {response.status}")
+                        return None
+                    data = await response.json()
+            return float(data['data']['value'])
+        except Exception as e:
+            print(f"Error getting SOL price from Birdeye: {str(e)}")
+            return None
+
+    def stats(self):
+        return {
+            'price': self.value,
+            'age_s': self.age(),
+            'refreshes': self.refreshes,
+            'failures': self.failures,
+            'stale_reads': self.stale_reads
+        }
+
+
+# shared, started once in Main.run and read from memory everywhere else
+sol_price = SolPriceTicker()
@@ -0,0 +1,141 @@
+import time
+from collections import defaultdict, deque
+from breaker import breakers
+
+
+def percentile(samples, q):
+    if not samples:
+        return 0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+
+class SourceHealth:
+    def __init__(self, window):
+        self.success = 1.0  # optimistic until proven otherwise
+        self.latencies = deque(maxlen=window)
+        self.calls = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.open_until = 0.0
+        self.last_call = 0.0
+
+
+class SourceRanker:
+    """
+    Live health of every source in every fallback chain, keyed by
+    (waterfall name, source label).
+
+    Each completed call updates an exponentially weighted success rate and the
+    recent latencies. order() puts healthy sources (success >= min_success)
+    first, fastest p50 first, then the ones without min_samples latencies yet
+    in their configured order, then the unhealthy ones. After failure_threshold
+    failures in a row a source is skipped for cooldown seconds, after which it
+    gets one more try. Sources labelled with a provider name are also skipped
+    while that provider's circuit breaker is open. An unhealthy source not called for probe_interval
+    seconds is given its configured place again, so a provider that had a bad
+    minute is not demoted forever.
+    """
+    def __init__(self, alpha=0.2, min_success=0.5, min_samples=3, failure_threshold=5, cooldown=30,
+                 probe_interval=120, window=200):
+        self.alpha = alpha
+        self.min_success = min_success
+        self.min_samples = min_samples
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.probe_interval = probe_interval
+        self.window = window
+        self.sources = defaultdict(dict)  # name -> {label: SourceHealth}
+
+    def health(self, name, label):
+        health = self.sources[name].get(label)
+        if health is None:
+            health = self.sources[name][label] = SourceHealth(self.window)
+        return health
+
+    def record(self, name, label, ok, elapsed):
+        health = self.health(name, label)
+        health.calls += 1
+        health.last_call = time.monotonic()
+        health.success += self.alpha * ((1.0 if ok else 0.0) - health.success)
+        health.latencies.append(elapsed)
+        if ok:
+            health.consecutive_failures = 0
+            health.open_until = 0.0
+        else:
+            health.failures += 1
+            health.consecutive_failures += 1
+            if health.consecutive_failures >= self.failure_threshold:
+                health.open_until = time.monotonic() + self.cooldown
+
+    def is_open(self, name, label):
+        return self.health(name, label).open_until > time.monotonic() or breakers.is_open(label)
+
+    def order(self, name, labels, keep_order=False):
+        """
+        labels (preference order) ranked for the next call, open sources left
+        out. keep_order only moves unhealthy sources to the back, for chains
+        where the order itself matters (e.g. OHLCV timeframes).
+        """
+        ranked = []
+        now = time.monotonic()
+        for index, label in enumerate(labels):
+            if self.is_open(name, label):
+                continue
+            health = self.health(name, label)
+            healthy = health.success >= self.min_success or now - health.last_call >= self.probe_interval
+            if keep_order:
+                key = (not healthy, index)
+            elif len(health.latencies) >= self.min_samples:
+                key = (not healthy, 0, percentile(health.latencies, 0.5), index)
+            else:
+                key = (not healthy, 1, 0, index)
+            ranked.append((key, label))
+        return [label for _, label in sorted(ranked)]
+
+    def ranking(self, name):
+        """Current view of one waterfall, best source first"""
+        labels = list(self.sources.get(name, {}))
+        order = self.order(name, labels)
+        result = []
+        for label in order + [label for label in labels if label not in order]:
+            health = self.health(name, label)
+            result.append({
+                'source': label,
+                'success': health.success,
+                'p50_ms': percentile(health.latencies, 0.5) * 1000,
+                'p95_ms': percentile(health.latencies, 0.95) * 1000,
+                'calls': health.calls,
+                'failures': health.failures,
+                'open': self.is_open(name, label)
+            })
+        return result
+
+    def stats(self):
+        return {name: self.ranking(name) for name in self.sources}
+
+
+# shared by every fallback chain
+source_ranker = SourceRanker()
+
+
+async def waterfall(name, sources, valid=None, keep_order=False, ranker=None):
+    """
+    Try (label, zero-argument coroutine function) sources one at a time in
+    ranked order and return the first valid result, None if none is.
+    """
+    ranker = ranker or source_ranker
+    valid = valid or (lambda result: result is not None)
+    funcs = dict(sources)
+    for label in ranker.order(name, [label for label, _ in sources], keep_order=keep_order):
+        started = time.monotonic()
+        try:
+            result = await funcs[label]()
+        except Exception as e:
+            print(f"Error in {name} source {label}: {str(e)}")
+            result = None
+        ok = valid(result)
+        ranker.record(name, label, ok, time.monotonic() - started)
+        if ok:
+            return result
+    return None
@@ -15,6 +15,16 @@ from backupohlcv import OHLCV
 #from scientificnotation import SN
 
 from marketcapfinal import Supply, Price, Marketcap
+from records import freeze
+
+
+class SRContext:
+    """Per-token state for one support/resistance run, so one analyzer can serve many tokens at once"""
+    def __init__(self, ca, supply=None, current_mc=None):
+        self.ca = ca
+        self.supply = supply
+        self.current_mc = current_mc
+
 
 class SupportResistance:
     def __init__(self):
@@ -25,9 +35,6 @@ class SupportResistance:
         self.mc = Marketcap()
 
         self.backupohlcv = OHLCV()
-        self.current_mc = None
-        self.supply = None
-        
 
     
     def _price_formatter(self, x: float) -> str:
@@ -50,11 +57,16 @@ class SupportResistance:
         est_dt = utc_dt.astimezone(est_tz)
         return est_dt
     
-    async def _set_mc(self, ca):
+    async def context(self, ca, supply=None):
+        """Fetch the supply (when not given) and current marketcap for ca"""
+        ctx = SRContext(ca, supply)
+        if not ctx.supply:
+            ctx.supply = await self.s.supply(ca)
         try:
-            self.current_mc = await self.mc.marketcap(ca)
+            ctx.current_mc = await self.mc.marketcap(ca)
         except Exception as e:
             print(f"Error setting marketcap {str(e)}")
+        return ctx
 
     async def _convert(self, data, supply):
         """
@@ -151,24 +163,17 @@ class SupportResistance:
             traceback.print_exc()
             return None
 
-    async def get_sr(self, data, ca, supply):
+    async def get_sr(self, data, ctx):
         try:
             if data is None:
                 print("Error: Input data is None")
                 return None
                 
-            if not ca:
+            if not ctx.ca:
                 print("Error: Contract address is empty")
                 return None
-            
-            if not supply:
-                supply = self.s.supply(ca)
-            
-            self.supply = supply
-            await self._set_mc(ca)
-
 
-            df = await self._convert(data, supply)
+            df = await self._convert(data, ctx.supply)
             if df is None:
                 print("Error: Data conversion failed")
                 return None
@@ -238,7 +243,7 @@ class SupportResistance:
                         final_s = None
                         if support_analysis['is_clustered']:
                             support_mean = support_analysis['mean']
-                            if support_mean < self.current_mc * 0.30:
+                            if ctx.current_mc and support_mean < ctx.current_mc * 0.30:
                                 final_s = support_analysis
                                 
                         if final_s is None:
@@ -350,12 +355,9 @@ class SupportResistance:
             'range_high': mean * 1.05
         }
     
-    async def get_high_vol_zones(self, data, ca, supply):
+    async def get_high_vol_zones(self, data, ctx):
         try:
-            if not supply:
-                supply = await self.s.supply(ca)
-            self.supply = supply
-            df = await self._convert(data, supply)
+            df = await self._convert(data, ctx.supply)
             if df is None:
                 return None
             #df = pd.DataFrame(data['result'])
@@ -415,12 +417,13 @@ class SupportResistance:
                 print(F"Error passing ohlcv data bot.py --> get_sr_zones")
                 return None
                 
-            levels = await self.get_sr(ohlcv_data, ca, supply)
+            ctx = await self.context(ca, supply)
+            levels = await self.get_sr(ohlcv_data, ctx)
             if not levels:
                 print("Failed to get SR levels")
                 return None
                 
-            unique_ranges = await self.get_high_vol_zones(ohlcv_data, ca, supply)
+            unique_ranges = await self.get_high_vol_zones(ohlcv_data, ctx)
             
             support_zone = levels['support']
             resistance_zone = levels['resistance']
@@ -450,11 +453,11 @@ class SupportResistance:
                 'volume_resistances': volume_resistance_zones
             }, token_name, ca)
 
-            return {
+            return freeze({
                 'sr_levels': levels,
                 'volume_supports': volume_support_zones,
                 'volume_resistances': volume_resistance_zones
-            }
+            })
 
         except Exception as e:
             print(f"Error in get_sr_zones: {str(e)}")
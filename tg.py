@@ -1,27 +1,199 @@
-from telethon import TelegramClient
+from telethon import TelegramClient, events
+from telethon.errors import FloodWaitError, RPCError
 import asyncio
 import aiohttp
 import json
+import time
+from collections import defaultdict
 from env import API_ID, API_HASH, BOT_WEBHOOK
+from deadline import time_left
+from singleflight import coalesce
+from records import freeze
 
 WEBHOOK_URL = "https://discord.com/api/webhooks/1337649132273139763/39dSEjue0Apj3zTKG5PFU30Kx_l-GqZvrvShT_7cv5NAqB49ubTqolic9_gpAlBUWDKL"
 client = TelegramClient('anon', API_ID, API_HASH)
 
 
+class PendingRequest:
+    def __init__(self, ca, future, accept):
+        self.ca = ca
+        self.future = future
+        self.accept = accept
+        self.message_id = None
+        self.sent_at = time.monotonic()
+
+
+class ScannerBot:
+    def __init__(self, username, concurrency=1, timeout=20):
+        self.username = username
+        self.slots = asyncio.Semaphore(concurrency)
+        self.timeout = timeout
+        self.pending = []
+        self.blocked_until = 0.0
+
+
+class ScannerClient:
+    """
+    One Telegram session, started once and kept open, for every scanner bot.
+
+    Each bot gets a NewMessage (and MessageEdited, some bots fill in their
+    reply by editing it) handler. A request sends the command and waits on a
+    future; the handler resolves it the moment the reply arrives. Replies are
+    matched to requests by the message they reply to, then by the CA in the
+    text, then (if they reply to nothing) to the oldest request still waiting,
+    and only if they pass the request's accept check (so "scanning..."
+    placeholders are skipped).
+    Per-bot concurrency limits keep us under the bots' own limits, and a
+    FloodWait blocks sends to that bot instead of failing every request.
+    """
+    def __init__(self, client):
+        self.client = client
+        self.bots = {}
+        self._started = False
+        self._start_lock = asyncio.Lock()
+
+        self.requests = defaultdict(int)
+        self.replies = defaultdict(int)
+        self.timeouts = defaultdict(int)
+        self.flood_waits = defaultdict(int)
+        self.errors = defaultdict(int)
+        self.latency_total = defaultdict(float)
+
+    def bot(self, username, concurrency=1, timeout=20):
+        if username not in self.bots:
+            self.bots[username] = ScannerBot(username, concurrency, timeout)
+        return self.bots[username]
+
+    async def start(self):
+        if self._started:
+            return
+        async with self._start_lock:
+            if self._started:
+                return
+            await self.client.start()
+            for username, bot in self.bots.items():
+                self._add_handlers(bot)
+            self._started = True
+
+    def _add_handlers(self, bot):
+        async def on_message(event):
+            self._resolve(bot, event.message)
+        self.client.add_event_handler(on_message, events.NewMessage(chats=bot.username, incoming=True))
+        self.client.add_event_handler(on_message, events.MessageEdited(chats=bot.username, incoming=True))
+
+    def _resolve(self, bot, message):
+        text = message.message or ''
+        waiting = [request for request in bot.pending if not request.future.done()]
+        reply_to = getattr(message, 'reply_to_msg_id', None)
+        candidates = [request for request in waiting if reply_to is not None and request.message_id == reply_to]
+        if not candidates:
+            candidates = [request for request in waiting if request.ca in text]
+        if not candidates and reply_to is None:
+            # a reply to some other message is a late answer to a request that already gave up
+            candidates = waiting[:1]
+        for request in candidates:
+            if request.accept(message):
+                request.future.set_result(message)
+                self.replies[bot.username] += 1
+                self.latency_total[bot.username] += time.monotonic() - request.sent_at
+                return
+
+    async def ask(self, username, command, ca, accept=None, timeout=None):
+        """Send command to the bot and return its reply about ca, None on timeout"""
+        if username not in self.bots:
+            self.bot(username)
+            if self._started:
+                self._add_handlers(self.bots[username])
+        bot = self.bots[username]
+        await self.start()
+        timeout = time_left(timeout or bot.timeout)
+        if timeout <= 0:
+            return None
+        started = time.monotonic()
+        future = asyncio.get_running_loop().create_future()
+        request = PendingRequest(ca, future, accept or (lambda message: bool(message.message or message.media)))
+
+        async with bot.slots:
+            self.requests[username] += 1
+            bot.pending.append(request)
+            try:
+                blocked = bot.blocked_until - time.monotonic()
+                if blocked > 0:
+                    if blocked >= timeout - (time.monotonic() - started):
+                        print(f"{username} is flood-waiting for {blocked:.0f}s, skipping {ca}")
+                        return None
+                    await asyncio.sleep(blocked)
+                # one retry after a FloodWait that fits in the timeout, a second one gives up
+                for attempt in range(2):
+                    try:
+                        sent = await self.client.send_message(username, command)
+                        break
+                    except FloodWaitError as e:
+                        self.flood_waits[username] += 1
+                        bot.blocked_until = time.monotonic() + e.seconds
+                        print(f"FloodWait from {username}: {e.seconds}s")
+                        if attempt == 1 or e.seconds >= timeout - (time.monotonic() - started):
+                            return None
+                        await asyncio.sleep(e.seconds)
+                request.message_id = sent.id
+                request.sent_at = time.monotonic()
+                return await asyncio.wait_for(future, timeout=max(0, timeout - (time.monotonic() - started)))
+            except asyncio.TimeoutError:
+                self.timeouts[username] += 1
+                print(f"No reply from {username} for {ca} within {timeout:.0f}s")
+                return None
+            except RPCError as e:
+                self.errors[username] += 1
+                print(f"Telegram error asking {username} about {ca}: {str(e)}")
+                return None
+            finally:
+                bot.pending.remove(request)
+
+    def stats(self):
+        return {
+            username: {
+                'requests': self.requests[username],
+                'replies': self.replies[username],
+                'timeouts': self.timeouts[username],
+                'flood_waits': self.flood_waits[username],
+                'errors': self.errors[username],
+                'in_flight': len(bot.pending),
+                'avg_reply_ms': self.latency_total[username] / self.replies[username] * 1000 if self.replies[username] else 0
+            }
+            for username, bot in self.bots.items()
+        }
+
+
+scanner = ScannerClient(client)
+
+
+def cached_verdict(verdicts, scanner_name, ca):
+    """(True, verdict) from the verdict cache if there is one, verdicts may be None"""
+    if verdicts is None:
+        return False, None
+    found, verdict = verdicts.get(scanner_name, ca)
+    return found, freeze(verdict) if found else None
+
+
 class SoulScannerBot:
-    def __init__(self):
-        pass
+    def __init__(self, verdicts=None):
+        self.username = 'soul_scanner_bot'
+        self.verdicts = verdicts
+        scanner.bot(self.username, concurrency=2, timeout=20)
 
+    @coalesce("telegram", "soul")
     async def send_and_receive_message(self, ca: str):
-        await client.start()
-        await client.send_message('soul_scanner_bot', ca)
-        await asyncio.sleep(3)  # Reduced from 5 to 3
-    
-        messages = await client.get_messages('soul_scanner_bot', limit=1)
-        if not messages:
+        found, verdict = cached_verdict(self.verdicts, 'soul', ca)
+        if found:
+            return verdict
+        message = await scanner.ask(self.username, ca, ca, accept=lambda m: bool(m.message) and "Hodls:" in m.message)
+        if not message:
             return False
         #print(f"\nReceived message from Soul Scanner for CA: {ca}")
-        return await self.process_message(ca, messages[0], return_holder_metrics=True)
+        result = await self.process_message(ca, message, return_holder_metrics=True)
+        if isinstance(result, dict) and self.verdicts is not None:
+            self.verdicts.set('soul', ca, result)
+        return result
 
     async def process_message(self, ca: str, message, return_holder_metrics=True):
         try:
@@ -112,20 +284,26 @@ class SoulScannerBot:
             return False
 
 class BundleBot:
-    def __init__(self):
+    def __init__(self, verdicts=None):
         self.passed_cas = set()
+        self.username = 'TrenchScannerBot'
+        self.verdicts = verdicts
+        scanner.bot(self.username, concurrency=1, timeout=30)
 
-
+    @coalesce("telegram", "bundle")
     async def send_and_receive_message(self, ca: str):
-       await client.start()
-       await client.send_message('TrenchScannerBot', ca)
-       await asyncio.sleep(10) 
-
-       messages = await client.get_messages('TrenchScannerBot', limit=1)
-       if not messages:
+       found, verdict = cached_verdict(self.verdicts, 'bundle', ca)
+       if found:
+           return verdict
+       message = await scanner.ask(self.username, ca, ca, accept=lambda m: bool(m.message) and (
+           "Current Held Percentage:" in m.message or "There was a server error" in m.message))
+       if not message:
            return None
-       
-       return await self.process_message(messages[0], ca)
+
+       result = await self.process_message(message, ca)
+       if result is not None and self.verdicts is not None:
+           self.verdicts.set('bundle', ca, result)
+       return result
     
     async def process_message(self, message, ca: str):
         try:
@@ -189,20 +367,30 @@ class BundleBot:
             return None
         
 class WAlletPNL:
-    def __init__(self):
-        pass
+    def __init__(self, verdicts=None):
+        self.username = 'RickBurpBot'
+        self.verdicts = verdicts
+        scanner.bot(self.username, concurrency=1, timeout=20)
         
+    @coalesce("telegram", "dex_paid")
     async def send_and_recieve_message_dex_paid(self, ca: str):
-        await client.start()
+        found, verdict = cached_verdict(self.verdicts, 'dex_paid', ca)
+        if found:
+            return verdict
         command = f"/dp {ca}"
-        await client.send_message('RickBurpBot', command)
-        await asyncio.sleep(5)
-
-        messages = await client.get_messages('RickBurpBot', limit=1)
-        if not messages:
+        message = await scanner.ask(self.username, command, ca, accept=self._is_dp_reply)
+        if not message:
             return None
         
-        return await self.process_dp_message(messages[0], ca)
+        result = await self.process_dp_message(message, ca)
+        # False is a verdict here (not paid), None means the reply was unclear
+        if result is not None and self.verdicts is not None:
+            self.verdicts.set('dex_paid', ca, result)
+        return result
+
+    def _is_dp_reply(self, message):
+        text = message.message or ''
+        return "❌" in text or "✅" in text or "paid" in text.lower()
 
     async def process_dp_message(self, message, ca: str):
         try:
@@ -237,16 +425,12 @@ class WAlletPNL:
             return None
         
     async def send_and_recieve_dex_chart(self, ca: str):
-        await client.start()
         command = f"/cc {ca}"
-        await client.send_message('RickBurpBot', command)
-        await asyncio.sleep(10)
-
-        messages = await client.get_messages('RickBurpBot', limit=1)
-        if not messages:
+        message = await scanner.ask(self.username, command, ca, accept=lambda m: bool(m.media), timeout=20)
+        if not message:
             return None
         
-        return await self.process_dex_chart_message(messages[0], ca)
+        return await self.process_dex_chart_message(message, ca)
 
     async def process_dex_chart_message(self, message, ca: str):
         try:
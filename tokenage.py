@@ -1,25 +1,24 @@
-import requests
 import asyncio
 from datetime import datetime
+from httpclient import http as shared_http
+from cache import cached
+from records import freeze
 
 class TokenAge:
-    def __init__(self):
-        self.token_age = None
-    
-    def reset_age(self):
-        self.token_age = None
+    def __init__(self, http=None):
+        self.http = http or shared_http
 
+    @cached("dexscreener", "search_pairs")
     async def get_pair_creation_times(self, ca):
         try:
             # Make request to DexScreener API
             url = f"https://api.dexscreener.com/latest/dex/search?q={ca}"
-            response = requests.get(url)
-            
-            if response.status_code != 200:
-                print(f"Error: API returned status code {response.status_code}")
-                return None
-                
-            data = response.json()
+            async with self.http.get(url) as response:
+                if response.status != 200:
+                    print(f"Error: API returned status code {response.status}")
+                    return None
+                    
+                data = await response.json()
             
             if not data.get('pairs'):
                 print("No pairs found")
@@ -42,7 +41,7 @@ class TokenAge:
             # Sort by creation time
             pair_times.sort(key=lambda x: x['created_at_timestamp'])
             
-            return pair_times
+            return freeze(pair_times)
             
         except Exception as e:
             print(f"Error in get_pair_creation_times: {str(e)}")
@@ -1,27 +1,30 @@
 import asyncio
 import aiohttp
-import requests
 from typing import Dict, Optional, Any
 from marketcap import MarketcapFetcher
-from tg import WAlletPNL
 from env import BIRDEYE_API_KEY
 from marketcapfinal import Price, Supply, Marketcap
+from records import freeze
+from httpclient import http as shared_http
+from solprice import sol_price
+from walletservice import wallet_service
 
 class HolderAmount:
-    def __init__(self):
+    def __init__(self, http=None):
+        self.http = http or shared_http
         self.gecko_base_url = "https://api.geckoterminal.com/api/v2/simple/networks"
         self.limit_bd = 11
-        self.holders_data = {}
 
-        self.w = WAlletPNL()
+        self.wallets = wallet_service
         self.s = Supply()
         self.p = Price()
         self.mc = Marketcap()
 
 
     async def get_top_holders(self, ca):
-        self.holders_data = {}
-        bd_url = f"https://public-api.birdeye.so/defi/v3/token/holder?address={ca}&offset=0&limit={self.limit_bd}"
+        """{owner: ui amount} for the top holders, read-only"""
+        bd_url = f"https://public-api.birdeye.so/defi/v3/token/holder"
+        params = {"address": ca, "offset": 0, "limit": self.limit_bd}
         
         headers = {
             "accept": "application/json",
@@ -29,50 +32,39 @@ class HolderAmount:
             "X-API-KEY": BIRDEYE_API_KEY
         }
         try:
-            response = requests.get(bd_url, headers=headers)
-            response.raise_for_status()
-            data = response.json()
+            async with self.http.session() as session:
+                async with session.get(bd_url, headers=headers, params=params) as response:
+                    response.raise_for_status()
+                    data = await response.json()
             
             if not data or 'data' not in data or 'items' not in data['data']:
                 print(f"Invalid holder data structure for {ca}")
                 return {}
             
+            holders_data = {}
             for item in data['data']['items']:
                 owner = item['owner']
                 amount = float(item['ui_amount'])
-                self.holders_data[owner] = amount
+                holders_data[owner] = amount
             
-            return self.holders_data
+            return freeze(holders_data)
         except Exception as e:
             print(f"Error getting top holders for {ca}: {str(e)}")
             return {}
 
     
     async def get_sol_price(self) -> float:
-        url = "https://api.coingecko.com/api/v3/simple/price?ids=solana&vs_currencies=usd"
-        sol_price = None
-        try:
-            response = requests.get(url, headers={'accept': 'application/json'})
-            response.raise_for_status()
-            data = response.json()
-            if not data:
-                return 200.0
-            if 'solana' in data and 'usd' in data['solana']:
-                return float(data['solana']['usd'])
-        except Exception as e:
-            print(F"Error sending GET req => Coin Gecko Main net")
-            import traceback
-            traceback.print_exc()
-            return None        
+        """SOL/USD from the shared ticker, fetched only if its in-memory price is stale"""
+        return await sol_price.price()
         
     async def calculate_holder_value(self, ca, price):
         try:
-            supply = await self.s.supply(ca)
-            sol_price = await self.get_sol_price()
-            top_wallet_balance = await self.get_top_holders(ca)
+            supply, sol_price, top_wallet_balance = await asyncio.gather(
+                self.s.supply(ca), self.get_sol_price(), self.get_top_holders(ca))
             if not all([supply, price, sol_price, top_wallet_balance]):
                 print(f"Missing required data for calculations")
                 return {}
+            top_wallet_balance = dict(top_wallet_balance)
                     
             holder_values = {}
             #total_supply = float(supply)
@@ -150,22 +142,22 @@ class HolderAmount:
             for wallet_address in list(holder_data.keys())[:4]:  # Get first 4 wallets
                 if wallet_address != 'metadata':  # Skip metadata entry
                     # Get PnL data for this wallet
-                    pnl_data = await self.w.calculate_pnl(wallet_address)
+                    pnl_data = await self.wallets.pnl(wallet_address)
                     
                     if pnl_data:
                         wallet_pnls[wallet_address] = {
-                            'wallet_pnl': pnl_data['last_100_tx_pnl'],
+                            'wallet_pnl': pnl_data['pnl'],
                             'tokens_traded': pnl_data['tokens_traded'],
-                            'wins': pnl_data['tradess_won'],
+                            'wins': pnl_data['trades_won'],
                             'losses': pnl_data['trades_loss'],
                             'holding_percentage': holder_data[wallet_address]['percentage']
                         }
                         
                         """
                         print(f"\nWallet Analysis for {wallet_address[:8]}...")
-                        print(f"PnL: {pnl_data['last_100_tx_pnl']:.4f} SOL")
+                        print(f"PnL: {pnl_data['pnl']:.4f} SOL")
                         print(f"Tokens Traded: {pnl_data['tokens_traded']}")
-                        print(f"Wins/Losses: {pnl_data['tradess_won']}/{pnl_data['trades_loss']}")
+                        print(f"Wins/Losses: {pnl_data['trades_won']}/{pnl_data['trades_loss']}")
                         print(f"Current Holding: {holder_data[wallet_address]['percentage']}%")
                         print("-" * 40)
                         """
@@ -3,12 +3,25 @@ import aiohttp
 from env import BIRDEYE_API_KEY
 import requests
 import time
+from httpclient import http as shared_http
+from cache import cached
 
 class TrueAge:
-    def __init__(self):
-        pass
+    def __init__(self, http=None):
+        self.http = http or shared_http
 
     async def get(self, ca):
+        block_unix_time = await self._first_swap_time(ca)
+        if not block_unix_time:
+            return None
+        current_unix_time = int(time.time())
+        token_age_seconds = current_unix_time - block_unix_time
+        token_age_minutes = token_age_seconds // 60
+        return token_age_minutes
+
+    @cached("birdeye", "txs/token")
+    async def _first_swap_time(self, ca):
+        """Unix time of the first swap, never changes so it caches for a long time"""
         url = f"https://public-api.birdeye.so/defi/txs/token?address={ca}&offset=0&limit=1&tx_type=swap&sort_type=asc"
         headers = {
             'accept': 'application/json',
@@ -16,17 +29,12 @@ class TrueAge:
             'X-API-KEY': BIRDEYE_API_KEY
         }
         try:
-            async with aiohttp.ClientSession() as session:
+            async with self.http.session() as session:
                 async with session.get(url, headers=headers) as response:
                     data = await response.json()
                     if not data:
                         return
-                    block_unix_time = data["data"]["items"][0]["blockUnixTime"]
-                    current_unix_time = int(time.time())
-                    token_age_seconds = current_unix_time - block_unix_time                    
-                    token_age_minutes = token_age_seconds // 60
-                    
-                    return token_age_minutes
+                    return data["data"]["items"][0]["blockUnixTime"]
 
         except Exception as e:
             print(str(e))
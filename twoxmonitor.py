@@ -1,28 +1,54 @@
 import asyncio
+import functools
 import aiohttp
-import sqlite3
+from dbwriter import db_writer
 from datetime import datetime
 from webhooks import MultiAlert
-from marketcapfinal import Marketcap
+from quotes import quote_engine
 
 class TwoXChecker:
-    def __init__(self):
-        self.mc = Marketcap()
+    """
+    Watches alerted tokens for multiplier milestones. Each token is a
+    subscription on the shared quote ticker rather than its own polling loop.
+    """
+    def __init__(self, max_monitor_seconds=30 * 70, max_successes=2):
+        self.quotes = quote_engine
         self.webhook = MultiAlert()
         self.original_mcs = {}
         self.start_times = {}
         self.achieved_multipliers = {}
-        self.monitoring_tasks = {}
+        self.success_counts = {}
+        self.hit_2x = set()
+        self.subscriptions = {}  # ca -> ticker subscription id
+        self.max_monitor_seconds = max_monitor_seconds  # same budget as the old 30 checks 70s apart
+        self.max_successes = max_successes
     
     async def start_marketcap_monitoring(self, ca, token_name):
         try:
-            if ca not in self.monitoring_tasks:
+            if ca not in self.subscriptions:
                 self.start_times[ca] = datetime.now()
                 self.achieved_multipliers[ca] = set()
-                task = asyncio.create_task(self.monitor_token_mc(ca, token_name))
-                self.monitoring_tasks[ca] = task
+                self.success_counts[ca] = 0
+                self.subscriptions[ca] = self.quotes.subscribe(ca, functools.partial(self.on_quote, ca, token_name))
+                # ends the watch even if the token never gets a quote
+                asyncio.get_running_loop().call_later(self.max_monitor_seconds, self.expire, ca, token_name)
         except Exception as e:
             print(f"Error starting mc monitoring... \nerr: {str(e)}")
+
+    def stop_monitoring(self, ca):
+        subscription_id = self.subscriptions.pop(ca, None)
+        if subscription_id is not None:
+            self.quotes.unsubscribe(ca, subscription_id)
+        self.original_mcs.pop(ca, None)
+        self.start_times.pop(ca, None)
+        self.achieved_multipliers.pop(ca, None)
+        self.success_counts.pop(ca, None)
+        self.hit_2x.discard(ca)
+
+    def expire(self, ca, token_name):
+        if ca in self.subscriptions:
+            print(f"\n❌ Removing {token_name} from tracking - Exceeded {self.max_monitor_seconds // 60} minutes without hitting target")
+            self.stop_monitoring(ca)
     
     def calculate_time_elapsed(self, start_time):
         elapsed = datetime.now() - start_time
@@ -34,114 +60,70 @@ class TwoXChecker:
     async def update_database(self, ca, hit_2x, multiplier=None):
         """Update database with 2X or other multiplier information"""
         try:
-            with sqlite3.connect('memedb.db') as conn:
-                cursor = conn.cursor()
-                
-                # Check if the token exists in the database
-                cursor.execute("SELECT id FROM multialerts WHERE ca = ?", (ca,))
-                result = cursor.fetchone()
-                
-                if result:
-                    # Update twox column
-                    cursor.execute("""
-                        UPDATE multialerts 
-                        SET twox = ?
-                        WHERE ca = ?
-                    """, (hit_2x, ca))
-                    
-                    # If we want to store the specific multiplier, we could add this in a future schema update
-                    # For now, we'll just use the boolean twox field
-                    
-                    conn.commit()
-                    print(f"Database updated for {ca}: twox = {hit_2x}")
-                else:
-                    print(f"Warning: Token {ca} not found in database")
+            # If we want to store the specific multiplier, we could add this in a future schema update
+            # For now, we'll just use the boolean twox field
+            updated = await db_writer.execute("""
+                UPDATE multialerts 
+                SET twox = ?
+                WHERE ca = ?
+            """, (hit_2x, ca))
+            # rowcount is None when the writer folded this into a shared executemany
+            if updated == 0:
+                print(f"Warning: Token {ca} not found in database")
+            else:
+                print(f"Database updated for {ca}: twox = {hit_2x}")
         
         except Exception as e:
             print(f"Error updating database for {ca}: {str(e)}")
     
-    async def monitor_token_mc(self, ca, token_name):
-        retries = 0
-        max_retries = 3
-        monitor_count = 0  # Track number of monitoring attempts
-        success_count = 0  # Track number of successful multiplier hits
-        max_monitors = 30  # Max monitoring attempts before removal
-        max_successes = 2  # Max number of successful hits before removal
-        hit_2x = False
+    async def on_quote(self, ca, token_name, quote):
+        if ca not in self.subscriptions:
+            return
+        current_mc = quote['marketcap']
+        if not current_mc:
+            return
 
-        while True:
-            try:
-                monitor_count += 1  # Increment monitor counter
-                
-                if monitor_count > max_monitors:
-                    print(f"\n❌ Removing {token_name} from tracking - Exceeded {max_monitors} checks without hitting target")
-                    if ca in self.monitoring_tasks:
-                        del self.monitoring_tasks[ca]
-                    if ca in self.original_mcs:
-                        del self.original_mcs[ca]
-                    if ca in self.start_times:
-                        del self.start_times[ca]
-                    return
+        if ca not in self.original_mcs:
+            self.original_mcs[ca] = current_mc
+            print(f"Starting to monitor {token_name}")
+            return
 
-                current_mc = await self.mc.marketcap(ca)
-                if current_mc is None or current_mc == 0:
-                    retries += 1
-                    if retries > max_retries:
-                        print(f"Stopped Monitoring 2x check for {ca} -- No Valid MC Data from SOL RPC")
-                        return
-                    await asyncio.sleep(5)
-                    continue
-
-                if ca not in self.original_mcs:
-                    self.original_mcs[ca] = current_mc
-                    print(f"Starting to monitor {token_name}")
-                    #print(f"Initial MC: ${current_mc:,.2f}")
-                else:
-                    original_mc = self.original_mcs[ca]
-                    if original_mc > 0:
-                        increase_percentage = ((current_mc - original_mc) / original_mc) * 100
-                        x_val = (increase_percentage + 100) / 100
-                        rounded_x = round(x_val * 2) / 2
-                        
-                        # Alert on any significant multiplier, regardless of previous alerts
-                        if increase_percentage > 90 and rounded_x not in self.achieved_multipliers[ca]:
-                            self.achieved_multipliers[ca].add(rounded_x)  # Track this multiplier as achieved
-                            success_count += 1  # Increment success counter
-                            time_elapsed = self.calculate_time_elapsed(self.start_times[ca])
-                            print(f"\n🚀 NEW MILESTONE: {rounded_x}X achieved for {token_name} (Success #{success_count}/2)")
-                            print(f"Time taken: {time_elapsed}")
-                            print(f"Initial MC: ${original_mc:,.2f}")
-                            print(f"Current MC: ${current_mc:,.2f}")
-                            print(f"Increase: {increase_percentage:.2f}%")
-                            print("-" * 50)
-                            
-                            # Check if token hit 2X or greater
-                            if rounded_x >= 2 and not hit_2x:
-                                hit_2x = True
-                                # Update database with 2X status
-                                await self.update_database(ca, True, rounded_x)
-                            
-                            await self.webhook.twox_multialert_webhook(
-                                token_name=token_name,
-                                ca=ca,
-                                initial_mc=original_mc,
-                                new_mc=current_mc,
-                                increase_percentage=increase_percentage,
-                                x_val=rounded_x,
-                                time_elapsed=time_elapsed
-                            )
+        original_mc = self.original_mcs[ca]
+        if original_mc <= 0:
+            return
+        increase_percentage = ((current_mc - original_mc) / original_mc) * 100
+        x_val = (increase_percentage + 100) / 100
+        rounded_x = round(x_val * 2) / 2
+        
+        # Alert on any significant multiplier, regardless of previous alerts
+        if increase_percentage > 90 and rounded_x not in self.achieved_multipliers[ca]:
+            self.achieved_multipliers[ca].add(rounded_x)  # Track this multiplier as achieved
+            self.success_counts[ca] += 1
+            success_count = self.success_counts[ca]
+            time_elapsed = self.calculate_time_elapsed(self.start_times[ca])
+            print(f"\n🚀 NEW MILESTONE: {rounded_x}X achieved for {token_name} (Success #{success_count}/2)")
+            print(f"Time taken: {time_elapsed}")
+            print(f"Initial MC: ${original_mc:,.2f}")
+            print(f"Current MC: ${current_mc:,.2f}")
+            print(f"Increase: {increase_percentage:.2f}%")
+            print("-" * 50)
+            
+            # Check if token hit 2X or greater
+            if rounded_x >= 2 and ca not in self.hit_2x:
+                self.hit_2x.add(ca)
+                # Update database with 2X status
+                await self.update_database(ca, True, rounded_x)
+            
+            await self.webhook.twox_multialert_webhook(
+                token_name=token_name,
+                ca=ca,
+                initial_mc=original_mc,
+                new_mc=current_mc,
+                increase_percentage=increase_percentage,
+                x_val=rounded_x,
+                time_elapsed=time_elapsed
+            )
 
-                            if success_count >= max_successes:
-                                print(f"\n✅ Removing {token_name} from tracking - Hit target {max_successes} times successfully!")
-                                if ca in self.monitoring_tasks:
-                                    del self.monitoring_tasks[ca]
-                                if ca in self.original_mcs:
-                                    del self.original_mcs[ca]
-                                if ca in self.start_times:
-                                    del self.start_times[ca]
-                                return
-                
-                await asyncio.sleep(70)
-            except Exception as e:
-                print(f"Error Monitoring MC for {token_name} ({ca})\nErr: {str(e)}")
-                await asyncio.sleep(60)
\ No newline at end of file
+            if success_count >= self.max_successes:
+                print(f"\n✅ Removing {token_name} from tracking - Hit target {self.max_successes} times successfully!")
+                self.stop_monitoring(ca)
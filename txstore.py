@@ -0,0 +1,232 @@
+import asyncio
+import sqlite3
+import time
+from datetime import datetime
+from dbwriter import db_writer
+from singleflight import single_flight
+
+
+class WalletTxStore:
+    """
+    Local copy of each wallet's swap history, keyed by signature.
+
+    sync() pages through Birdeye newest first until it reaches transactions
+    that are already stored, and backfill() pages backwards from the oldest
+    stored transaction when more history is wanted. Every fetched signature
+    is recorded in wallet_txs, only the unseen ones are parsed, and their swaps
+    go to wallet_swaps in the same transaction. swaps() feeds the PnL engine
+    through WalletService, which applies the same per-token window as
+    calculate_pnl. A wallet with thousands of transactions costs one request
+    per refresh. Tables are created on first use, writes go through the DB
+    writer, reads run in a worker thread.
+    """
+    def __init__(self, pnl, db_path='memedb.db', writer=None, page_size=100, max_pages=10, initial_depth=100):
+        self.pnl = pnl  # WalletPNL, for fetching pages and parsing swaps
+        self.db_path = db_path
+        self.writer = writer or db_writer
+        self.page_size = page_size
+        self.max_pages = max_pages
+        self.initial_depth = initial_depth
+
+        self.pages_fetched = 0
+        self.new_txs = 0
+        self.new_swaps = 0
+        self.syncs = 0
+        self.ready = False
+
+    def create_tables(self):
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS wallet_txs (
+                    wallet TEXT NOT NULL,
+                    signature TEXT NOT NULL,
+                    timestamp INTEGER NOT NULL,
+                    PRIMARY KEY (wallet, signature)
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_wallet_txs_time ON wallet_txs (wallet, timestamp)")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS wallet_swaps (
+                    wallet TEXT NOT NULL,
+                    signature TEXT NOT NULL,
+                    ca TEXT NOT NULL,
+                    token_name TEXT,
+                    token_symbol TEXT,
+                    tx_type TEXT NOT NULL,
+                    sol_amount REAL NOT NULL,
+                    token_amount REAL NOT NULL,
+                    timestamp INTEGER NOT NULL,
+                    PRIMARY KEY (wallet, signature, ca)
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS wallet_tx_sync (
+                    wallet TEXT PRIMARY KEY,
+                    exhausted INTEGER NOT NULL DEFAULT 0,
+                    synced_at REAL
+                )
+            """)
+            conn.commit()
+
+    async def _ready(self):
+        if not self.ready:
+            await asyncio.to_thread(self.create_tables)
+            self.ready = True
+
+    def _read(self, sql, params):
+        with sqlite3.connect(self.db_path) as conn:
+            return conn.execute(sql, params).fetchall()
+
+    async def _query(self, sql, params=()):
+        await self._ready()
+        return await asyncio.to_thread(self._read, sql, params)
+
+    async def cursor(self, wallet):
+        """Sync state for wallet as a dict, None if it was never synced"""
+        rows = await self._query("""
+            SELECT s.exhausted, s.synced_at,
+                   (SELECT COUNT(*) FROM wallet_txs WHERE wallet = s.wallet),
+                   (SELECT MAX(timestamp) FROM wallet_txs WHERE wallet = s.wallet),
+                   (SELECT signature FROM wallet_txs WHERE wallet = s.wallet ORDER BY timestamp LIMIT 1),
+                   (SELECT MIN(timestamp) FROM wallet_txs WHERE wallet = s.wallet)
+            FROM wallet_tx_sync s WHERE s.wallet = ?
+        """, (wallet,))
+        if not rows:
+            return None
+        keys = ('exhausted', 'synced_at', 'tx_count', 'newest_time', 'oldest_signature', 'oldest_time')
+        return dict(zip(keys, rows[0]))
+
+    async def _page(self, wallet, before=None):
+        response = await self.pnl.get_tx_history(wallet, limit=self.page_size, before=before)
+        self.pages_fetched += 1
+        if not response:
+            return None
+        return response.get('data', {}).get('solana', []) or []
+
+    async def sync(self, wallet):
+        """Fetch and store everything newer than what is stored, returns the number of new transactions"""
+        return await single_flight.do(("txstore", "sync", wallet), lambda: self._sync(wallet))
+
+    async def _sync(self, wallet):
+        self.syncs += 1
+        if await self.cursor(wallet) is None:
+            return await self._fetch_backwards(wallet, None, self.initial_depth)
+
+        fresh = []
+        before = None
+        for _ in range(self.max_pages):
+            page = await self._page(wallet, before)
+            if page is None:
+                break
+            known = await self._known(wallet, [tx.get('txHash') for tx in page])
+            fresh.extend(tx for tx in page if tx.get('txHash') and tx['txHash'] not in known)
+            # a page that reaches stored signatures has nothing newer behind it
+            if known or len(page) < self.page_size:
+                break
+            before = page[-1].get('txHash')
+        else:
+            print(f"Wallet {wallet[:8]} has more than {self.max_pages} pages of new transactions, older ones are skipped")
+        return await self._store(wallet, fresh)
+
+    async def backfill(self, wallet, depth):
+        """Page backwards until at least depth transactions are stored or the history runs out"""
+        return await single_flight.do(("txstore", "backfill", wallet), lambda: self._backfill(wallet, depth))
+
+    async def _backfill(self, wallet, depth):
+        cursor = await self.cursor(wallet)
+        if cursor is None:
+            return await self._fetch_backwards(wallet, None, depth)
+        if cursor['exhausted'] or cursor['tx_count'] >= depth:
+            return 0
+        return await self._fetch_backwards(wallet, cursor['oldest_signature'], depth - cursor['tx_count'])
+
+    async def _fetch_backwards(self, wallet, before, wanted):
+        fetched = []
+        exhausted = False
+        while len(fetched) < wanted:
+            page = await self._page(wallet, before)
+            if page is None:
+                break
+            fetched.extend(page)
+            if len(page) < self.page_size:
+                exhausted = True
+                break
+            before = page[-1].get('txHash')
+        return await self._store(wallet, fetched, exhausted=exhausted)
+
+    def _time(self, tx):
+        timestamp = tx.get('blockTime', 0)
+        if isinstance(timestamp, str):
+            try:
+                return int(datetime.fromisoformat(timestamp.replace('Z', '+00:00')).timestamp())
+            except ValueError:
+                return 0
+        return int(timestamp or 0)
+
+    async def _known(self, wallet, signatures):
+        """The signatures already stored for wallet"""
+        signatures = [signature for signature in dict.fromkeys(signatures) if signature]
+        known = set()
+        for i in range(0, len(signatures), 500):
+            chunk = signatures[i:i + 500]
+            rows = await self._query(
+                f"SELECT signature FROM wallet_txs WHERE wallet = ? AND signature IN ({','.join('?' * len(chunk))})",
+                [wallet] + chunk
+            )
+            known.update(row[0] for row in rows)
+        return known
+
+    async def _store(self, wallet, txs, exhausted=False):
+        """
+        Parse only the transactions not stored yet and write their signatures,
+        their swaps and the sync state as one transaction. Returns how many
+        transactions were new.
+        """
+        txs = [tx for tx in txs if tx.get('txHash')]
+        known = await self._known(wallet, [tx['txHash'] for tx in txs])
+        txs = [tx for tx in txs if tx['txHash'] not in known]
+        swaps = []
+        if txs:
+            parsed = await self.pnl.process_tx_history_from_response(wallet, {'data': {'solana': txs}})
+            swaps = [tx for token_txs in parsed.values() for tx in token_txs]
+
+        statements = []
+        if txs:
+            statements.append(("INSERT OR IGNORE INTO wallet_txs (wallet, signature, timestamp) VALUES (?, ?, ?)",
+                               [(wallet, tx['txHash'], self._time(tx)) for tx in txs], True))
+        if swaps:
+            statements.append(("""
+                INSERT OR IGNORE INTO wallet_swaps
+                (wallet, signature, ca, token_name, token_symbol, tx_type, sol_amount, token_amount, timestamp)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, [(wallet, tx['hash'], tx['token_ca'], tx['token_name'], tx['token_symbol'], tx['tx_type'],
+                   tx['sol_amount'], tx['token_amount'], tx['timestamp']) for tx in swaps], True))
+        statements.append(("""
+            INSERT INTO wallet_tx_sync (wallet, exhausted, synced_at) VALUES (?, ?, ?)
+            ON CONFLICT (wallet) DO UPDATE SET
+                exhausted = MAX(exhausted, excluded.exhausted),
+                synced_at = excluded.synced_at
+        """, (wallet, int(exhausted), time.time()), False))
+        await self._ready()
+        await self.writer.transaction(statements)
+        self.new_txs += len(txs)
+        self.new_swaps += len(swaps)
+        return len(txs)
+
+    async def swaps(self, wallet):
+        """Every stored swap for wallet, oldest first"""
+        rows = await self._query("""
+            SELECT signature, ca, token_name, token_symbol, tx_type, sol_amount, token_amount, timestamp
+            FROM wallet_swaps WHERE wallet = ?
+            ORDER BY timestamp
+        """, (wallet,))
+        keys = ('hash', 'token_ca', 'token_name', 'token_symbol', 'tx_type', 'sol_amount', 'token_amount', 'timestamp')
+        return [dict(zip(keys, row)) for row in rows]
+
+    def stats(self):
+        return {
+            'syncs': self.syncs,
+            'pages_fetched': self.pages_fetched,
+            'new_txs': self.new_txs,
+            'new_swaps': self.new_swaps
+        }
@@ -0,0 +1,107 @@
+import json
+import sqlite3
+import time
+from collections import defaultdict
+from dbwriter import db_writer
+
+
+# scanner -> seconds a verdict is reused
+DEFAULT_VERDICT_TTLS = {
+    'soul': 10 * 60,
+    'bundle': 10 * 60,
+    'dex_paid': 5 * 60,
+}
+
+
+class VerdictCache:
+    """
+    Telegram scanner verdicts (SoulScanner, TrenchScanner, RickBurp /dp) per
+    (scanner, ca), reused for that scanner's TTL instead of asking the bot
+    again. Verdicts are written through the DB writer to scanner_verdicts and
+    the ones still inside their TTL are loaded back on start, so restarts and
+    backfills do not re-ask either. Timestamps are wall clock for that reason.
+    """
+    def __init__(self, db_path='memedb.db', ttls=None, writer=None, default_ttl=5 * 60):
+        self.db_path = db_path
+        self.writer = writer or db_writer
+        self.ttls = dict(DEFAULT_VERDICT_TTLS)
+        self.ttls.update(ttls or {})
+        self.default_ttl = default_ttl
+        self.entries = {}  # (scanner, ca) -> (verdict, stored_at)
+
+        self.hits = defaultdict(int)
+        self.misses = defaultdict(int)
+        self.warmed = 0
+        self.create_table()
+        self.warm()
+
+    def create_table(self):
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS scanner_verdicts (
+                    scanner TEXT NOT NULL,
+                    ca TEXT NOT NULL,
+                    verdict TEXT NOT NULL,
+                    stored_at REAL NOT NULL,
+                    PRIMARY KEY (scanner, ca)
+                )
+            """)
+            conn.commit()
+
+    def ttl_for(self, scanner):
+        return self.ttls.get(scanner, self.default_ttl)
+
+    def warm(self):
+        """Load every verdict that is still inside its scanner's TTL"""
+        now = time.time()
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                rows = conn.execute("SELECT scanner, ca, verdict, stored_at FROM scanner_verdicts").fetchall()
+        except Exception as e:
+            print(f"Error warming scanner verdict cache: {str(e)}")
+            return
+        for scanner, ca, verdict, stored_at in rows:
+            if now - stored_at < self.ttl_for(scanner):
+                self.entries[(scanner, ca)] = (json.loads(verdict), stored_at)
+                self.warmed += 1
+
+    def get(self, scanner, ca):
+        """(True, verdict) when a verdict inside the TTL is cached, (False, None) otherwise"""
+        entry = self.entries.get((scanner, ca))
+        if entry is not None:
+            verdict, stored_at = entry
+            if time.time() - stored_at < self.ttl_for(scanner):
+                self.hits[scanner] += 1
+                return True, verdict
+            del self.entries[(scanner, ca)]
+        self.misses[scanner] += 1
+        return False, None
+
+    def set(self, scanner, ca, verdict):
+        stored_at = time.time()
+        self.entries[(scanner, ca)] = (verdict, stored_at)
+        self.writer.submit("""
+            INSERT OR REPLACE INTO scanner_verdicts (scanner, ca, verdict, stored_at)
+            VALUES (?, ?, ?, ?)
+        """, (scanner, ca, json.dumps(verdict), stored_at))
+
+    def prune(self):
+        """Drop expired verdicts from memory and disk"""
+        now = time.time()
+        for key, (_, stored_at) in list(self.entries.items()):
+            if now - stored_at >= self.ttl_for(key[0]):
+                del self.entries[key]
+        for scanner in set(self.ttls) | {key[0] for key in self.entries}:
+            self.writer.submit("DELETE FROM scanner_verdicts WHERE scanner = ? AND stored_at < ?",
+                               (scanner, now - self.ttl_for(scanner)))
+
+    def stats(self):
+        result = {}
+        for scanner in set(self.hits) | set(self.misses):
+            lookups = self.hits[scanner] + self.misses[scanner]
+            result[scanner] = {
+                'hits': self.hits[scanner],
+                'misses': self.misses[scanner],
+                'hit_rate': self.hits[scanner] / lookups if lookups else 0
+            }
+        return {'entries': len(self.entries), 'warmed': self.warmed, 'scanners': result}
@@ -3,9 +3,14 @@ import aiohttp
 from collections import defaultdict
 from env import BIRDEYE_API_KEY
 from datetime import datetime, timedelta
+from httpclient import http as shared_http
+from txstore import WalletTxStore
 
 class WalletPNL:
-    def __init__(self):
+    def __init__(self, http=None, tx_store=False):
+        self.http = http or shared_http
+        # with a tx store WalletService fetches and parses only new transactions on each analysis
+        self.store = WalletTxStore(self) if tx_store else None
         self.wsol_address = "So11111111111111111111111111111111111111112"
         # Define a minimum timestamp for filtering transactions
         # Set to 0 to get all transactions or adjust days_back as needed
@@ -35,16 +40,20 @@ class WalletPNL:
             
         return False
 
-    async def get_tx_history(self, wallet_address):
-        url = f"https://public-api.birdeye.so/v1/wallet/tx_list?wallet={wallet_address}&limit=100"
+    async def get_tx_history(self, wallet_address, limit=100, before=None):
+        url = f"https://public-api.birdeye.so/v1/wallet/tx_list"
         headers = {
             "accept": "application/json",
             "x-chain": "solana",
             "X-API-KEY": BIRDEYE_API_KEY
         }
+        params = {"wallet": wallet_address, "limit": limit}
+        if before:
+            # page backwards from this signature
+            params["before"] = before
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, headers=headers) as response:
+            async with self.http.session() as session:
+                async with session.get(url, headers=headers, params=params) as response:
                     if response.status == 200:
                         data = await response.json()
                         if data and isinstance(data, dict):
@@ -172,44 +181,7 @@ class WalletPNL:
                     'remaining': token_total_bought - token_total_sold
                 }
             
-            # Filter out tokens with duplicate PnL values
-            pnl_values = {}
-            filtered_token_pnl_details = {}
-            
-            for ca, details in token_pnl_details.items():
-                pnl = round(details['pnl'], 6)  # Round to avoid floating point issues
-                if pnl in pnl_values:
-                    continue
-                
-                pnl_values[pnl] = True
-                filtered_token_pnl_details[ca] = details
-            
-            # Recalculate totals based on filtered tokens
-            total_wallet_pnl = sum(details['pnl'] for details in filtered_token_pnl_details.values())
-            total_sol_spent = sum(details['sol_spent'] for details in filtered_token_pnl_details.values())
-            total_tokens = len(filtered_token_pnl_details)
-            total_trades = sum(details['tx_count'] for details in filtered_token_pnl_details.values())
-            
-            # Recalculate wins and losses
-            total_wins = sum(1 for details in filtered_token_pnl_details.values() if details['pnl'] > 0)
-            total_losses = sum(1 for details in filtered_token_pnl_details.values() if details['pnl'] < 0)
-            
-            avg_sol_entry = total_sol_spent / total_trades if total_trades > 0 else 0
-            
-            # Sort by PnL (highest first)
-            sorted_tokens = sorted(filtered_token_pnl_details.items(), key=lambda x: x[1]['pnl'], reverse=True)
-            
-            overall_roi = (total_wallet_pnl / total_sol_spent * 100) if total_sol_spent > 0 else 0
-            
-            return {
-                'pnl': total_wallet_pnl,
-                'tokens_traded': total_tokens,
-                'trades_won': total_wins,
-                'trades_loss': total_losses,
-                'average_entry_per_trade': avg_sol_entry,
-                'overall_roi': overall_roi,
-                'token_details': filtered_token_pnl_details
-            }   
+            return self._summarize(token_pnl_details)
         
         except Exception as e:
             print(f"Error in calculate_pnl for {wallet_address[:8]}: {str(e)}")
@@ -217,6 +189,43 @@ class WalletPNL:
             traceback.print_exc()
             return None
 
+    def _summarize(self, token_pnl_details):
+        # Filter out tokens with duplicate PnL values
+        pnl_values = {}
+        filtered_token_pnl_details = {}
+        
+        for ca, details in token_pnl_details.items():
+            pnl = round(details['pnl'], 6)  # Round to avoid floating point issues
+            if pnl in pnl_values:
+                continue
+            
+            pnl_values[pnl] = True
+            filtered_token_pnl_details[ca] = details
+        
+        # Recalculate totals based on filtered tokens
+        total_wallet_pnl = sum(details['pnl'] for details in filtered_token_pnl_details.values())
+        total_sol_spent = sum(details['sol_spent'] for details in filtered_token_pnl_details.values())
+        total_tokens = len(filtered_token_pnl_details)
+        total_trades = sum(details['tx_count'] for details in filtered_token_pnl_details.values())
+        
+        # Recalculate wins and losses
+        total_wins = sum(1 for details in filtered_token_pnl_details.values() if details['pnl'] > 0)
+        total_losses = sum(1 for details in filtered_token_pnl_details.values() if details['pnl'] < 0)
+        
+        avg_sol_entry = total_sol_spent / total_trades if total_trades > 0 else 0
+        
+        overall_roi = (total_wallet_pnl / total_sol_spent * 100) if total_sol_spent > 0 else 0
+        
+        return {
+            'pnl': total_wallet_pnl,
+            'tokens_traded': total_tokens,
+            'trades_won': total_wins,
+            'trades_loss': total_losses,
+            'average_entry_per_trade': avg_sol_entry,
+            'overall_roi': overall_roi,
+            'token_details': filtered_token_pnl_details
+        }
+
     # New helper method to process transaction history from an already fetched response
     async def process_tx_history_from_response(self, wallet_address, tx_history):
         try:
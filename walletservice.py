@@ -0,0 +1,213 @@
+import asyncio
+import functools
+import json
+import sqlite3
+import time
+from dbwriter import db_writer
+from pnlengine import PnLEngine
+from records import freeze
+from singleflight import single_flight
+from walletpnl import WalletPNL
+
+
+class WalletService:
+    """
+    Wallet PnL for every caller (top holder analysis, large buy scans).
+
+    Results are kept per wallet for max_age seconds, in memory and in the
+    wallet_pnl table, so a smart wallet that shows up on many tokens is only
+    analysed once per window, restarts included. Wallets without any trades
+    are only remembered in memory, for empty_max_age. Concurrent requests for
+    the same wallet share one computation and at most `concurrency` wallets
+    are analysed at a time, however many callers fan out. The table is created
+    on first use and lookups run in a worker thread, writes go through the DB
+    writer.
+
+    Each wallet's tx store is synced and backfilled to history_depth
+    transactions (a no-op once it holds that many), then the stored swaps of
+    every wallet that missed the cache are scored by the PnL engine in one
+    batch, in a worker thread (raw tx lists when the calculator has no store).
+    """
+    def __init__(self, pnl=None, db_path='memedb.db', writer=None, max_age=6 * 3600, concurrency=4, max_entries=10000,
+                 empty_max_age=10 * 60, engine=None, history_depth=500):
+        self.calculator = pnl or WalletPNL(tx_store=True)
+        self.engine = engine or PnLEngine(calculator=self.calculator)
+        self.db_path = db_path
+        self.writer = writer or db_writer
+        self.max_age = max_age
+        self.empty_max_age = empty_max_age
+        self.max_entries = max_entries
+        self.history_depth = history_depth
+        self.slots = asyncio.Semaphore(concurrency)
+        self.memory = {}  # wallet -> (result, computed_at, max_age)
+
+        self.memory_hits = 0
+        self.db_hits = 0
+        self.misses = 0
+        self.computed = 0
+        self.failed = 0
+        self.compute_time_total = 0.0
+        self.ready = False
+
+    def create_table(self):
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS wallet_pnl (
+                    wallet TEXT PRIMARY KEY,
+                    result TEXT NOT NULL,
+                    computed_at REAL NOT NULL
+                )
+            """)
+            conn.commit()
+
+    async def _ready(self):
+        # not at import, the shared instance is built by every module that imports this one
+        if not self.ready:
+            await asyncio.to_thread(self.create_table)
+            self.ready = True
+
+    def _fresh(self, computed_at, max_age=None):
+        return time.time() - computed_at < (max_age or self.max_age)
+
+    def _remember(self, wallet, result, computed_at, max_age):
+        self.memory.pop(wallet, None)
+        self.memory[wallet] = (result, computed_at, max_age)
+        while len(self.memory) > self.max_entries:
+            # oldest first, SQLite still has it
+            del self.memory[next(iter(self.memory))]
+
+    def _load(self, wallet):
+        with sqlite3.connect(self.db_path) as conn:
+            return conn.execute("SELECT result, computed_at FROM wallet_pnl WHERE wallet = ?", (wallet,)).fetchone()
+
+    async def cached(self, wallet):
+        """Result inside the staleness window from memory or SQLite, None otherwise"""
+        entry = self.memory.get(wallet)
+        if entry is not None and self._fresh(entry[1], entry[2]):
+            self.memory_hits += 1
+            return entry[0]
+        try:
+            await self._ready()
+            row = await asyncio.to_thread(self._load, wallet)
+        except Exception as e:
+            print(f"Error reading cached PnL for {wallet[:8]}: {str(e)}")
+            row = None
+        if row is not None and self._fresh(row[1]):
+            result = freeze(json.loads(row[0]))
+            self._remember(wallet, result, row[1], self.max_age)
+            self.db_hits += 1
+            return result
+        return None
+
+    async def pnl(self, wallet):
+        """calculate_pnl result for wallet (read-only), None when it could not be computed"""
+        result = await self.cached(wallet)
+        if result is not None:
+            return result
+        self.misses += 1
+        return await single_flight.do(("wallet", "pnl", wallet), lambda: self._compute(wallet))
+
+    async def _compute(self, wallet):
+        return (await self._compute_many([wallet])).get(wallet)
+
+    async def _history(self, wallet):
+        """Stored swaps after syncing and backfilling the tx store, or the raw tx list when there is no store"""
+        async with self.slots:
+            store = self.calculator.store
+            if store is None:
+                return await self.calculator.get_tx_history(wallet)
+            await store.sync(wallet)
+            await store.backfill(wallet, self.history_depth)
+            return await store.swaps(wallet)
+
+    async def _compute_many(self, wallets):
+        """{wallet: result or None}, histories fetched side by side and scored in one batch"""
+        started = time.monotonic()
+        histories = {}
+        for wallet, history in zip(wallets, await asyncio.gather(*(self._history(wallet) for wallet in wallets),
+                                                                 return_exceptions=True)):
+            if isinstance(history, Exception):
+                print(f"Error loading history for {wallet[:8]}: {str(history)}")
+            elif history is not None:
+                histories[wallet] = history
+        scored = {}
+        if histories:
+            score = self.engine.score_many if self.calculator.store is None else self.engine.score_swaps
+            try:
+                scored = await asyncio.to_thread(score, histories) or {}
+            except Exception as e:
+                print(f"Error computing PnL for {len(histories)} wallets: {str(e)}")
+        self.compute_time_total += time.monotonic() - started
+        return {wallet: self._finish(wallet, scored.get(wallet)) for wallet in wallets}
+
+    def _finish(self, wallet, result):
+        if not result:
+            self.failed += 1
+            return None
+        self.computed += 1
+        computed_at = time.time()
+        frozen = freeze(result)
+        if not result.get('tokens_traded'):
+            # no trades found (yet), worth asking again soon and not worth persisting
+            self._remember(wallet, frozen, computed_at, self.empty_max_age)
+            return frozen
+        self._remember(wallet, frozen, computed_at, self.max_age)
+        try:
+            self.writer.submit("INSERT OR REPLACE INTO wallet_pnl (wallet, result, computed_at) VALUES (?, ?, ?)",
+                               (wallet, json.dumps(result), computed_at))
+        except Exception as e:
+            print(f"Error storing PnL for {wallet[:8]}: {str(e)}")
+        return frozen
+
+    async def pnl_many(self, wallets):
+        """{wallet: result or None} for every wallet, the ones not cached scored in one batch"""
+        wallets = list(dict.fromkeys(wallets))
+        results = dict(zip(wallets, await asyncio.gather(*(self.cached(wallet) for wallet in wallets))))
+        missing = [wallet for wallet, result in results.items() if result is None]
+        if not missing:
+            return results
+        self.misses += len(missing)
+
+        # same single-flight keys as pnl(): wallets already being computed are
+        # joined, the rest are claimed and resolved by one batch
+        futures, owned = {}, {}
+        for wallet in missing:
+            future, owner = single_flight.claim(("wallet", "pnl", wallet))
+            futures[wallet] = future
+            if owner:
+                owned[wallet] = future
+        if owned:
+            batch = asyncio.ensure_future(self._compute_many(list(owned)))
+            batch.add_done_callback(functools.partial(self._resolve, owned))
+        # shielded so one caller giving up does not cancel the batch for the others
+        computed = await asyncio.gather(*(asyncio.shield(future) for future in futures.values()))
+        results.update(zip(futures, computed))
+        return results
+
+    def _resolve(self, owned, batch):
+        for wallet, future in owned.items():
+            if future.done():
+                continue
+            if batch.cancelled():
+                future.cancel()
+            elif batch.exception() is not None:
+                future.set_exception(batch.exception())
+            else:
+                future.set_result(batch.result().get(wallet))
+
+    def stats(self):
+        lookups = self.memory_hits + self.db_hits + self.misses
+        return {
+            'wallets': len(self.memory),
+            'memory_hits': self.memory_hits,
+            'db_hits': self.db_hits,
+            'misses': self.misses,
+            'hit_rate': (self.memory_hits + self.db_hits) / lookups if lookups else 0,
+            'computed': self.computed,
+            'failed': self.failed,
+            'avg_compute_ms': self.compute_time_total / (self.computed + self.failed) * 1000 if self.computed + self.failed else 0
+        }
+
+
+# shared so a wallet analysed for one token is reused for the next
+wallet_service = WalletService()
@@ -9,19 +9,23 @@ import csv
 import io
 from datetime import datetime
 import logging
+from httpclient import http as shared_http
 
 class AlefAlertWebhook:
-    def __init__(self):
-        self.message_sender = MessageSender() 
+    def __init__(self, http=None):
+        self.http = http or shared_http
+        self.message_sender = MessageSender(http=self.http) 
 
     async def full_send_ca_to_alefdao(self, ca: str):
         try:
             # First send webhook
-            async with aiohttp.ClientSession() as session:
-                await session.post(
+            async with self.http.session() as session:
+                response = await session.post(
                     ALEF_ALERT_WEBHOOK,
                     json={'content': 'CA Passed Both Soul Scan & Bundle Bot Check!'}
                 )
+                # shared session: hand the connection back to the pool
+                response.release()
             print("Sent full pass webhook notification")
             
             # Wait briefly
@@ -39,11 +43,13 @@ class AlefAlertWebhook:
     async def conditional_send_ca_to_alefdao(self, ca: str):
         try:
             # First send webhook
-            async with aiohttp.ClientSession() as session:
-                await session.post(
+            async with self.http.session() as session:
+                response = await session.post(
                     ALEF_ALERT_WEBHOOK,
                     json={'content': 'CA passed Soul Scanner checker but failed bundle bot check/Bundle Bot down\nTrade w Caution!'}
                 )
+                # shared session: hand the connection back to the pool
+                response.release()
             print("Sent conditional pass webhook notification")
             
             # Wait briefly
@@ -60,8 +66,8 @@ class AlefAlertWebhook:
 
 
 class MultiAlert:
-    def __init__(self):
-        pass
+    def __init__(self, http=None):
+        self.http = http or shared_http
 
     async def multialert_webhook(self, 
                     token_name, 
@@ -372,7 +378,7 @@ class MultiAlert:
             }
         
             # Send webhook
-            async with aiohttp.ClientSession() as session:
+            async with self.http.session() as session:
                 async with session.post(MULTIALERT_WEBHOOK, json=data) as response:
                     if response.status == 204:
                         print(f"Successfully sent Multi Alert for {ca}")
@@ -418,7 +424,7 @@ class MultiAlert:
                 ]
             }
 
-            async with aiohttp.ClientSession() as session:
+            async with self.http.session() as session:
                 async with session.post(TWOX_WEBHOOK, json=data) as response:
                     if response.status == 204:
                         print(f"2x+ Alert Sent SUCCESSFULLLYYY")
@@ -455,7 +461,7 @@ class MultiAlert:
                 ]
             }
             
-            async with aiohttp.ClientSession() as session:
+            async with self.http.session() as session:
                 async with session.post(SOL_10_5_WEBHOOK, json=data) as response:
                     if response.status == 204:
                         print("Alert for 10+ SOL buy SENT")
@@ -545,7 +551,7 @@ class MultiAlert:
                 ]
             }
 
-            async with aiohttp.ClientSession() as session:
+            async with self.http.session() as session:
                 async with session.post(SCORE_WEBHOOK, json=data) as response:
                     if response.status == 204:
                         print(f"Sent Score Report Alert for {token_name}")
@@ -567,8 +573,8 @@ class MultiAlert:
             return 0xFF0000  # Red
 
 class ScoreReportWebhook:
-    def __init__(self):
-        pass
+    def __init__(self, http=None):
+        self.http = http or shared_http
 
     async def send_score_report(self, ca, token_name, score_data):
         try:
@@ -655,7 +661,7 @@ class ScoreReportWebhook:
                          f"📊 Score Report for {token_name} ({ca})\nFinal Score: {score_data['total_score']:.3f}")
 
             # Send webhook
-            async with aiohttp.ClientSession() as session:
+            async with self.http.session() as session:
                 async with session.post(SCORE_WEBHOOK, data=form) as response:
                     if response.status == 204:
                         print(f"Successfully sent score report for {ca}")
@@ -670,8 +676,8 @@ class ScoreReportWebhook:
             traceback.print_exc()
 
 class TradeWebhook:
-    def __init__(self):
-        pass
+    def __init__(self, http=None):
+        self.http = http or shared_http
         
     def get_profit_color(self, profit_percentage):
         if profit_percentage >= 50:
@@ -770,7 +776,7 @@ class TradeWebhook:
             print(formatted_message)
 
             # Send webhook
-            async with aiohttp.ClientSession() as session:
+            async with self.http.session() as session:
                 try:
                     async with session.post(webhook_url, json={"content": formatted_message}) as response:
                         if response.status == 204:
@@ -871,7 +877,7 @@ class TradeWebhook:
             print(data)
             
             # Send webhook
-            async with aiohttp.ClientSession() as session:
+            async with self.http.session() as session:
                 try:
                     async with session.post(webhook_url, json=data) as response:
                         if response.status == 204:
@@ -940,7 +946,7 @@ class TradeWebhook:
             print(data)
             
             # Send webhook
-            async with aiohttp.ClientSession() as session:
+            async with self.http.session() as session:
                 try:
                     async with session.post(webhook_url, json=data) as response:
                         if response.status == 204:
@@ -1016,12 +1022,13 @@ class TradeWebhook:
             }
             
             # Send webhook with embed
-            async with aiohttp.ClientSession() as session:
+            async with self.http.session() as session:
                 try:
-                    await session.post(DEV_HISTORY_WEBHOOK, json={
+                    response = await session.post(DEV_HISTORY_WEBHOOK, json={
                         "username": "Dev History Bot",
                         "embeds": [embed]
                     })
+                    response.release()
                     print("Successfully sent dev history webhook")
                     return True
                 except Exception as post_error: